@@ -0,0 +1,189 @@
+"""
+Database Concurrency Benchmark
+==============================
+
+Measures ops/sec of the sync models layer (``models/database.py``) under N
+concurrent writers, comparing the previous connection strategy with the
+current one on a scratch SQLite file:
+
+- legacy: one shared connection (``StaticPool``) behind a ``scoped_session``,
+  default rollback journal
+- tuned:  ``create_db_engine`` - pooled connection per thread, WAL,
+  ``synchronous=NORMAL``, busy timeout, statement cache
+
+Each operation is one ``get_db_session``-style transaction that upserts a
+``ProjectFile`` row (a read followed by a write), like ``StorageManager``
+does. Writers are threads in one process (parallel agents) or separate
+processes (concurrent CLI invocations). Failed operations, e.g.
+``database is locked``, are counted rather than retried. Every run happens
+in a forked child, so a crash of the shared legacy connection (which
+concurrent threads can segfault) is reported instead of ending the run.
+
+Usage:
+    python benchmarks/db_benchmark.py --writers 1 4 8 --ops 200
+    python benchmarks/db_benchmark.py --processes --json db.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../src"))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import scoped_session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from coding_agent_plugin.models.database import create_db_engine  # noqa: E402
+from coding_agent_plugin.models.db_models import Base, Project, ProjectFile  # noqa: E402
+
+PROJECT_ID = "bench"
+
+
+def legacy_engine(url: str):
+    """The connection strategy used before WAL and pooling."""
+    return create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+STRATEGIES: Dict[str, Callable] = {"legacy": legacy_engine, "tuned": create_db_engine}
+
+
+def _prepare(url: str) -> None:
+    engine = create_db_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(Project(id=PROJECT_ID, name=PROJECT_ID, storage_path="/tmp/bench"))
+        session.commit()
+    engine.dispose()
+
+
+def _writer(sessions, worker: int, ops: int, start: Callable[[], None]) -> Dict[str, float]:
+    """Run ``ops`` upserts; returns completed and failed counts and elapsed seconds."""
+    start()
+    began = time.perf_counter()
+    done = failed = 0
+    for i in range(ops):
+        session = sessions()
+        try:
+            path = f"src/w{worker}/file{i % 50}.py"
+            row = session.query(ProjectFile).filter_by(project_id=PROJECT_ID, file_path=path).first()
+            if row is None:
+                session.add(ProjectFile(project_id=PROJECT_ID, file_path=path, content_hash=str(i), size_bytes=i))
+            else:
+                row.content_hash = str(i)
+                row.size_bytes = i
+            session.commit()
+            done += 1
+        except Exception:
+            session.rollback()
+            failed += 1
+        finally:
+            session.close()
+    return {"done": done, "failed": failed, "elapsed": time.perf_counter() - began}
+
+
+def _make_sessions(strategy: str, url: str):
+    factory = sessionmaker(bind=STRATEGIES[strategy](url), autoflush=False)
+    return scoped_session(factory) if strategy == "legacy" else factory
+
+
+def _process_writer(strategy, url, worker, ops, barrier, results) -> None:
+    results.put(_writer(_make_sessions(strategy, url), worker, ops, barrier.wait))
+
+
+def run(strategy: str, url: str, writers: int, ops: int, processes: bool) -> Dict[str, float]:
+    """Benchmark one strategy with ``writers`` concurrent writers."""
+    _prepare(url)
+    if processes:
+        ctx = multiprocessing.get_context("fork")
+        barrier = ctx.Barrier(writers)
+        queue = ctx.Queue()
+        workers = [
+            ctx.Process(target=_process_writer, args=(strategy, url, w, ops, barrier, queue))
+            for w in range(writers)
+        ]
+        for p in workers:
+            p.start()
+        results = [queue.get() for _ in workers]
+        for p in workers:
+            p.join()
+    else:
+        sessions = _make_sessions(strategy, url)
+        barrier = threading.Barrier(writers)
+        results: List[Dict[str, float]] = [None] * writers
+
+        def target(w: int) -> None:
+            results[w] = _writer(sessions, w, ops, barrier.wait)
+
+        threads = [threading.Thread(target=target, args=(w,)) for w in range(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    done = sum(r["done"] for r in results)
+    failed = sum(r["failed"] for r in results)
+    wall = max(r["elapsed"] for r in results)
+    return {
+        "strategy": strategy,
+        "writers": writers,
+        "ops": done,
+        "failed": failed,
+        "seconds": round(wall, 3),
+        "ops_per_sec": round(done / wall, 1) if wall else 0.0,
+    }
+
+
+def run_isolated(strategy: str, url: str, writers: int, ops: int, processes: bool) -> Dict[str, float]:
+    """``run`` in a forked child; a crashed child is reported as such."""
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    child = ctx.Process(target=lambda: queue.put(run(strategy, url, writers, ops, processes)))
+    child.start()
+    child.join()
+    if child.exitcode != 0:
+        return {"strategy": strategy, "writers": writers, "ops": 0, "failed": writers * ops,
+                "seconds": 0.0, "ops_per_sec": 0.0, "crashed": child.exitcode}
+    return queue.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent writers on the sync database layer.")
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8], help="Concurrent writer counts")
+    parser.add_argument("--ops", type=int, default=200, help="Operations per writer")
+    parser.add_argument("--processes", action="store_true", help="Use one process per writer instead of threads")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--json", help="Report path ('-' prints to stdout)")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="agentic-db-bench-") as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        for writers in args.writers:
+            for strategy in args.strategies:
+                rows.append(run_isolated(strategy, url, writers, args.ops, args.processes))
+                r = rows[-1]
+                status = f"crashed (exit {r['crashed']})" if "crashed" in r else f"({r['seconds']:.2f}s)"
+                print(
+                    f"{r['strategy']:>7} writers={r['writers']:<3} "
+                    f"{r['ops_per_sec']:>9.1f} ops/s  failed={r['failed']:<5} {status}",
+                    file=sys.stderr,
+                )
+
+    report = {"mode": "processes" if args.processes else "threads", "ops_per_writer": args.ops, "results": rows}
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Mock LLM Server
+===============
+
+A deterministic, OpenAI-compatible stand-in for the chat completions API,
+used to benchmark Agentic Coder without network access or an API key.
+
+Responses are scripted from the request itself:
+- Planning prompts (system prompt mentions "architect") get a JSON plan with
+  one coding task per file. Files come from a registered plan matching the
+  request, from file names mentioned in the request, or default to main.py.
+- Every other prompt gets a fenced code block of ``code_lines`` lines.
+
+Latency before the first token and the token rate are configurable, and both
+streaming (SSE) and non-streaming completions are supported.
+
+Usage:
+    python benchmarks/mock_llm_server.py --port 8765 --latency 0.2 --tokens-per-second 200
+    export LLM_BASE_URL=http://127.0.0.1:8765/v1 LLM_API_KEY=mock
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+FILE_PATTERN = re.compile(r"\b[\w./-]+\.(?:py|js|jsx|ts|tsx|txt|md|json|toml|yaml|yml|html|css)\b")
+TOKEN_PATTERN = re.compile(r"\s*\S+|\s+")
+
+
+class MockLLMServer:
+    """Threaded OpenAI-compatible server with scripted responses."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        code_lines: int = 40,
+        plans: Optional[Dict[str, List[str]]] = None,
+    ):
+        """
+        Initialize the server (call ``start`` to begin serving).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds before the first token of every response
+            tokens_per_second: Generation speed (0 = unlimited)
+            code_lines: Number of lines in generated code responses
+            plans: Mapping of request substring to the files its plan creates
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.code_lines = code_lines
+        self.plans = dict(plans or {})
+        self.requests = 0
+        self.simulated_time = 0.0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.simulated_time = 0.0
+
+    # Scripted responses
+
+    def respond(self, messages: List[Dict[str, str]]) -> str:
+        """Build the completion text for a list of chat messages."""
+        system = " ".join(m.get("content") or "" for m in messages if m.get("role") == "system")
+        user = " ".join(m.get("content") or "" for m in messages if m.get("role") == "user")
+        if "architect" in system.lower():
+            return json.dumps(self._plan(user), indent=2)
+        return self._code(user)
+
+    def _plan(self, request: str) -> Dict:
+        files = next((files for key, files in self.plans.items() if key in request), None)
+        if files is None:
+            files = list(dict.fromkeys(FILE_PATTERN.findall(request))) or ["main.py"]
+        tasks = [{
+            "id": 1,
+            "phase": "scaffold",
+            "description": "Create project structure",
+            "agent": "task",
+            "details": {},
+        }]
+        for path in files:
+            tasks.append({
+                "id": len(tasks) + 1,
+                "phase": "coding",
+                "description": f"Create {path}",
+                "agent": "coding",
+                "details": {"file_path": path},
+                "depends_on": [],
+            })
+        return {"architecture": {"app": files}, "tasks": tasks}
+
+    def _code(self, request: str) -> str:
+        match = FILE_PATTERN.search(request)
+        name = match.group(0) if match else "module"
+        body = "\n".join(f"value_{i} = {i}  # {name} line {i}" for i in range(self.code_lines))
+        return f"Here is the code for {name}:\n\n```python\n{body}\n```\n"
+
+    # HTTP plumbing
+
+    def _pace(self, tokens: List[str]):
+        """Yield tokens at the configured latency and rate, recording the delay."""
+        delay = self.latency
+        for token in tokens:
+            if delay:
+                time.sleep(delay)
+                with self._lock:
+                    self.simulated_time += delay
+            yield token
+            delay = 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _write_chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    request_id = f"chatcmpl-mock-{server.requests}"
+
+                messages = request.get("messages", [])
+                model = request.get("model", "mock")
+                content = server.respond(messages)
+                tokens = TOKEN_PATTERN.findall(content)
+                usage = {
+                    "prompt_tokens": sum(len((m.get("content") or "").split()) for m in messages),
+                    "completion_tokens": len(tokens),
+                }
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+                if not request.get("stream"):
+                    for _ in server._pace(tokens):
+                        pass
+                    self._send_json(200, {
+                        "id": request_id,
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }],
+                        "usage": usage,
+                    })
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def event(delta: Dict, finish_reason: Optional[str] = None, **extra) -> None:
+                    payload = {
+                        "id": request_id,
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                        **extra,
+                    }
+                    self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+                event({"role": "assistant", "content": ""})
+                for token in server._pace(tokens):
+                    event({"content": token})
+                event({}, "stop")
+                if (request.get("stream_options") or {}).get("include_usage"):
+                    payload = {
+                        "id": request_id,
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [],
+                        "usage": usage,
+                    }
+                    self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI-compatible LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Token rate (0 = unlimited)")
+    parser.add_argument("--code-lines", type=int, default=40, help="Lines per generated file")
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.host, args.port, args.latency, args.tokens_per_second, args.code_lines)
+    print(f"Mock LLM server listening on {server.base_url}")
+    server.start()
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Framework Overhead Benchmark
+============================
+
+Drives ``OrchestratorAgent`` against the local mock LLM server and reports
+how much time the framework itself spends per phase, independent of model
+latency. Runs fully offline and emits machine-readable JSON.
+
+Time is measured per phase by wrapping the methods that implement it.
+Nested calls are accounted exclusively, e.g. the DB lookup inside
+``PlanningAgent.execute`` counts as ``db`` and not as ``planning``:
+
+- startup:  constructing the orchestrator and its agents
+- planning: PlanningAgent work outside the LLM call
+- dispatch: per-task orchestration (scheduling, routing, retries)
+- context:  retrieving relevant project snippets for prompts
+- file_io:  writing code, plans, tasks.md, checkpoints, listing files
+- db:       ProjectManager database access
+- git:      repository init and commit
+- llm:      chat model round-trips (not overhead, reported for reference)
+
+Usage:
+    python benchmarks/run_benchmark.py --offline --json overhead.json
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from mock_llm_server import MockLLMServer
+
+OVERHEAD_PHASES = ["startup", "planning", "dispatch", "context", "file_io", "db", "git"]
+
+_frames: contextvars.ContextVar[tuple] = contextvars.ContextVar("profiler_frames", default=())
+
+
+class PhaseProfiler:
+    """Accumulates exclusive wall time per phase for wrapped methods."""
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._patches: List[tuple] = []
+
+    def reset(self) -> None:
+        self.totals.clear()
+        self.counts.clear()
+
+    def _enter(self, phase: str) -> tuple:
+        frame = [phase, time.perf_counter(), 0.0]
+        token = _frames.set(_frames.get() + (frame,))
+        return frame, token
+
+    def _exit(self, frame: list, token) -> None:
+        elapsed = time.perf_counter() - frame[1]
+        _frames.reset(token)
+        parents = _frames.get()
+        if parents:
+            parents[-1][2] += elapsed
+        phase = frame[0]
+        self.totals[phase] = self.totals.get(phase, 0.0) + max(elapsed - frame[2], 0.0)
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def wrap(self, owner: Any, name: str, phase: str) -> None:
+        """Replace ``owner.name`` with a timed version until ``restore`` is called."""
+        original = inspect.getattr_static(owner, name)
+        profiler = self
+
+        if inspect.isasyncgenfunction(original):
+            @functools.wraps(original)
+            async def wrapper(*args, **kwargs):
+                frame, token = profiler._enter(phase)
+                try:
+                    async for item in original(*args, **kwargs):
+                        yield item
+                finally:
+                    profiler._exit(frame, token)
+        elif inspect.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def wrapper(*args, **kwargs):
+                frame, token = profiler._enter(phase)
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    profiler._exit(frame, token)
+        else:
+            @functools.wraps(original)
+            def wrapper(*args, **kwargs):
+                frame, token = profiler._enter(phase)
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    profiler._exit(frame, token)
+
+        self._patches.append((owner, name, original, name in owner.__dict__))
+        setattr(owner, name, wrapper)
+
+    def restore(self) -> None:
+        for owner, name, original, owned in reversed(self._patches):
+            if owned:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+        self._patches.clear()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            phase: {
+                "total": round(self.totals[phase], 6),
+                "count": self.counts[phase],
+                "mean": round(self.totals[phase] / self.counts[phase], 6),
+            }
+            for phase in sorted(self.totals)
+        }
+
+
+def instrument(profiler: PhaseProfiler) -> None:
+    """Wrap the framework methods that make up each phase."""
+    from langchain_openai import ChatOpenAI
+    from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
+    from coding_agent_plugin.agents.planning import PlanningAgent
+    from coding_agent_plugin.agents.coding import CodingAgent
+    from coding_agent_plugin.agents.task import TaskAgent
+    from coding_agent_plugin.managers import ProjectManager, CheckpointManager
+    from coding_agent_plugin.integrations.git_manager import GitManager
+    from coding_agent_plugin.context.retrieval import ProjectRetriever
+
+    targets = [
+        (ChatOpenAI, "ainvoke", "llm"),
+        (ChatOpenAI, "astream", "llm"),
+        (OrchestratorAgent, "__init__", "startup"),
+        (PlanningAgent, "execute", "planning"),
+        (OrchestratorAgent, "_execute_task", "dispatch"),
+        (CodingAgent, "execute", "dispatch"),
+        (ProjectRetriever, "build_context", "context"),
+        (CodingAgent, "save_code", "file_io"),
+        (CodingAgent, "_stream_to_file", "file_io"),
+        (PlanningAgent, "_write_plan", "file_io"),
+        (TaskAgent, "execute", "file_io"),
+        (CheckpointManager, "start", "file_io"),
+        (CheckpointManager, "record", "file_io"),
+        (CheckpointManager, "finish", "file_io"),
+        (CheckpointManager, "completed_tasks", "file_io"),
+        (ProjectManager, "list_files", "file_io"),
+        (ProjectManager, "alist_files", "file_io"),
+        (GitManager, "init_repo", "git"),
+        (GitManager, "commit", "git"),
+    ]
+    for name, member in vars(ProjectManager).items():
+        if callable(member) and not name.startswith("_") and name not in ("list_files", "alist_files"):
+            targets.append((ProjectManager, name, "db"))
+
+    for owner, name, phase in targets:
+        if hasattr(owner, name):
+            profiler.wrap(owner, name, phase)
+
+
+async def run_case(case: Dict[str, Any], profiler: PhaseProfiler, server: MockLLMServer, concurrency: Optional[int]) -> Dict[str, Any]:
+    """Run one benchmark case end to end and collect its phase timings."""
+    from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
+    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.integrations.git_manager import GitManager
+
+    profiler.reset()
+    server.reset_stats()
+    pm = ProjectManager()
+    name = f"bench-offline-{case['name'].lower().replace(' ', '-')}-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    project = pm.create_project(name=name, description=f"Offline benchmark: {case['name']}")
+    profiler.reset()
+
+    status = "FAILED"
+    error = None
+    files: List[str] = []
+    tasks = 0
+    start = time.perf_counter()
+    try:
+        orchestrator = OrchestratorAgent(max_concurrency=concurrency)
+        result = await orchestrator.run_project(case["prompt"], project["id"])
+        tasks = len(result.get("results", []))
+
+        git = GitManager(project["storage_path"])
+        if git.init_repo():
+            git.commit(f"Benchmark: {case['name']}")
+
+        files = pm.list_files(project["id"])
+        missing = [f for f in case["expected_files"] if not any(f in created for created in files)]
+        status = "PASSED" if not missing else "PARTIAL"
+        if missing:
+            error = f"Missing files: {missing}"
+    except Exception as e:
+        status = "ERROR"
+        error = str(e)
+    wall_time = time.perf_counter() - start
+    phases = profiler.report()
+
+    pm.delete_project(project["id"])
+
+    overhead = sum(phases.get(phase, {}).get("total", 0.0) for phase in OVERHEAD_PHASES)
+    dispatch = phases.get("dispatch", {}).get("total", 0.0)
+    return {
+        "name": case["name"],
+        "status": status,
+        "error": error,
+        "wall_time": round(wall_time, 6),
+        "tasks": tasks,
+        "files_created": len(files),
+        "llm_requests": server.requests,
+        "llm_time": phases.get("llm", {}).get("total", 0.0),
+        "simulated_llm_time": round(server.simulated_time, 6),
+        "overhead": round(overhead, 6),
+        "dispatch_per_task": round(dispatch / tasks, 6) if tasks else None,
+        "phases": phases,
+    }
+
+
+async def run_offline_benchmark(
+    cases: List[Dict[str, Any]],
+    latency: float = 0.0,
+    tokens_per_second: float = 0.0,
+    code_lines: int = 40,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run the given cases against a mock LLM server.
+
+    Projects are created in a temporary directory and deleted afterwards.
+
+    Returns:
+        JSON-serializable report
+    """
+    from coding_agent_plugin.core import config
+    from coding_agent_plugin.services.llm_clients import reset_llm_clients
+
+    plans = {case["prompt"]: case["expected_files"] for case in cases}
+    saved = {name: getattr(config, name) for name in ("LLM_BASE_URL", "LLM_API_KEY", "LLM_MODEL", "AGENTIC_PROJECTS_DIR", "LLM_CACHE_ENABLED")}
+    profiler = PhaseProfiler()
+
+    with MockLLMServer(latency=latency, tokens_per_second=tokens_per_second, code_lines=code_lines, plans=plans) as server, \
+            tempfile.TemporaryDirectory(prefix="agentic-bench-") as projects_dir:
+        config.LLM_BASE_URL = server.base_url
+        config.LLM_API_KEY = "mock"
+        config.LLM_MODEL = "mock-model"
+        config.AGENTIC_PROJECTS_DIR = projects_dir
+        config.LLM_CACHE_ENABLED = False
+        reset_llm_clients()
+        instrument(profiler)
+        try:
+            results = [await run_case(case, profiler, server, concurrency) for case in cases]
+        finally:
+            profiler.restore()
+            for name, value in saved.items():
+                setattr(config, name, value)
+            reset_llm_clients()
+
+    summary: Dict[str, float] = {}
+    for result in results:
+        for phase, stats in result["phases"].items():
+            summary[phase] = round(summary.get(phase, 0.0) + stats["total"], 6)
+    total_tasks = sum(r["tasks"] for r in results)
+
+    return {
+        "schema_version": 1,
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "latency": latency,
+            "tokens_per_second": tokens_per_second,
+            "code_lines": code_lines,
+            "concurrency": concurrency or config.AGENT_MAX_CONCURRENCY,
+        },
+        "cases": results,
+        "summary": {
+            "passed": sum(r["status"] == "PASSED" for r in results),
+            "total": len(results),
+            "wall_time": round(sum(r["wall_time"] for r in results), 6),
+            "overhead": round(sum(r["overhead"] for r in results), 6),
+            "dispatch_per_task": round(summary.get("dispatch", 0.0) / total_tasks, 6) if total_tasks else None,
+            "phases": summary,
+        },
+    }
+
+
+def write_report(report: Dict[str, Any], path: str) -> Path:
+    """Write the JSON report, creating parent directories."""
+    output = Path(path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    return output
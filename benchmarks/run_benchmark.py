@@ -9,6 +9,9 @@ Usage:
     export OPENAI_API_KEY=sk-...
     python benchmarks/run_benchmark.py
 
+    # Offline: framework overhead per phase against a mock LLM, as JSON
+    python benchmarks/run_benchmark.py --offline --json results.json
+
 Scenarios:
 1. Basic: Simple Python Script
 2. Web: FastAPI CRUD Application
@@ -16,6 +19,7 @@ Scenarios:
 4. Data: CSV Processing Script
 """
 
+import argparse
 import asyncio
 import time
 import os
@@ -100,7 +104,7 @@ class BenchmarkRunner:
             # Also need to handle if project already exists (cleanup from previous run)
             existing = pm.get_project(case['name'])
             if existing:
-                pm.delete_project(existing.id)
+                pm.delete_project(existing["id"])
                 
             project_data = pm.create_project(name=case['name'], description=f"Benchmark: {case['name']}")
             project_id = project_data['id']
@@ -201,9 +205,64 @@ class BenchmarkRunner:
             
         console.print(table)
 
+def run_offline(args):
+    """Measure framework overhead against the mock LLM server and emit JSON."""
+    from overhead import OVERHEAD_PHASES, run_offline_benchmark, write_report
+    
+    report = asyncio.run(run_offline_benchmark(
+        BENCHMARK_CASES,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        code_lines=args.code_lines,
+        concurrency=args.concurrency,
+    ))
+    
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+        return
+    
+    output = args.json or f"benchmarks/results/{datetime.now().strftime('%Y%m%d_%H%M%S')}/overhead.json"
+    path = write_report(report, output)
+    
+    table = Table(title="Framework Overhead (seconds)")
+    table.add_column("Case", style="cyan")
+    table.add_column("Status", style="magenta")
+    table.add_column("Wall", justify="right")
+    table.add_column("LLM", justify="right")
+    for phase in OVERHEAD_PHASES:
+        table.add_column(phase, justify="right")
+    table.add_column("Overhead", justify="right", style="bold")
+    
+    for r in report["cases"]:
+        color = "green" if r["status"] == "PASSED" else "red"
+        table.add_row(
+            r["name"],
+            f"[{color}]{r['status']}[/{color}]",
+            f"{r['wall_time']:.3f}",
+            f"{r['llm_time']:.3f}",
+            *(f"{r['phases'].get(phase, {}).get('total', 0.0):.4f}" for phase in OVERHEAD_PHASES),
+            f"{r['overhead']:.4f}",
+        )
+    
+    console.print(table)
+    console.print(f"Report saved to: {path}")
+
+
 if __name__ == "__main__":
-    if not os.environ.get("OPENAI_API_KEY"):
-        console.print("[bold red]WARNING: OPENAI_API_KEY not set. Benchmarks will likely fail or use mocks if configured.[/bold red]")
-        
-    runner = BenchmarkRunner()
-    asyncio.run(runner.run_all())
+    parser = argparse.ArgumentParser(description="Agentic Coder benchmark suite")
+    parser.add_argument("--offline", action="store_true", help="Measure framework overhead against a local mock LLM")
+    parser.add_argument("--json", help="Offline report path ('-' prints to stdout)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock LLM latency before the first token (seconds)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Mock LLM token rate (0 = unlimited)")
+    parser.add_argument("--code-lines", type=int, default=40, help="Lines per file generated by the mock LLM")
+    parser.add_argument("--concurrency", type=int, help="Override AGENT_MAX_CONCURRENCY")
+    args = parser.parse_args()
+    
+    if args.offline:
+        run_offline(args)
+    else:
+        if not os.environ.get("OPENAI_API_KEY"):
+            console.print("[bold red]WARNING: OPENAI_API_KEY not set. Benchmarks will likely fail or use mocks if configured.[/bold red]")
+            
+        runner = BenchmarkRunner()
+        asyncio.run(runner.run_all())
@@ -1,6 +1,7 @@
 """Base agent class for agent orchestration."""
 
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
 from abc import ABC, abstractmethod
 
 
@@ -10,6 +11,9 @@ class BaseAgent(ABC):
     def __init__(self, name: str, openapi_instance: Any = None):
         self.name = name
         self.openapi_instance = openapi_instance
+        
+        from coding_agent_plugin.services.usage import enable_usage_tracking
+        enable_usage_tracking()
 
     @abstractmethod
     async def execute(self, task: Any) -> Dict[str, Any]:
@@ -21,8 +25,18 @@ class BaseAgent(ABC):
         print(f"[{self.name}] {message}")
 
     async def retry_operation(self, func, *args, **kwargs):
-        """Execute an operation with retry logic."""
+        """Execute an operation with retry logic.
+        
+        Chat model calls (``model.ainvoke(messages)``) are served from the
+        response cache when LLM_CACHE_ENABLED is set. Each attempt waits
+        for a slot of the shared rate limiter of the agent's model, and each
+        call is reported as an ``llm_call`` event with its latency and token
+        usage.
+        """
+        from coding_agent_plugin.core import events
         from coding_agent_plugin.core.config import AGENT_MAX_RETRIES, AGENT_RETRY_DELAY
+        from coding_agent_plugin.services.llm_cache import get_llm_cache
+        from coding_agent_plugin.services.rate_limiter import estimate_tokens
         from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
         import openai
         
@@ -39,6 +53,73 @@ class BaseAgent(ABC):
             reraise=True
         )
         async def _execute():
-            return await func(*args, **kwargs)
-            
-        return await _execute()
+            if limiter is None:
+                return await func(*args, **kwargs)
+            async with limiter.slot(estimate_tokens(args[0] if args else None)) as slot:
+                result = await func(*args, **kwargs)
+                usage = getattr(result, "usage_metadata", None)
+                if isinstance(usage, dict):
+                    slot.used_tokens = _count(usage.get("total_tokens"))
+                return result
+        
+        limiter = self._rate_limiter()
+        bus = events.get_event_bus()
+        started = time.perf_counter()
+        
+        cache = get_llm_cache()
+        cache_key = cache.key_for(func, args) if cache else None
+        if cache_key:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.log("LLM response served from cache")
+                if bus.wants(events.LLMCall):
+                    bus.publish(self._llm_event(cached, started, cached=True))
+                return cached
+        
+        try:
+            result = await _execute()
+        except Exception as e:
+            if bus.wants(events.LLMCall):
+                bus.publish(self._llm_event(None, started, error=str(e)))
+            raise
+        
+        if bus.wants(events.LLMCall):
+            bus.publish(self._llm_event(result, started))
+        if cache_key:
+            cache.set(cache_key, result)
+        return result
+
+    def _rate_limiter(self):
+        """Shared rate limiter of the agent's provider and model, if enabled."""
+        from coding_agent_plugin.services.rate_limiter import get_rate_limiter
+        
+        model = getattr(self, "model", None)
+        base_url = getattr(model, "openai_api_base", None)
+        model_name = getattr(model, "model_name", None)
+        return get_rate_limiter(
+            base_url if isinstance(base_url, str) else None,
+            model_name if isinstance(model_name, str) else None,
+        )
+
+    def _llm_event(self, result: Any, started: float, **fields):
+        """Build an ``llm_call`` event from a chat model response."""
+        from coding_agent_plugin.core.events import LLMCall
+        
+        usage = getattr(result, "usage_metadata", None)
+        usage = usage if isinstance(usage, dict) else {}
+        details = usage.get("input_token_details")
+        model = getattr(getattr(self, "model", None), "model_name", None)
+        return LLMCall(
+            agent=self.name,
+            latency=time.perf_counter() - started,
+            model=model if isinstance(model, str) else None,
+            input_tokens=_count(usage.get("input_tokens")),
+            output_tokens=_count(usage.get("output_tokens")),
+            cached_tokens=_count(details.get("cache_read")) if isinstance(details, dict) else None,
+            **fields,
+        )
+
+
+def _count(value: Any) -> Optional[int]:
+    """A token count from provider usage data, or None if it is not a number."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
@@ -1,32 +1,134 @@
 """Coding agent for generating code."""
 
+import asyncio
 import os
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+import re
+from typing import Any, Callable, Dict, Optional
 from langchain_core.messages import SystemMessage, HumanMessage
 from .base_agent import BaseAgent
 
 
+class CodeFenceExtractor:
+    """Incrementally extracts the first fenced code block from a token stream.
+
+    Mirrors the behaviour of the non-streaming extraction: text is passed
+    through as-is until a ``` fence opens, at which point everything emitted
+    so far is discarded (``sink.reset()``) and only the block body is kept.
+    Leading and trailing whitespace is stripped and a fence that is never
+    closed is treated as closed at the end of the stream.
+
+    The sink must provide ``write(text)`` and ``reset()``.
+    """
+
+    PRELUDE, LANG, BODY, DONE = "prelude", "lang", "body", "done"
+
+    def __init__(self, sink: Any):
+        self.sink = sink
+        self.state = self.PRELUDE
+        self._pending = ""
+        self._started = False
+        self._whitespace = ""
+
+    def feed(self, text: str) -> None:
+        """Consume a chunk of the response."""
+        if self.state == self.DONE or not text:
+            return
+        self._pending += text
+        self._process(final=False)
+
+    def close(self) -> None:
+        """Flush whatever is left at the end of the stream."""
+        if self.state != self.DONE:
+            self._process(final=True)
+        self.state = self.DONE
+        self._pending = ""
+        self._whitespace = ""
+
+    def _process(self, final: bool) -> None:
+        while self._pending or final:
+            if self.state in (self.PRELUDE, self.BODY):
+                idx = self._pending.find("```")
+                if idx == -1:
+                    # Hold back trailing backticks, they may start a fence
+                    keep = 0 if final else len(self._pending) - len(self._pending.rstrip("`"))
+                    self._emit(self._pending[:len(self._pending) - keep])
+                    self._pending = self._pending[len(self._pending) - keep:]
+                    return
+                before, self._pending = self._pending[:idx], self._pending[idx + 3:]
+                if self.state == self.BODY:
+                    self._emit(before)
+                    self.state = self.DONE
+                    self._pending = ""
+                    return
+                self.sink.reset()
+                self._started = False
+                self._whitespace = ""
+                self.state = self.LANG
+            elif self.state == self.LANG:
+                match = re.match(r"\w*", self._pending)
+                if match.end() == len(self._pending) and not final:
+                    return  # Language tag may continue in the next chunk
+                self._pending = self._pending[match.end():]
+                if self._pending.startswith("\n"):
+                    self._pending = self._pending[1:]
+                self.state = self.BODY
+            else:
+                return
+
+    def _emit(self, text: str) -> None:
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return
+            self._started = True
+        combined = self._whitespace + text
+        stripped = combined.rstrip()
+        self._whitespace = combined[len(stripped):]
+        if stripped:
+            self.sink.write(stripped)
+
+
+class _StreamingFileSink:
+    """Writes extracted code to a temp file and forwards it to a callback.
+
+    ``usage_metadata`` accumulates the token usage reported by the stream's
+    chunks, so the finished sink can be accounted like a chat response.
+    """
+
+    def __init__(self, handle: Any, on_token: Optional[Callable[[Optional[str]], None]] = None):
+        self.handle = handle
+        self.on_token = on_token
+        self.size = 0
+        self.usage_metadata = None
+
+    def write(self, text: str) -> None:
+        self.handle.write(text)
+        self.size += len(text)
+        if self.on_token:
+            self.on_token(text)
+
+    def reset(self) -> None:
+        self.handle.seek(0)
+        self.handle.truncate()
+        self.size = 0
+        if self.on_token:
+            self.on_token(None)
+
+
 class CodingAgent(BaseAgent):
     """Agent responsible for generating code based on user prompt."""
 
     def __init__(self, name: str, openapi_instance: Any = None):
         super().__init__(name, openapi_instance)
-        from coding_agent_plugin.core.config import LLM_MODEL, LLM_BASE_URL, LLM_API_KEY
-        model_name = LLM_MODEL or "gpt-4o"
-        
-        # Set up ChatOpenAI with custom base_url and api_key if using NVIDIA or other providers
-        kwargs = {"model": model_name, "temperature": 0.2}
-        if LLM_API_KEY:
-            kwargs["api_key"] = LLM_API_KEY
-        if LLM_BASE_URL:
-            kwargs["base_url"] = LLM_BASE_URL
-            
-        self.model = ChatOpenAI(**kwargs)
+        from coding_agent_plugin.services.llm_clients import get_chat_model
+        self.model = get_chat_model(temperature=0.2)
 
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the coding task."""
-        from coding_agent_plugin.managers import ProjectManager
+        from coding_agent_plugin.core.config import LLM_STREAMING
+        from coding_agent_plugin.managers import get_project_manager
+        from coding_agent_plugin.managers.file_index import FileIndex
+        from coding_agent_plugin.context.retrieval import ProjectRetriever
         
         user_prompt = task.get("user_prompt")
         project_id = task.get("project_id")
@@ -40,12 +142,12 @@ class CodingAgent(BaseAgent):
         self.log(f"Generating code for: {user_prompt}")
         
         # Get project storage path
-        pm = ProjectManager()
-        project = pm.get_project(project_id)
+        pm = get_project_manager()
+        project = await pm.aget_project(project_id)
         if not project:
             raise ValueError(f"Project '{project_id}' not found")
             
-        project_path = project['storage_path']
+        project_path = project["storage_path"]
         
         existing_content = None
         if file_path_relative:
@@ -54,23 +156,37 @@ class CodingAgent(BaseAgent):
                 with open(full_path, "r") as f:
                     existing_content = f.read()
         
-        # Get all project files for context
-        project_files = pm.list_files(project_id)
+        # Relevant snippets and neighbouring files for context (file I/O and
+        # ranking run off the loop, next to the other scheduled tasks)
+        project_context = await asyncio.to_thread(
+            ProjectRetriever.for_project(project_path).build_context,
+            user_prompt,
+            target_file=file_path_relative,
+        )
         
-        code_content = await self.generate_code(user_prompt, existing_content, project_files)
+        if task.get("stream", LLM_STREAMING):
+            target_path = self._resolve_path(project_path, file_path_relative)
+            size = await self.stream_code(
+                user_prompt, target_path, existing_content, project_context, on_token=task.get("on_token")
+            )
+            FileIndex.for_project(project_path).record_write(target_path)
+            return {"file_path": target_path, "size": size, "streamed": True}
         
-        saved_path = self.save_code(project_id, code_content, file_path_relative)
+        code_content = await self.generate_code(user_prompt, existing_content, project_context)
+        
+        saved_path = self.save_code(project_path, code_content, file_path_relative)
+        FileIndex.for_project(project_path).record_write(saved_path)
         
         return {"file_path": saved_path, "code": code_content}
 
-    async def generate_code(self, prompt: str, existing_content: str | None = None, project_files: list[str] = None) -> str:
-        """Generate code using LLM."""
+    def _build_messages(self, prompt: str, existing_content: str | None = None, project_context: str | None = None) -> list:
+        """Build the chat messages for a code generation request."""
         from coding_agent_plugin.services.prompt_service import PromptService
         
         full_prompt = prompt
         
-        if project_files:
-            full_prompt += f"\n\nProject Structure:\n{', '.join(project_files)}\n"
+        if project_context:
+            full_prompt += f"\n\nProject Context:\n{project_context}\n"
             
         if existing_content:
             full_prompt += f"\n\nExisting content of the file:\n{existing_content}\n\nPlease update the code based on the request."
@@ -79,6 +195,11 @@ class CodingAgent(BaseAgent):
             SystemMessage(content=PromptService.get_coding_system_prompt()),
             HumanMessage(content=full_prompt)
         ]
+        return messages
+
+    async def generate_code(self, prompt: str, existing_content: str | None = None, project_context: str | None = None) -> str:
+        """Generate code using LLM."""
+        messages = self._build_messages(prompt, existing_content, project_context)
         
         response = await self.retry_operation(self.model.ainvoke, messages)
         raw_content = response.content
@@ -87,8 +208,6 @@ class CodingAgent(BaseAgent):
         self.log(f"Raw LLM response length: {len(raw_content)} chars")
         
         # Strip markdown code blocks if present
-        import re
-        
         # Remove markdown code blocks (```language ... ``` or ``` ... ```)
         # Find content between triple backticks
         code_block_pattern = r"```(?:\w+)?\n?(.*?)```"
@@ -107,18 +226,74 @@ class CodingAgent(BaseAgent):
             
         return cleaned_content
 
-    def save_code(self, project_id: str, content: str, filename: str | None = None) -> str:
-        """Save code to a file."""
-        from coding_agent_plugin.managers import ProjectManager
-        pm = ProjectManager()
-        project = pm.get_project(project_id)
+    async def stream_code(
+        self,
+        prompt: str,
+        target_path: str,
+        existing_content: str | None = None,
+        project_context: str | None = None,
+        on_token: Optional[Callable[[Optional[str]], None]] = None,
+    ) -> int:
+        """
+        Generate code by streaming the completion straight to disk.
+
+        Tokens are written to a hidden ``.<name>.part`` file next to the
+        target as they arrive, so only the current chunk is held in memory.
+        The temp file replaces the target once the stream has finished.
+
+        Args:
+            prompt: Coding request
+            target_path: Absolute path of the file to write
+            existing_content: Current content of the file, if any
+            project_context: Related files and snippets from the project
+            on_token: Called with every chunk of extracted code, and with
+                None when previously emitted text was discarded
+
+        Returns:
+            Number of characters written
+        """
+        messages = self._build_messages(prompt, existing_content, project_context)
+        sink = await self.retry_operation(self._stream_to_file, messages, target_path, on_token)
+        size = sink.size
+        self.log(f"Streamed {size} chars to {target_path}")
+        if not size:
+            self.log("WARNING: Generated code is empty!")
+        return size
+
+    async def _stream_to_file(
+        self, messages: list, target_path: str, on_token: Optional[Callable] = None
+    ) -> "_StreamingFileSink":
+        from langchain_core.messages.ai import add_usage
+        from coding_agent_plugin.managers import task_snapshot
         
-        if project:
-            directory = project.storage_path
-        else:
-            # Fallback for legacy/test
-            directory = os.path.abspath(f"projects/{project_id}")
-            
+        directory, name = os.path.split(target_path)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{name}.part")
+        sink = None
+        try:
+            with open(tmp_path, "w") as f:
+                sink = _StreamingFileSink(f, on_token)
+                extractor = CodeFenceExtractor(sink)
+                async for chunk in self.model.astream(messages):
+                    if isinstance(chunk.content, str):
+                        extractor.feed(chunk.content)
+                    usage = getattr(chunk, "usage_metadata", None)
+                    if usage:
+                        sink.usage_metadata = add_usage(sink.usage_metadata, usage)
+                extractor.close()
+            task_snapshot.preserve(target_path)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if on_token and sink is not None and sink.size:
+                on_token(None)  # A retried attempt starts from a clear console echo
+            raise
+        return sink
+
+    def _resolve_path(self, project_path: str, filename: str | None = None) -> str:
+        """Resolve the absolute path a file of the project is saved to."""
+        directory = os.path.abspath(project_path)
         os.makedirs(directory, exist_ok=True)
         
         if not filename:
@@ -128,7 +303,13 @@ class CodingAgent(BaseAgent):
         if filename.startswith("/"):
             filename = filename[1:]
             
-        file_path = os.path.join(directory, filename)
+        return os.path.join(directory, filename)
+
+    def save_code(self, project_path: str, content: str, filename: str | None = None) -> str:
+        """Save code to a file of the project at ``project_path``."""
+        from coding_agent_plugin.managers import task_snapshot
+        
+        file_path = self._resolve_path(project_path, filename)
         
         # Ensure subdirectories exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -139,6 +320,7 @@ class CodingAgent(BaseAgent):
             # 'w' mode overwrites, which effectively updates.
             pass
             
+        task_snapshot.preserve(file_path)
         with open(file_path, mode) as f:
             f.write(content)
             
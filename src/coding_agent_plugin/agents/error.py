@@ -2,7 +2,6 @@
 
 import os
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from .base_agent import BaseAgent
 
@@ -12,29 +11,28 @@ class ErrorAgent(BaseAgent):
 
     def __init__(self, name: str, openapi_instance: Any = None):
         super().__init__(name, openapi_instance)
-        from coding_agent_plugin.core.config import LLM_MODEL, LLM_BASE_URL, LLM_API_KEY
-        model_name = LLM_MODEL or "gpt-4o"
-        
-        # Set up ChatOpenAI with custom base_url and api_key if using NVIDIA or other providers
-        kwargs = {"model": model_name, "temperature": 0.2}
-        if LLM_API_KEY:
-            kwargs["api_key"] = LLM_API_KEY
-        if LLM_BASE_URL:
-            kwargs["base_url"] = LLM_BASE_URL
-            
-        self.model = ChatOpenAI(**kwargs)
+        from coding_agent_plugin.services.llm_clients import get_chat_model
+        self.model = get_chat_model(temperature=0.2)
 
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the error fixing task."""
+        from coding_agent_plugin.managers import task_snapshot
+        
         project_id = task.get("project_id")
-        error_details = task.get("user_prompt") # Assuming user prompt contains error details
+        error_details = task.get("error") or task.get("user_prompt") # Assuming user prompt contains error details
+        if task.get("failed_attempt"):
+            # The orchestrator rolled the attempt back; show the model what it wrote
+            error_details = f"{error_details}\n\nFailed attempt (rolled back):\n{task['failed_attempt']}"
         
         if not project_id:
             raise ValueError("Missing project_id")
 
         self.log(f"Fixing errors for project: {project_id}")
         
-        file_path = os.path.join(f"projects/{project_id}", "generated_code.py")
+        file_path = task.get("file_path")
+        if file_path and task.get("project_path"):
+            file_path = os.path.join(task["project_path"], file_path)
+        file_path = file_path or os.path.join(f"projects/{project_id}", "generated_code.py")
         
         if not os.path.exists(file_path):
              return {"status": "error", "message": "File not found"}
@@ -44,6 +42,7 @@ class ErrorAgent(BaseAgent):
             
         fixed_code = await self.fix_code(code_content, error_details)
         
+        task_snapshot.preserve(file_path)
         with open(file_path, "w") as f:
             f.write(fixed_code)
             
@@ -56,5 +55,5 @@ class ErrorAgent(BaseAgent):
             SystemMessage(content=PromptService.get_error_fixing_system_prompt()),
             HumanMessage(content=f"Code:\n{code}\n\nError:\n{error}")
         ]
-        response = await self.model.ainvoke(messages)
+        response = await self.retry_operation(self.model.ainvoke, messages)
         return response.content
@@ -1,8 +1,8 @@
 """Execution agent for executing code."""
 
 import os
-import subprocess
-from typing import Dict, Any
+import shlex
+from typing import Any, Callable, Dict, List, Optional
 from .base_agent import BaseAgent
 
 
@@ -22,58 +22,110 @@ class ExecutionAgent(BaseAgent):
         # Determine working directory
         cwd = task.get("project_path")
         if not cwd:
-            from coding_agent_plugin.managers import ProjectManager
-            pm = ProjectManager()
-            project = pm.get_project(project_id)
+            from coding_agent_plugin.managers import get_project_manager
+            pm = get_project_manager()
+            project = await pm.aget_project(project_id)
             if project:
-                cwd = project.storage_path
+                cwd = project["storage_path"]
             else:
                 cwd = os.path.abspath(f"projects/{project_id}")
         
-        if command:
+        if task.get("pytest") is not None:
+            args = task["pytest"]
+            args = shlex.split(args) if isinstance(args, str) else list(args)
+            self.log(f"Running tests: pytest {' '.join(args)} in {cwd}")
+            result = await self.run_tests(args, cwd, timeout=task.get("timeout"), on_output=task.get("on_output"))
+        elif command:
             self.log(f"Running command: {command} in {cwd}")
-            result = await self.run_command(command, cwd=cwd)
+            result = await self.run_command(command, cwd=cwd, timeout=task.get("timeout"), on_output=task.get("on_output"))
         else:
             # Default behavior: run generated_code.py
             file_path = os.path.join(cwd, "generated_code.py")
             if not os.path.exists(file_path):
                  return {"status": "error", "message": "File not found"}
-            result = await self.run_code(file_path)
+            result = await self.run_code(file_path, timeout=task.get("timeout"), on_output=task.get("on_output"))
             
         log_path = self.log_execution(project_id, result)
         
         return {"status": "executed", "log_path": log_path, "output": result}
 
-    async def run_command(self, command: str, cwd: str) -> str:
-        """Run a shell command."""
-        try:
-            # Ensure cwd exists
-            os.makedirs(cwd, exist_ok=True)
-            # Use asyncio to run blocking subprocess in executor
-            import asyncio
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, 
-                lambda: subprocess.run(command, shell=True, cwd=cwd, capture_output=True, text=True, timeout=30)
-            )
-            return f"Command: {command}\nStdout:\n{result.stdout}\nStderr:\n{result.stderr}"
-        except Exception as e:
-            return f"Command execution failed: {str(e)}"
+    async def run_command(self, command: str, cwd: str, timeout: Optional[float] = None, on_output: Optional[Callable] = None) -> str:
+        """
+        Run a shell command in the sandboxed executor.
+        
+        Args:
+            command: Shell command line
+            cwd: Working directory
+            timeout: Seconds before the process group is killed (default EXECUTION_TIMEOUT)
+            on_output: Called with ("stdout" | "stderr", text) as output arrives
+        """
+        from coding_agent_plugin.core.executor import get_executor
+        
+        # Ensure cwd exists
+        os.makedirs(cwd, exist_ok=True)
+        result = await get_executor().run_shell(command, cwd=cwd, timeout=timeout, on_output=on_output)
+        return result.format()
+
+    async def run_code(self, file_path: str, timeout: Optional[float] = None, on_output: Optional[Callable] = None) -> str:
+        """
+        Run a Python file in the sandboxed executor.
+        
+        Uses the venv next to the file if there is one. With
+        WARM_POOL_ENABLED the script runs in a child forked from a warm
+        interpreter instead (output is then not streamed).
+        
+        Args:
+            file_path: Script to run
+            timeout: Seconds before the process group is killed (default EXECUTION_CODE_TIMEOUT)
+            on_output: Called with ("stdout" | "stderr", text) as output arrives
+        """
+        from coding_agent_plugin.core.config import EXECUTION_CODE_TIMEOUT, WARM_POOL_ENABLED
+        from coding_agent_plugin.core.executor import get_executor
+        from coding_agent_plugin.core.warm_pool import WarmPoolError, find_python, get_warm_pool
+        
+        timeout = EXECUTION_CODE_TIMEOUT if timeout is None else timeout
+        python = find_python(os.path.dirname(file_path))
+        
+        # Security warning: executing arbitrary code is dangerous. The
+        # executor limits CPU, memory, open files, output and wall time,
+        # but does not isolate the filesystem or network.
+        if WARM_POOL_ENABLED:
+            try:
+                result = await get_warm_pool(python).run_script(file_path, timeout=timeout)
+                return result.format()
+            except WarmPoolError as e:
+                self.log(f"Warm pool unavailable ({e}), starting a new interpreter")
+        
+        result = await get_executor().run([python, file_path], timeout=timeout, on_output=on_output)
+        return result.format()
 
-    async def run_code(self, file_path: str) -> str:
-        """Run the code file."""
-        try:
-            # Security warning: executing arbitrary code is dangerous.
-            # In a real system, this should be sandboxed.
-            import asyncio
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: subprocess.run(["python3", file_path], capture_output=True, text=True, timeout=10)
-            )
-            return f"Stdout:\n{result.stdout}\nStderr:\n{result.stderr}"
-        except Exception as e:
-            return f"Execution failed: {str(e)}"
+    async def run_tests(self, args: List[str], cwd: str, timeout: Optional[float] = None, on_output: Optional[Callable] = None) -> str:
+        """
+        Run a pytest selection in the project directory.
+        
+        With WARM_POOL_ENABLED pytest runs in a child forked from a warm
+        interpreter of the project's venv.
+        
+        Args:
+            args: pytest arguments (e.g. ["tests/test_api.py", "-k", "login"])
+            cwd: Project directory
+            timeout: Seconds before the process group is killed (default EXECUTION_TIMEOUT)
+            on_output: Called with ("stdout" | "stderr", text) as output arrives
+        """
+        from coding_agent_plugin.core.config import WARM_POOL_ENABLED
+        from coding_agent_plugin.core.executor import get_executor
+        from coding_agent_plugin.core.warm_pool import WarmPoolError, find_python, get_warm_pool
+        
+        python = find_python(cwd)
+        if WARM_POOL_ENABLED:
+            try:
+                result = await get_warm_pool(python).run_pytest(args, cwd=cwd, timeout=timeout)
+                return result.format()
+            except WarmPoolError as e:
+                self.log(f"Warm pool unavailable ({e}), starting a new interpreter")
+        
+        result = await get_executor().run([python, "-m", "pytest", *args], cwd=cwd, timeout=timeout, on_output=on_output)
+        return result.format()
 
     def log_execution(self, project_id: str, result: str) -> str:
         """Log execution results."""
@@ -1,8 +1,8 @@
 """File modification agent for targeted code changes."""
 
+import asyncio
 import os
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from .base_agent import BaseAgent
 
@@ -12,17 +12,8 @@ class FileModifierAgent(BaseAgent):
     
     def __init__(self, name: str, openapi_instance: Any = None):
         super().__init__(name, openapi_instance)
-        from coding_agent_plugin.core.config import LLM_MODEL, LLM_BASE_URL, LLM_API_KEY
-        model_name = LLM_MODEL or "gpt-4o"
-        
-        # Set up ChatOpenAI with custom base_url and api_key
-        kwargs = {"model": model_name, "temperature": 0.2}
-        if LLM_API_KEY:
-            kwargs["api_key"] = LLM_API_KEY
-        if LLM_BASE_URL:
-            kwargs["base_url"] = LLM_BASE_URL
-            
-        self.model = ChatOpenAI(**kwargs)
+        from coding_agent_plugin.services.llm_clients import get_chat_model
+        self.model = get_chat_model(temperature=0.2)
     
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -33,11 +24,17 @@ class FileModifierAgent(BaseAgent):
                 - instruction: What to change
                 - file_path: Path to file to modify
                 - project_id: Project identifier
+                - project_path: Project directory (default projects/<project_id>)
                 - existing_content: Current file content
+                - edit_mode: Optional "patch", "full" or "auto" (default FILE_EDIT_MODE)
                 
         Returns:
             Dict with modified content and change description
         """
+        from coding_agent_plugin.managers import task_snapshot
+        from coding_agent_plugin.managers.file_index import FileIndex
+        from coding_agent_plugin.context.retrieval import ProjectRetriever
+        
         instruction = task.get("instruction")
         file_path = task.get("file_path")
         project_id = task.get("project_id")
@@ -47,16 +44,28 @@ class FileModifierAgent(BaseAgent):
             raise ValueError("Missing instruction or file_path")
         
         self.log(f"Modifying {file_path}: {instruction}")
+        project_path = task.get("project_path") or f"projects/{project_id}"
+        
+        # Relevant code from the rest of the project
+        project_context = None
+        if os.path.isdir(project_path):
+            project_context = await asyncio.to_thread(
+                ProjectRetriever.for_project(project_path).build_context, instruction, target_file=file_path
+            )
         
         # Generate modified content
-        modified_content = await self.modify_file(instruction, existing_content, file_path)
+        modified_content = await self.modify_file(
+            instruction, existing_content, file_path, task.get("edit_mode"), project_context
+        )
         
         # Save modified file
-        full_path = os.path.join(f"projects/{project_id}", file_path)
+        full_path = os.path.join(project_path, file_path)
         os.makedirs(os.path.dirname(full_path), exist_ok=True)
         
+        task_snapshot.preserve(full_path)
         with open(full_path, 'w') as f:
             f.write(modified_content)
+        FileIndex.for_project(project_path).record_write(full_path)
         
         return {
             "file_path": file_path,
@@ -64,14 +73,115 @@ class FileModifierAgent(BaseAgent):
             "instruction": instruction
         }
     
-    async def modify_file(self, instruction: str, existing_content: str, file_path: str) -> str:
+    async def modify_file(
+        self,
+        instruction: str,
+        existing_content: str,
+        file_path: str,
+        edit_mode: str | None = None,
+        project_context: str | None = None,
+    ) -> str:
         """
         Modify file content based on instruction.
         
+        In patch mode the model only returns search/replace edits, which are
+        applied and validated locally; if that fails the whole file is
+        regenerated instead.
+        
+        Args:
+            instruction: What to change
+            existing_content: Current file content
+            file_path: Path to file (for context)
+            edit_mode: "patch", "full" or "auto" (default FILE_EDIT_MODE)
+            project_context: Related files and snippets from the project
+            
+        Returns:
+            str: Modified file content
+        """
+        from coding_agent_plugin.core.config import FILE_EDIT_MODE, FILE_EDIT_PATCH_MIN_CHARS
+        from coding_agent_plugin.utils.patch import PatchError
+        
+        edit_mode = edit_mode or FILE_EDIT_MODE
+        use_patch = edit_mode == "patch" or (
+            edit_mode == "auto" and len(existing_content or "") >= FILE_EDIT_PATCH_MIN_CHARS
+        )
+        
+        if use_patch and existing_content:
+            try:
+                return await self.patch_file(instruction, existing_content, file_path, project_context)
+            except PatchError as e:
+                self.log(f"Patch failed ({e}), falling back to full rewrite")
+        
+        return await self.rewrite_file(instruction, existing_content, file_path, project_context)
+    
+    async def patch_file(self, instruction: str, existing_content: str, file_path: str, project_context: str | None = None) -> str:
+        """
+        Modify a file by asking for search/replace edits only.
+        
         Args:
             instruction: What to change
             existing_content: Current file content
             file_path: Path to file (for context)
+            project_context: Related files and snippets from the project
+            
+        Returns:
+            str: Modified file content
+            
+        Raises:
+            PatchError: If the edits cannot be applied or break the file
+        """
+        from coding_agent_plugin.utils.patch import PatchError, apply_patch, validate_content
+        
+        system_content = f"""You are an expert code modification agent. Your task is to modify existing code based on user instructions.
+
+IMPORTANT RULES:
+1. Make MINIMAL changes - only modify what's necessary
+2. PRESERVE all existing functionality unless explicitly asked to change it
+3. Maintain the existing code style and formatting
+4. Add necessary imports if you introduce new functionality
+5. Do NOT return the whole file. Return ONLY edits, as one or more blocks:
+
+<<<<<<< SEARCH
+exact lines copied from the current file
+=======
+the lines that replace them
+>>>>>>> REPLACE
+
+6. Each SEARCH section must match the current file exactly and include enough lines to be unique
+7. Use an empty SEARCH section to append to the end of the file
+8. The file is: {file_path}
+
+{_format_project_context(project_context)}Current file content:
+{existing_content}
+
+User's request:
+{instruction}
+
+Return only the SEARCH/REPLACE blocks."""
+        
+        messages = [
+            SystemMessage(content=system_content),
+            HumanMessage(content=f"Modify the file to: {instruction}")
+        ]
+        
+        response = await self.retry_operation(self.model.ainvoke, messages)
+        modified_content = apply_patch(existing_content, response.content)
+        validate_content(file_path, modified_content)
+        if modified_content == existing_content:
+            raise PatchError("Patch made no changes")
+        
+        self.log(f"Applied patch to {file_path} ({len(response.content)} chars generated)")
+        return modified_content
+    
+    async def rewrite_file(self, instruction: str, existing_content: str, file_path: str, project_context: str | None = None) -> str:
+        """
+        Modify a file by asking for the complete new content.
+        
+        Args:
+            instruction: What to change
+            existing_content: Current file content
+            file_path: Path to file (for context)
+            project_context: Related files and snippets from the project
             
         Returns:
             str: Modified file content
@@ -87,7 +197,7 @@ IMPORTANT RULES:
 6. Do NOT include markdown formatting or explanations
 7. The file is: {file_path}
 
-Current file content:
+{_format_project_context(project_context)}Current file content:
 {existing_content}
 
 User's request:
@@ -100,7 +210,7 @@ Return the complete modified file."""
             HumanMessage(content=f"Modify the file to: {instruction}")
         ]
         
-        response = await self.model.ainvoke(messages)
+        response = await self.retry_operation(self.model.ainvoke, messages)
         modified_content = response.content
         
         # Strip markdown if present
@@ -112,3 +222,10 @@ Return the complete modified file."""
             modified_content = matches[0].strip()
         
         return modified_content.strip()
+
+
+def _format_project_context(project_context: str | None) -> str:
+    """Prompt section with related project code, empty when there is none."""
+    if not project_context:
+        return ""
+    return f"Related project code (for reference only, do not modify):\n{project_context}\n\n"
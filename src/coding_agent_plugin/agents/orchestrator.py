@@ -1,18 +1,27 @@
 """Orchestration agent for routing tasks to other agents."""
 
+import asyncio
+import time
+
 from coding_agent_plugin.agents.planning import PlanningAgent
 from typing import Dict, Any
 from .coding import CodingAgent
 from .task import TaskAgent
 from .error import ErrorAgent
 from .execution import ExecutionAgent
+from .scheduler import TaskNode, TaskScheduler, build_task_graph
 from coding_agent_plugin.acp.client import InProcessACPClient
 
 
 class OrchestratorAgent:
     """Agent responsible for orchestrating tasks to other agents using IBM ACP SDK."""
 
-    def __init__(self) -> None:
+    def __init__(self, max_concurrency: int | None = None) -> None:
+        from coding_agent_plugin.core.config import AGENT_MAX_CONCURRENCY
+        
+        # Upper bound on planned tasks executed at the same time
+        self.max_concurrency = max_concurrency or AGENT_MAX_CONCURRENCY
+        
         # Initialize all agents
         self.agents = {
             "planning": PlanningAgent(name="planning"),
@@ -53,24 +62,67 @@ class OrchestratorAgent:
         }
         return await agent.execute(task)
 
-    async def run_project(self, user_prompt: str, project_id: str) -> Dict[str, Any]:
-        """Run the full autonomous project creation loop."""
+    async def run_project(
+        self,
+        user_prompt: str,
+        project_id: str,
+        workflow: Dict[str, Any] | None = None,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
+        """Run the full autonomous project creation loop.
+        
+        Args:
+            user_prompt: What to build
+            project_id: Project name or ID
+            workflow: Already reviewed plan; when omitted the PlanningAgent is called
+            resume: Continue the last checkpointed run, skipping completed tasks
+        """
         print(f"🚀 Starting autonomous project: {project_id}")
         
+        from coding_agent_plugin.core import events
+        from coding_agent_plugin.managers import get_project_manager, CheckpointManager
+        pm = get_project_manager()
+        project = await pm.aget_project(project_id)
+        if not project:
+            raise ValueError(f"Project '{project_id}' not found")
+        
+        bus = events.get_event_bus()
+        events.ensure_run(project["id"])
+        started = time.perf_counter()
+        bus.emit(events.RunStarted, project_id=project_id, prompt=user_prompt, resume=resume)
+            
+        project_path = project["storage_path"]
+        checkpoint = CheckpointManager(project_path)
+        
+        state = checkpoint.load() if resume else None
+        if state and (workflow is None or checkpoint.plan_hash(workflow) == state.get("plan_hash")):
+            workflow = state["plan"]
+            print("♻️ Resuming from checkpoint (planning skipped)")
+        else:
+            state = None
+        
         # 1. Planning Phase
-        print("📋 Phase 1: Planning")
-        planning_task = {
-            "user_prompt": user_prompt,
-            "project_id": project_id
-        }
-        plan_result = await self.send_to_agent("planning", planning_task)
+        if workflow is None:
+            print("📋 Phase 1: Planning")
+            planning_task = {
+                "user_prompt": user_prompt,
+                "project_id": project_id
+            }
+            plan_result = await self.send_to_agent("planning", planning_task)
+            workflow = plan_result.get("workflow", {})
         
-        workflow = plan_result.get("workflow", {})
         tasks = workflow.get("tasks", [])
         
         if not tasks:
             print("⚠️ No tasks generated in plan.")
+            bus.emit(events.RunFinished, project_id=project_id, status="failed", completed=0, failed=0,
+                     duration=time.perf_counter() - started)
             return {"status": "failed", "error": "No tasks in plan"}
+        bus.emit(events.PlanReady, project_id=project_id, tasks=tasks, resumed=bool(state))
+        
+        if not state:
+            checkpoint.start(user_prompt, workflow)
+        completed = checkpoint.completed_tasks()
 
         # Initialize tasks.md via TaskAgent
         await self.agents["task"].execute({
@@ -79,41 +131,109 @@ class OrchestratorAgent:
             "tasks": tasks
         })
 
-        print(f"⚙️ Phase 2: Execution ({len(tasks)} tasks)")
-        results = []
-        MAX_RETRIES = 2
+        print(f"⚙️ Phase 2: Execution ({len(tasks)} tasks, {len(completed)} already completed)")
         
-        from coding_agent_plugin.managers import ProjectManager
-        pm = ProjectManager()
-        project = pm.get_project(project_id)
-        if not project:
-            raise ValueError(f"Project '{project_id}' not found")
-            
-        project_path = project.storage_path
+        nodes = build_task_graph(tasks)
+        scheduler = TaskScheduler(self.max_concurrency)
+        commits = await self._commit_pipeline(project_path)
         
-        for i, task in enumerate(tasks, 1):
-            description = task.get("description")
-            agent_type = task.get("agent", "coding")
-            
-            print(f"  👉 Task {i}: {description} (Agent: {agent_type})")
-            
-            # Mark as in-progress
-            await self.agents["task"].execute({
-                "project_id": project_id,
-                "action": "update_status",
-                "task_description": description,
-                "status": "in_progress"
-            })
-            
-            task_input = {
-                "user_prompt": description,
-                "project_id": project_id,
-                "project_path": project_path,
-                **task.get("details", {})
-            }
+        async def _run_node(node: TaskNode) -> Dict[str, Any]:
+            if node.key in completed:
+                description = node.task.get("description")
+                print(f"  ⏭️ Task {node.index + 1}: {description} (completed in a previous run)")
+                await self.agents["task"].execute({
+                    "project_id": project_id,
+                    "action": "update_status",
+                    "task_id": node.key,
+                    "task_description": description,
+                    "status": "completed"
+                })
+                return {"task": description, "status": "completed", "result": {"resumed": True}}
             
+            outcome = await self._execute_task(node.index + 1, node.task, project_id, project_path, node.key)
+            if outcome["status"] == "completed":
+                result = outcome.get("result") or {}
+                file_path = result.get("file_path") or node.file_path
+                checkpoint.record(node.key, file_path)
+                if commits and (outcome.get("files") or file_path):
+                    commits.submit(outcome.get("files") or [file_path], f"Task {node.index + 1}: {node.task.get('description')}")
+            return outcome
+        
+        results = await scheduler.run(nodes, _run_node)
+        if commits:
+            await commits.aflush()
+        await self.agents["task"].execute({"project_id": project_id, "action": "flush"})
+        
+        failed = [r for r in results if r["status"] != "completed"]
+        checkpoint.finish("completed" if not failed else "incomplete")
+        bus.emit(events.RunFinished, project_id=project_id, status="completed" if not failed else "incomplete",
+                 completed=len(results) - len(failed), failed=len(failed), duration=time.perf_counter() - started)
+        return {"status": "completed", "results": results}
+
+    async def _commit_pipeline(self, project_path: str):
+        """Background commit pipeline for the project when GIT_COMMIT_PER_TASK is set."""
+        from coding_agent_plugin.core.config import GIT_COMMIT_PER_TASK
+        if not GIT_COMMIT_PER_TASK:
+            return None
+        
+        from coding_agent_plugin.integrations.git_manager import GitManager
+        git = GitManager(project_path)
+        if not await asyncio.to_thread(git.init_repo):
+            return None
+        return git.pipeline()
+
+    async def _execute_task(
+        self,
+        number: int,
+        task: Dict[str, Any],
+        project_id: str,
+        project_path: str,
+        task_id: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a single planned task with ErrorAgent-assisted retries.
+        
+        With TASK_ROLLBACK, the files a failed attempt wrote are restored
+        before the ErrorAgent and the retry run, so neither builds on a
+        half-written tree; the ErrorAgent gets the attempt's diff alongside
+        the error instead. Once the task fails for good, the ErrorAgent's
+        fixes are rolled back too.
+        """
+        from coding_agent_plugin.core import events
+        from coding_agent_plugin.core.config import TASK_ROLLBACK
+        from coding_agent_plugin.managers import task_snapshot
+        from coding_agent_plugin.managers.task_snapshot import TaskSnapshot
+        
+        MAX_RETRIES = 2
+        description = task.get("description")
+        agent_type = task.get("agent", "coding")
+        
+        print(f"  👉 Task {number}: {description} (Agent: {agent_type})")
+        bus = events.get_event_bus()
+        bus.emit(events.TaskStarted, task_id=task_id, description=description, agent=agent_type)
+        started = time.perf_counter()
+        
+        # Mark as in-progress
+        await self.agents["task"].execute({
+            "project_id": project_id,
+            "action": "update_status",
+            "task_id": task_id,
+            "task_description": description,
+            "status": "in_progress"
+        })
+        
+        task_input = {
+            "user_prompt": description,
+            "project_id": project_id,
+            "project_path": project_path,
+            **task.get("details", {})
+        }
+        
+        snapshot = TaskSnapshot(project_path) if TASK_ROLLBACK else None
+        
+        with task_snapshot.activate(snapshot), events.task_scope(task_id):
             retry_count = 0
-            while retry_count <= MAX_RETRIES:
+            while True:
                 try:
                     result = None
                     if agent_type == "coding":
@@ -128,46 +248,70 @@ class OrchestratorAgent:
                     else:
                         print(f"     ⚠️ Unknown agent type: {agent_type}")
                         result = {"status": "skipped"}
-                    
-                    results.append({"task": description, "status": "completed", "result": result})
-                    print(f"     ✅ Success")
-                    
+                
+                    print(f"     ✅ Task {number} succeeded")
+                
+                    files = snapshot.commit() if snapshot else []
+                    bus.emit(events.TaskCompleted, task_id=task_id, description=description,
+                             duration=time.perf_counter() - started, files=files)
+                
                     # Mark as completed
                     await self.agents["task"].execute({
                         "project_id": project_id,
                         "action": "update_status",
+                        "task_id": task_id,
                         "task_description": description,
                         "status": "completed"
                     })
-                    break
-                    
+                    return {"task": description, "status": "completed", "result": result, "files": files}
+                
                 except Exception as e:
                     retry_count += 1
-                    print(f"     ❌ Error: {e} (attempt {retry_count})")
-                    
+                    print(f"     ❌ Task {number} error: {e} (attempt {retry_count})")
+                    final = agent_type == "error" or retry_count >= MAX_RETRIES
+                    bus.emit(events.TaskFailed, task_id=task_id, description=description, error=str(e),
+                             attempt=retry_count, final=final)
+                
                     # Trigger ErrorAgent if this wasn't the ErrorAgent itself and we haven't exceeded retries
-                    if agent_type != "error" and retry_count < MAX_RETRIES: # Changed to < MAX_RETRIES to allow one more retry after error fix attempt
+                    if not final:
+                        failed_attempt = None
+                        if snapshot:
+                            # Retry from the state before the task, not on top of the broken attempt
+                            failed_attempt = await asyncio.to_thread(snapshot.diff)
+                            restored = await asyncio.to_thread(snapshot.rollback)
+                            if restored:
+                                print(f"     ⏪ Rolled back {restored} file(s)")
                         print(f"     🚑 Attempting recovery with ErrorAgent...")
-                        
+                    
                         try:
                             error_agent = self.agents["error"]
                             error_task_input = {
                                 "error": str(e),
+                                "failed_attempt": failed_attempt,
                                 "file_path": task_input.get("file_path"), # Might be None
                                 "project_id": project_id,
                                 "project_path": project_path
                             }
-                            
+                        
                             error_result = await error_agent.execute(error_task_input)
                             print(f"     🔧 Error fixed, retrying task...")
-                            
+                        
                         except Exception as error_fix_exception:
                             print(f"     ⚠️ Error recovery failed: {error_fix_exception}")
-                            
+                        
                     else:
                         # No more retries or this was the ErrorAgent itself
-                        results.append({"task": description, "status": "failed", "error": str(e), "retries": retry_count})
-                        print(f"     💀 Task failed after {retry_count} attempts")
-                        break
-                    
-        return {"status": "completed", "results": results}
+                        print(f"     💀 Task {number} failed after {retry_count} attempts")
+                        # Leave the tree as it was before the task, ErrorAgent fixes included
+                        if snapshot:
+                            restored = await asyncio.to_thread(snapshot.rollback)
+                            if restored:
+                                print(f"     ⏪ Rolled back {restored} file(s)")
+                        await self.agents["task"].execute({
+                            "project_id": project_id,
+                            "action": "update_status",
+                            "task_id": task_id,
+                            "task_description": description,
+                            "status": "failed"
+                        })
+                        return {"task": description, "status": "failed", "error": str(e), "retries": retry_count}
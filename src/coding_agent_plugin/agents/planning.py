@@ -2,7 +2,6 @@
 
 from typing import List, Dict, Any
 from langchain.agents import create_agent
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from .base_agent import BaseAgent
 
@@ -12,19 +11,10 @@ class PlanningAgent(BaseAgent):
 
     def __init__(self, name: str = "planning", model: str = None):
         super().__init__(name, model)
-        from coding_agent_plugin.managers import ProjectManager
-        self.pm = ProjectManager()
-        from coding_agent_plugin.core.config import LLM_MODEL, LLM_BASE_URL, LLM_API_KEY
-        model_name = LLM_MODEL or "gpt-4o"
-        
-        # Set up ChatOpenAI with custom base_url and api_key if using NVIDIA or other providers
-        kwargs = {"model": model_name, "temperature": 0.2}
-        if LLM_API_KEY:
-            kwargs["api_key"] = LLM_API_KEY
-        if LLM_BASE_URL:
-            kwargs["base_url"] = LLM_BASE_URL
-            
-        self.model = ChatOpenAI(**kwargs)
+        from coding_agent_plugin.managers import get_project_manager
+        self.pm = get_project_manager()
+        from coding_agent_plugin.services.llm_clients import get_chat_model
+        self.model = get_chat_model(temperature=0.2)
 
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the planning task."""
@@ -37,11 +27,15 @@ class PlanningAgent(BaseAgent):
         self.log(f"Executing planning task: {user_prompt}")
         
         # Get existing files
-        existing_files = self.pm.list_files(project_id)
+        existing_files = await self.pm.alist_files(project_id)
         
         workflow = await self.plan(user_prompt, existing_files)
         
-        self.save_plan(project_id, workflow)
+        project = await self.pm.aget_project(project_id)
+        if project:
+            self._write_plan(project["storage_path"], workflow)
+        else:
+            self.log(f"Project {project_id} not found, cannot save plan")
         
         return {"workflow": workflow}
 
@@ -95,15 +89,18 @@ IMPORTANT GUIDELINES FOR EXISTING PROJECTS:
 
     def save_plan(self, project_id: str, workflow: Dict[str, Any]) -> None:
         """Save planning details to a file."""
-        from pathlib import Path
-        
         # Resolve project path using ProjectManager
         project = self.pm.get_project(project_id)
         if not project:
             self.log(f"Project {project_id} not found, cannot save plan")
             return
-            
-        storage_path = Path(project.storage_path)
+        self._write_plan(project["storage_path"], workflow)
+
+    def _write_plan(self, project_path: str, workflow: Dict[str, Any]) -> None:
+        """Write ``.agentic/planning.md`` of the project at ``project_path``."""
+        from pathlib import Path
+        
+        storage_path = Path(project_path)
         context_dir = storage_path / ".agentic"
         context_dir.mkdir(parents=True, exist_ok=True)
         
@@ -0,0 +1,188 @@
+"""Dependency-aware scheduling of planned tasks."""
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+
+# Phases the planner is asked to emit, in execution order.
+PHASE_RANKS = {
+    "scaffold": 0,
+    "setup": 0,
+    "coding": 1,
+    "implementation": 1,
+    "testing": 2,
+    "verification": 2,
+}
+
+
+@dataclass
+class TaskNode:
+    """A planned task together with the tasks it must wait for."""
+
+    index: int
+    task: Dict[str, Any]
+    depends_on: Set[int] = field(default_factory=set)
+
+    @property
+    def key(self) -> str:
+        """Stable identifier of the task within its plan."""
+        task_id = self.task.get("id")
+        return str(task_id) if task_id is not None else str(self.index + 1)
+
+    @property
+    def agent(self) -> str:
+        return self.task.get("agent", "coding")
+
+    @property
+    def file_path(self) -> Optional[str]:
+        path = (self.task.get("details") or {}).get("file_path")
+        return _normalize_path(path) if path else None
+
+
+def _normalize_path(path: str) -> str:
+    path = path.strip()
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+def _module_name(path: str) -> Optional[str]:
+    """Dotted import name of a planned source file (``app/models.py`` -> ``app.models``)."""
+    stem, dot, ext = path.rpartition(".")
+    if not dot or ext not in {"py", "js", "jsx", "ts", "tsx"}:
+        return None
+    return stem.replace("/", ".")
+
+
+def _task_text(task: Dict[str, Any]) -> str:
+    details = task.get("details") or {}
+    parts = [task.get("description") or ""]
+    for key in ("prompt", "command"):
+        value = details.get(key)
+        if isinstance(value, str):
+            parts.append(value)
+    return "\n".join(parts)
+
+
+def _references(text: str, path: str) -> bool:
+    """Check whether ``text`` mentions the planned file ``path``."""
+    candidates = {path}
+    module = _module_name(path)
+    if module:
+        candidates.add(module)
+    if "/" in path:
+        candidates.add(path.rsplit("/", 1)[1])
+    for candidate in candidates:
+        if re.search(rf"(?<![\w./]){re.escape(candidate)}(?![\w/])", text):
+            return True
+    return False
+
+
+def build_task_graph(tasks: List[Dict[str, Any]]) -> List[TaskNode]:
+    """
+    Build the dependency graph for a plan.
+
+    Dependencies only ever point at earlier tasks, so the plan order is always a
+    valid execution order. A task waits for:
+
+    - tasks listed in its ``depends_on`` field (by task id),
+    - every earlier task from a different phase,
+    - earlier tasks writing the same ``file_path``,
+    - earlier tasks whose file it references (path, basename or module name),
+    - for non-coding tasks without explicit file references, every earlier task.
+
+    Args:
+        tasks: Task dictionaries as produced by the PlanningAgent
+
+    Returns:
+        List of TaskNode objects in plan order
+    """
+    nodes = [TaskNode(index=i, task=task) for i, task in enumerate(tasks)]
+    by_key = {node.key: node.index for node in nodes}
+
+    ranks: List[int] = []
+    for node in nodes:
+        phase = str(node.task.get("phase") or "").lower()
+        ranks.append(PHASE_RANKS.get(phase, ranks[-1] if ranks else 1))
+
+    for node in nodes:
+        text = _task_text(node.task)
+        earlier = nodes[:node.index]
+
+        explicit = node.task.get("depends_on") or []
+        if not isinstance(explicit, list):
+            explicit = [explicit]
+        for dep in explicit:
+            dep_index = by_key.get(str(dep))
+            if dep_index is not None and dep_index < node.index:
+                node.depends_on.add(dep_index)
+
+        referenced = False
+        for other in earlier:
+            if ranks[other.index] != ranks[node.index]:
+                node.depends_on.add(other.index)
+            if other.file_path is None:
+                continue
+            if other.file_path == node.file_path:
+                node.depends_on.add(other.index)
+            elif _references(text, other.file_path):
+                node.depends_on.add(other.index)
+                referenced = True
+
+        if node.agent != "coding" and not referenced:
+            node.depends_on.update(other.index for other in earlier)
+
+    return nodes
+
+
+class TaskScheduler:
+    """Runs a task graph concurrently while honouring its dependencies."""
+
+    def __init__(self, max_concurrency: int = 4):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum number of tasks running at the same time
+        """
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def run(
+        self,
+        nodes: List[TaskNode],
+        runner: Callable[[TaskNode], Awaitable[Any]],
+    ) -> List[Any]:
+        """
+        Execute every node once all of its dependencies have finished.
+
+        Failed tasks still release their dependents, matching the sequential
+        behaviour where a failure did not stop the rest of the plan.
+
+        Args:
+            nodes: Graph built by ``build_task_graph``
+            runner: Coroutine function executing a single node
+
+        Returns:
+            Runner results in plan order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        done = {node.index: asyncio.Event() for node in nodes}
+
+        async def _run_node(node: TaskNode) -> Any:
+            try:
+                for dep in node.depends_on:
+                    await done[dep].wait()
+                async with semaphore:
+                    return await runner(node)
+            finally:
+                done[node.index].set()
+
+        results = await asyncio.gather(
+            *(_run_node(node) for node in nodes), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return list(results)
@@ -1,8 +1,8 @@
 """Task agent for managing task context."""
 
 from typing import Dict, Any, List
-from pathlib import Path
 from .base_agent import BaseAgent
+from coding_agent_plugin.managers.task_journal import TaskJournal
 
 
 class TaskAgent(BaseAgent):
@@ -10,8 +10,9 @@ class TaskAgent(BaseAgent):
 
     def __init__(self, name: str = "task", model: str = None):
         super().__init__(name, model)
-        from coding_agent_plugin.managers import ProjectManager
-        self.pm = ProjectManager()
+        from coding_agent_plugin.managers import get_project_manager
+        self.pm = get_project_manager()
+        self._project_paths: Dict[str, str] = {}
 
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute task management operations."""
@@ -20,6 +21,11 @@ class TaskAgent(BaseAgent):
         
         if not project_id:
             raise ValueError("Missing project_id")
+        
+        if project_id not in self._project_paths:
+            project = await self.pm.aget_project(project_id)
+            if project:
+                self._project_paths[project_id] = project["storage_path"]
 
         if action == "init_tasks":
             tasks_list = task.get("tasks", [])
@@ -27,7 +33,10 @@ class TaskAgent(BaseAgent):
         elif action == "update_status":
             task_desc = task.get("task_description")
             status = task.get("status", "completed")
-            return self.update_task_status(project_id, task_desc, status)
+            return self.update_task_status(project_id, task_desc, status, task.get("task_id"))
+        elif action == "flush":
+            self._get_journal(project_id).flush()
+            return {"status": "flushed"}
         else:
             # Default/Legacy behavior: just log
             user_prompt = task.get("user_prompt")
@@ -37,76 +46,47 @@ class TaskAgent(BaseAgent):
                 return {"status": "logged"}
             return {"status": "no_action"}
 
-    def _get_tasks_file(self, project_id: str) -> Path:
-        """Resolve tasks.md path."""
-        from pathlib import Path
-        project = self.pm.get_project(project_id)
-        if not project:
+    def _get_journal(self, project_id: str) -> TaskJournal:
+        """Task journal of a project (looked up once, by ``execute``)."""
+        project_path = self._project_paths.get(project_id)
+        if project_path is None:
             raise ValueError(f"Project {project_id} not found")
-            
-        context_dir = Path(project.storage_path) / ".agentic"
-        context_dir.mkdir(parents=True, exist_ok=True)
-        return context_dir / "tasks.md"
+        return TaskJournal.for_project(project_path)
 
     def init_tasks(self, project_id: str, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Initialize tasks.md with the plan."""
+        """Start the task journal for the plan and render tasks.md."""
         try:
-            file_path = self._get_tasks_file(project_id)
-            
-            with open(file_path, "w") as f:
-                f.write("# Project Tasks\n\n")
-                for t in tasks:
-                    desc = t.get("description", "Unknown task")
-                    agent = t.get("agent", "unknown")
-                    f.write(f"- [ ] {desc} (Agent: {agent})\n")
+            journal = self._get_journal(project_id)
+            journal.init(tasks)
             
-            self.log(f"Initialized tasks.md at {file_path}")
-            return {"status": "initialized", "file_path": str(file_path)}
+            self.log(f"Initialized tasks.md at {journal.view_path}")
+            return {"status": "initialized", "file_path": str(journal.view_path)}
         except Exception as e:
             self.log(f"Failed to init tasks: {e}")
             return {"status": "error", "error": str(e)}
 
-    def update_task_status(self, project_id: str, task_desc: str, status: str) -> Dict[str, Any]:
-        """Mark a task as completed in tasks.md."""
+    def update_task_status(self, project_id: str, task_desc: str, status: str, task_id: str | None = None) -> Dict[str, Any]:
+        """
+        Record a task status change in the journal.
+        
+        Tasks are addressed by ``task_id``; without one, the first task whose
+        description matches exactly is updated. tasks.md is re-rendered
+        shortly after (debounced).
+        """
         try:
-            file_path = self._get_tasks_file(project_id)
-            if not file_path.exists():
-                return {"status": "error", "error": "tasks.md not found"}
-            
-            lines = []
-            with open(file_path, "r") as f:
-                lines = f.readlines()
-            
-            updated = False
-            new_lines = []
-            for line in lines:
-                if task_desc in line:
-                    if status == "completed":
-                        if "- [ ]" in line:
-                            new_lines.append(line.replace("- [ ]", "- [x]"))
-                            updated = True
-                        elif "- [/]" in line:
-                            new_lines.append(line.replace("- [/]", "- [x]"))
-                            updated = True
-                        else:
-                            new_lines.append(line)
-                    elif status == "in_progress":
-                        if "- [ ]" in line:
-                            new_lines.append(line.replace("- [ ]", "- [/]"))
-                            updated = True
-                        else:
-                            new_lines.append(line)
-                    else:
-                        new_lines.append(line)
-                else:
-                    new_lines.append(line)
+            journal = self._get_journal(project_id)
+            if task_id is None:
+                task_id = journal.find(task_desc)
+                if task_id is None:
+                    return {"status": "not_found"}
+            elif journal.status(task_id) is None:
+                return {"status": "not_found"}
             
+            updated = journal.update(task_id, status)
             if updated:
-                with open(file_path, "w") as f:
-                    f.writelines(new_lines)
-                self.log(f"Updated task status: {task_desc} -> {status}")
+                self.log(f"Updated task status: {task_desc or task_id} -> {status}")
             
-            return {"status": "updated" if updated else "not_found"}
+            return {"status": "updated" if updated else "unchanged"}
         except Exception as e:
             self.log(f"Failed to update task: {e}")
             return {"status": "error", "error": str(e)}
@@ -42,7 +42,10 @@ def app():
 @click.option("--git", is_flag=True, default=True, help="Initialize git repository")
 @click.option("--no-git", is_flag=True, help="Skip git initialization")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed logs")
-def create(prompt, mode, project, model, provider, interactive, git, no_git, verbose):
+@click.option("--resume", is_flag=True, help="Resume the last interrupted autonomous run")
+@click.option("--stream", is_flag=True, help="Stream generated code live (direct mode)")
+@click.option("--events", "events_sink", help="Also write progress events as NDJSON to a file, tcp://host:port or unix:/socket")
+def create(prompt, mode, project, model, provider, interactive, git, no_git, verbose, resume, stream, events_sink):
     """
     Create a new project from a natural language prompt.
     
@@ -59,6 +62,8 @@ def create(prompt, mode, project, model, provider, interactive, git, no_git, ver
     if no_git:
         git = False
     
+    _attach_event_sink(events_sink)
+    
     # If no prompt, enter interactive mode
     if not prompt:
         console.print("\n[bold cyan]🤖 Agentic Coder - Interactive Mode[/bold cyan]\n")
@@ -86,7 +91,8 @@ def create(prompt, mode, project, model, provider, interactive, git, no_git, ver
             prompt=prompt,
             project_name=project,
             model=model,
-            verbose=verbose
+            verbose=verbose,
+            stream=stream
         ))
     else:  # autonomous mode
         asyncio.run(_autonomous_mode(
@@ -96,7 +102,8 @@ def create(prompt, mode, project, model, provider, interactive, git, no_git, ver
             provider=provider,
             interactive=interactive,
             git=git,
-            verbose=verbose
+            verbose=verbose,
+            resume=resume
         ))
 
 
@@ -145,11 +152,55 @@ def _infer_filename(prompt: str) -> str:
     return "main.py"
 
 
+class _StreamView:
+    """Live terminal view of code being streamed, showing only the last lines."""
+    
+    MAX_LINES = 30
+    
+    def __init__(self, filename: str):
+        from collections import deque
+        from rich.syntax import Syntax
+        
+        self.filename = filename
+        self.lexer = Syntax.guess_lexer(filename)
+        self.lines = deque([""], maxlen=self.MAX_LINES)
+        self.total_lines = 1
+    
+    def live(self):
+        from rich.live import Live
+        
+        # The view renders itself on each refresh, so tokens only append text
+        return Live(self, console=console, refresh_per_second=12)
+    
+    def update(self, text: Optional[str]) -> None:
+        """Append a chunk of code (None discards everything shown so far)."""
+        if text is None:
+            self.lines.clear()
+            self.lines.append("")
+            self.total_lines = 1
+            return
+        first, *rest = text.split("\n")
+        self.lines[-1] += first
+        self.lines.extend(rest)
+        self.total_lines += len(rest)
+    
+    def __rich__(self):
+        from rich.syntax import Syntax
+        
+        start_line = self.total_lines - len(self.lines) + 1
+        return Panel(
+            Syntax("\n".join(self.lines), self.lexer, line_numbers=True, start_line=start_line),
+            title=f"[bold green]Generating {self.filename}[/bold green]",
+            border_style="green"
+        )
+
+
 async def _direct_mode(
     prompt: str,
     project_name: str,
     model: str = None,
-    verbose: bool = False
+    verbose: bool = False,
+    stream: bool = False
 ):
     """
     Direct mode: Quick code generation without planning.
@@ -159,9 +210,10 @@ async def _direct_mode(
         project_name: Target project
         model: Optional LLM model override
         verbose: Show detailed logs
+        stream: Render code live as it is generated
     """
     from coding_agent_plugin.agents.coding import CodingAgent
-    from coding_agent_plugin.managers import StorageManager, ProjectManager
+    from coding_agent_plugin.managers import StorageManager, get_project_manager
     from coding_agent_plugin.utils.logger import logger
     
     console.print("[bold cyan]🚀 Direct Mode: Quick Coding[/bold cyan]\n")
@@ -171,8 +223,8 @@ async def _direct_mode(
     console.print(f"[cyan]Target file:[/cyan] {filename}\n")
     
     # Get or create project
-    pm = ProjectManager()
-    project = pm.get_project(project_name)
+    pm = get_project_manager()
+    project = await pm.aget_project(project_name)
     if not project:
         raise ValueError(f"Project '{project_name}' not found. Create it first with 'agentic-coder project create {project_name}'")
     
@@ -182,28 +234,37 @@ async def _direct_mode(
     
     # Check existing content
     sm = StorageManager()
-    existing_content = sm.get_file(project_name, filename)
+    existing_content = await sm.aget_file(project_name, filename)
     
     if existing_content:
         console.print(f"[yellow]ℹ️  File exists, will update it[/yellow]\n")
     
     # Generate code
+    from coding_agent_plugin.core.events import ensure_run
+    ensure_run(project["id"])
     coding_agent = CodingAgent("coding")
     
     try:
-        with console.status("[bold green]Generating code...", spinner="dots"):
-            if model:
-                import os
-                os.environ["LLM_MODEL"] = model
-            
-            result = await coding_agent.execute({
-                "file_path": filename,
-                "user_prompt": prompt,
-                "project_id": project_name,
-                "existing_content": existing_content
-            })
-            
-            logger.info(f"Code generated for {filename}")
+        if model:
+            import os
+            os.environ["LLM_MODEL"] = model
+        
+        task = {
+            "file_path": filename,
+            "user_prompt": prompt,
+            "project_id": project_name,
+            "existing_content": existing_content
+        }
+        
+        if stream:
+            view = _StreamView(filename)
+            with view.live():
+                result = await coding_agent.execute({**task, "stream": True, "on_token": view.update})
+        else:
+            with console.status("[bold green]Generating code...", spinner="dots"):
+                result = await coding_agent.execute(task)
+        
+        logger.info(f"Code generated for {filename}")
         
         console.print(f"[green]✓[/green] Generated {filename}")
         
@@ -231,12 +292,15 @@ async def _autonomous_mode(
     provider: str = None,
     interactive: bool = False,
     git: bool = True,
-    verbose: bool = False
+    verbose: bool = False,
+    resume: bool = False
 ):
     """
     Autonomous mode: Full planning + generation.
     
-    This is the original behavior with full orchestration.
+    This is the original behavior with full orchestration. With ``resume``
+    the plan saved in the project checkpoint is replayed and completed
+    tasks are skipped.
     """
     from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
     from coding_agent_plugin.ui.plan_review import review_plan
@@ -244,7 +308,7 @@ async def _autonomous_mode(
     from coding_agent_plugin.utils.logger import logger, get_project_logger
     from coding_agent_plugin.utils.validation import validate_prompt, sanitize_project_id, ValidationError
     from coding_agent_plugin.core.config import validate_llm_config
-    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.managers import get_project_manager, CheckpointManager
     
     try:
         # Validate LLM configuration
@@ -262,11 +326,11 @@ async def _autonomous_mode(
             return
         
         # Get or create project
-        pm = ProjectManager()
+        pm = get_project_manager()
         
         if not project_name:
             # 1. Try to get current project
-            current_project = pm.get_current_project()
+            current_project = await pm.aget_current_project()
             if current_project:
                 project_name = current_project
                 console.print(f"[cyan]Using active project: {project_name}[/cyan]")
@@ -278,11 +342,11 @@ async def _autonomous_mode(
                 console.print(f"[yellow]No active project. Generated new: {project_name}[/yellow]")
         
         # Check if project exists, otherwise create it
-        project = pm.get_project(project_name)
+        project = await pm.aget_project(project_name)
         if not project:
             console.print(f"[green]Creating new project '{project_name}'...[/green]")
             try:
-                project = pm.create_project(project_name, prompt)
+                project = await pm.acreate_project(project_name, prompt)
             except Exception as e:
                 console.print(f"[red]❌ Failed to create project: {e}[/red]")
                 return
@@ -294,6 +358,10 @@ async def _autonomous_mode(
         project_id = project['id']
         logger.info(f"Using project: {project_id}")
         
+        # Planning and execution are accounted as one run
+        from coding_agent_plugin.core.events import ensure_run
+        ensure_run(project_id)
+        
         # Set model and provider if provided
         if model:
             os.environ["LLM_MODEL"] = model
@@ -310,24 +378,37 @@ async def _autonomous_mode(
                 logger.exception("Orchestrator initialization failed")
             return
         
+        # Resume from checkpoint
+        workflow = None
+        checkpoint = CheckpointManager(project['storage_path']).load() if resume else None
+        if resume:
+            if checkpoint:
+                workflow = checkpoint["plan"]
+                done = len(checkpoint.get("completed", {}))
+                console.print(f"[cyan]♻️  Resuming previous run ({done}/{len(workflow.get('tasks', []))} tasks completed)[/cyan]")
+                logger.info(f"Resuming run from checkpoint: {done} tasks completed")
+            else:
+                console.print("[yellow]No checkpoint found, starting a fresh run[/yellow]")
+        
         # Phase 1: Planning
-        try:
-            with console.status("[bold green]Planning project...", spinner="dots"):
-                planning_agent = orchestrator.agents["planning"]
-                plan_result = await planning_agent.execute({
-                    "user_prompt": prompt,
-                    "project_id": project_id
-                })
-                workflow = plan_result["workflow"]
-                logger.info(f"Planning completed: {len(workflow.get('tasks', []))} tasks")
-        except Exception as e:
-            console.print(f"[red]❌ Planning failed: {e}[/red]")
-            if verbose:
-                logger.exception("Planning phase failed")
-            return
+        if workflow is None:
+            try:
+                with console.status("[bold green]Planning project...", spinner="dots"):
+                    planning_agent = orchestrator.agents["planning"]
+                    plan_result = await planning_agent.execute({
+                        "user_prompt": prompt,
+                        "project_id": project_id
+                    })
+                    workflow = plan_result["workflow"]
+                    logger.info(f"Planning completed: {len(workflow.get('tasks', []))} tasks")
+            except Exception as e:
+                console.print(f"[red]❌ Planning failed: {e}[/red]")
+                if verbose:
+                    logger.exception("Planning phase failed")
+                return
         
-        # Interactive plan review
-        if interactive:
+        # Interactive plan review (a resumed plan was already approved)
+        if interactive and not checkpoint:
             try:
                 approved = review_plan(workflow, console)
                 if not approved:
@@ -342,7 +423,7 @@ async def _autonomous_mode(
         console.print("\n[bold green]🚀 Generating project...[/bold green]\n")
         
         try:
-            result = await orchestrator.run_project(prompt, project_id)
+            result = await orchestrator.run_project(prompt, project_id, workflow=workflow, resume=resume)
             logger.info(f"Project execution completed: {result.get('status')}")
         except Exception as e:
             console.print(f"[red]❌ Project execution failed: {e}[/red]")
@@ -453,7 +534,6 @@ def improve(request, file, interactive, dry_run):
 
 def _process_improvement(request: str, context: ProjectContext, target_file: str = None, dry_run: bool = False):
     """Process a single improvement request."""
-    from coding_agent_plugin.agents.file_modifier import FileModifierAgent
     from coding_agent_plugin.integrations.git_manager import GitManager
     
     console.print(f"\n[bold]Processing:[/bold] {request}\n")
@@ -465,8 +545,10 @@ def _process_improvement(request: str, context: ProjectContext, target_file: str
             console.print(f"[red]File not found: {target_file}[/red]")
             return
     else:
-        # Auto-detect files (for now, let's modify main files)
-        files_to_modify = context.get_main_files()
+        # Files defining the symbols mentioned in the request, else main files
+        files_to_modify = context.get_files_for_request(request)
+        if not files_to_modify:
+            files_to_modify = context.get_main_files()
         if not files_to_modify:
             # Fallback to Python files
             files_to_modify = context.get_files_by_extension(".py")[:3]  # Limit to 3 files
@@ -481,49 +563,82 @@ def _process_improvement(request: str, context: ProjectContext, target_file: str
         console.print("[yellow]Dry run - no changes will be applied[/yellow]")
         return
     
-    # Modify each file
-    modifier = FileModifierAgent("file_modifier")
-    changes = []
-    
-    for file_path in files_to_modify:
-        try:
-            with console.status(f"[bold green]Modifying {file_path}...", spinner="dots"):
-                result = asyncio.run(modifier.execute({
-                    "instruction": request,
-                    "file_path": file_path,
-                    "project_id": os.path.basename(os.getcwd()),
-                    "existing_content": context.get_file_content(file_path)
-                }))
-            
-            console.print(f"[green]✓[/green] Modified {file_path}")
-            changes.append({
-                "file": file_path,
-                "instruction": request
-            })
-            
-        except Exception as e:
-            console.print(f"[red]✗[/red] Failed to modify {file_path}: {e}")
+    # Modify all files concurrently
+    changes = asyncio.run(_modify_files(request, context, files_to_modify))
     
     if changes:
         # Save to conversation history
         context.save_conversation_history(request, changes)
         
-        # Git commit
+        # Git commit (once for all files)
         git_mgr = GitManager(os.getcwd())
-        if git_mgr.repo:
-            git_mgr.commit(f"improve: {request}")
-            console.print(f"\n[green]✓[/green] Changes committed to git")
+        if (Path(os.getcwd()) / ".git").exists() and git_mgr.init_repo():
+            # Stage only the files that were modified, not the whole work tree
+            if git_mgr.commit(f"improve: {request}", paths=[c["file"] for c in changes]):
+                console.print(f"\n[green]✓[/green] Changes committed to git")
         
         console.print(f"\n[bold green]✓ Done![/bold green] Modified {len(changes)} file(s)")
 
 
+async def _modify_files(request: str, context: ProjectContext, files_to_modify: list) -> list:
+    """
+    Apply an improvement request to several files concurrently.
+    
+    At most AGENT_MAX_CONCURRENCY files are modified at the same time, each
+    with its own progress bar.
+    
+    Returns:
+        List of changes for the files that were modified successfully
+    """
+    from coding_agent_plugin.agents.file_modifier import FileModifierAgent
+    from coding_agent_plugin.core.config import AGENT_MAX_CONCURRENCY
+    from rich.progress import BarColumn, TimeElapsedColumn
+    
+    modifier = FileModifierAgent("file_modifier")
+    semaphore = asyncio.Semaphore(AGENT_MAX_CONCURRENCY)
+    project_path = os.getcwd()
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        TimeElapsedColumn(),
+        console=console
+    ) as progress:
+        
+        async def modify(file_path: str):
+            task_id = progress.add_task(f"[dim]Waiting[/dim] {file_path}", total=1)
+            async with semaphore:
+                progress.update(task_id, description=f"[bold green]Modifying[/bold green] {file_path}", total=None)
+                try:
+                    await modifier.execute({
+                        "instruction": request,
+                        "file_path": file_path,
+                        "project_id": os.path.basename(project_path),
+                        "project_path": project_path,
+                        "existing_content": context.get_file_content(file_path)
+                    })
+                except Exception as e:
+                    progress.update(task_id, description=f"[red]✗[/red] {file_path}: {e}", total=1, completed=1)
+                    return None
+                progress.update(task_id, description=f"[green]✓[/green] Modified {file_path}", total=1, completed=1)
+                return {
+                    "file": file_path,
+                    "instruction": request
+                }
+        
+        results = await asyncio.gather(*(modify(file_path) for file_path in files_to_modify))
+    
+    return [change for change in results if change]
+
+
 @app.command()
 def init():
     """Initialize agentic-coder environment."""
-    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.managers import get_project_manager
     
     try:
-        pm = ProjectManager()
+        pm = get_project_manager()
         console.print(Panel.fit(
             f"[bold green]✓ Environment initialized![/bold green]\n\n"
             f"[cyan]Database:[/cyan] {pm.db_path}\n"
@@ -562,7 +677,7 @@ def templates():
 
 @app.group()
 def project():
-    """Manage projects (create, list, switch, delete, run)."""
+    """Manage projects (create, list, switch, delete, run, snapshot, rollback)."""
     pass
 
 
@@ -572,12 +687,16 @@ def project():
 @click.option("--interactive", "-i", is_flag=True, help="Interactive plan review")
 @click.option("--git/--no-git", default=True, help="Initialize/Commit to git")
 @click.option("--verbose", "-v", is_flag=True, help="Verbose logging")
-def project_run(prompt, mode, interactive, git, verbose):
+@click.option("--resume", is_flag=True, help="Resume the last interrupted autonomous run")
+@click.option("--stream", is_flag=True, help="Stream generated code live (direct mode)")
+@click.option("--events", "events_sink", help="Also write progress events as NDJSON to a file, tcp://host:port or unix:/socket")
+def project_run(prompt, mode, interactive, git, verbose, resume, stream, events_sink):
     """Run the agent on the current project."""
     import asyncio
-    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.managers import get_project_manager
     
-    pm = ProjectManager()
+    _attach_event_sink(events_sink)
+    pm = get_project_manager()
     current_project = pm.get_current_project()
     
     if not current_project:
@@ -591,26 +710,29 @@ def project_run(prompt, mode, interactive, git, verbose):
             project_name=current_project,
             interactive=interactive,
             git=git,
-            verbose=verbose
+            verbose=verbose,
+            resume=resume
         ))
     else:
         asyncio.run(_direct_mode(
             prompt=prompt,
             project_name=current_project,
-            verbose=verbose
+            verbose=verbose,
+            stream=stream
         ))
 
 
 @project.command("create")
 @click.argument("name")
 @click.option("--description", "-d", help="Project description")
-def project_create(name, description):
+@click.option("--template", "-t", help="Start with the files of an existing project")
+def project_create(name, description, template):
     """Create a new project."""
-    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.managers import get_project_manager
     
     try:
-        pm = ProjectManager()
-        proj = pm.create_project(name, description)
+        pm = get_project_manager()
+        proj = pm.create_project(name, description, template=template)
         
         desc_line = f"[cyan]Description:[/cyan] {proj['description']}" if proj.get('description') else ''
         
@@ -637,10 +759,10 @@ def project_create(name, description):
 @project.command("list")
 def project_list():
     """List all projects."""
-    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.managers import get_project_manager
     from rich.table import Table
     
-    pm = ProjectManager()
+    pm = get_project_manager()
     projects = pm.list_projects()
     
     if not projects:
@@ -677,9 +799,9 @@ def project_list():
 @click.argument("name")
 def project_switch(name):
     """Switch to a different project."""
-    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.managers import get_project_manager
     
-    pm = ProjectManager()
+    pm = get_project_manager()
     
     if pm.set_current_project(name):
         console.print(f"[green]✓ Switched to project '[bold]{name}[/bold]'[/green]")
@@ -692,7 +814,7 @@ def project_switch(name):
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation")
 def project_delete(name, yes):
     """Delete a project and all its files."""
-    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.managers import get_project_manager
     
     if not yes:
         confirm = click.confirm(
@@ -703,7 +825,7 @@ def project_delete(name, yes):
             console.print("[yellow]Cancelled[/yellow]")
             return
     
-    pm = ProjectManager()
+    pm = get_project_manager()
     
     if pm.delete_project(name):
         console.print(f"[green]✓ Project '{name}' deleted successfully[/green]")
@@ -715,9 +837,9 @@ def project_delete(name, yes):
 @click.argument("name", required=False)
 def project_info(name):
     """Show detailed project information."""
-    from coding_agent_plugin.managers import ProjectManager
+    from coding_agent_plugin.managers import get_project_manager
     
-    pm = ProjectManager()
+    pm = get_project_manager()
     
     # If no name provided, use current project
     if not name:
@@ -741,16 +863,219 @@ def project_info(name):
         f"[cyan]Files:[/cyan] {stats['file_count']}\n"
         f"[cyan]Size:[/cyan] {stats['total_size_mb']} MB\n"
         f"[cyan]Created:[/cyan] {stats['created_at'][:19] if stats['created_at'] else 'N/A'}\n"
-        f"[cyan]Updated:[/cyan] {stats['updated_at'][:19] if stats['updated_at'] else 'N/A'}",
+        f"[cyan]Updated:[/cyan] {stats['updated_at'][:19] if stats['updated_at'] else 'N/A'}\n"
+        f"[cyan]LLM calls:[/cyan] {stats['usage']['calls']}\n"
+        f"[cyan]Tokens:[/cyan] {_format_tokens(stats['usage'])}\n"
+        f"[cyan]LLM time:[/cyan] {stats['usage']['latency']:.1f}s\n"
+        f"[cyan]Cost:[/cyan] {_format_cost(stats['usage']['cost'])}",
         title=f"[bold]{stats['name']}[/bold]",
         border_style="cyan"
     ))
 
 
+def _format_tokens(usage):
+    """Token totals of a usage row, e.g. ``1,200 in (300 cached) / 450 out``."""
+    cached = f" ({usage['cached_tokens']:,} cached)" if usage["cached_tokens"] else ""
+    return f"{usage['input_tokens']:,} in{cached} / {usage['output_tokens']:,} out"
+
+
+def _format_cost(cost):
+    return f"${cost:.4f}" if cost is not None else "N/A (set LLM_PRICING)"
+
+
+def _attach_event_sink(target):
+    """Stream run events as NDJSON to ``target`` (see ``--events``)."""
+    if not target:
+        return
+    from coding_agent_plugin.core.events import get_event_bus
+    try:
+        get_event_bus().add_sink(target)
+    except OSError as e:
+        console.print(f"[yellow]⚠️  Cannot open event sink {target}: {e}[/yellow]")
+
+
+def _resolve_project_name(pm, name):
+    """The given project name, or the current project."""
+    name = name or pm.get_current_project()
+    if not name:
+        console.print("[red]❌ No current project set. Specify a project name or switch to one.[/red]")
+    return name
+
+
+@project.command("snapshot")
+@click.argument("name", required=False)
+@click.option("--message", "-m", help="Version description")
+def project_snapshot(name, message):
+    """Save the project's files as a new version."""
+    from coding_agent_plugin.managers import get_project_manager
+    
+    pm = get_project_manager()
+    name = _resolve_project_name(pm, name)
+    if not name:
+        return
+    
+    result = pm.snapshot_project(name, message)
+    if not result:
+        console.print(f"[red]❌ Project '{name}' not found[/red]")
+        return
+    
+    console.print(
+        f"[green]✓ Saved version {result['version']}[/green] "
+        f"[dim]({result['file_count']} files: {result['added']} added, "
+        f"{result['modified']} modified, {result['deleted']} deleted)[/dim]"
+    )
+
+
+@project.command("versions")
+@click.argument("name", required=False)
+def project_versions(name):
+    """List saved versions of a project."""
+    from coding_agent_plugin.managers import get_project_manager
+    from rich.table import Table
+    
+    pm = get_project_manager()
+    name = _resolve_project_name(pm, name)
+    if not name:
+        return
+    
+    versions = pm.list_versions(name)
+    if versions is None:
+        console.print(f"[red]❌ Project '{name}' not found[/red]")
+        return
+    if not versions:
+        console.print("[yellow]No versions yet. Save one with 'agentic-coder project snapshot'[/yellow]")
+        return
+    
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Version", style="green")
+    table.add_column("Description")
+    table.add_column("Files")
+    table.add_column("Changes")
+    table.add_column("Created", style="dim")
+    for version in versions:
+        table.add_row(
+            str(version["version"]),
+            version["description"] or "[dim]-[/dim]",
+            str(version["file_count"]),
+            f"+{version['added']} ~{version['modified']} -{version['deleted']}",
+            version["created_at"][:19] if version["created_at"] else "N/A",
+        )
+    console.print(table)
+
+
+@project.command("rollback")
+@click.argument("version", type=int)
+@click.option("--name", "-n", help="Project name (default: current project)")
+@click.option("--yes", "-y", is_flag=True, help="Skip confirmation")
+def project_rollback(version, name, yes):
+    """Restore the project's files to a saved version."""
+    from coding_agent_plugin.managers import get_project_manager
+    
+    pm = get_project_manager()
+    name = _resolve_project_name(pm, name)
+    if not name:
+        return
+    
+    if not yes and not click.confirm(
+        f"Restore '{name}' to version {version}? Unsaved changes will be lost.", default=False
+    ):
+        console.print("[yellow]Cancelled[/yellow]")
+        return
+    
+    result = pm.restore_project(name, version)
+    if not result:
+        console.print(f"[red]❌ Version {version} of project '{name}' not found[/red]")
+        return
+    
+    console.print(
+        f"[green]✓ Restored version {version}[/green] "
+        f"[dim]({result['restored']} restored, {result['deleted']} deleted, {result['unchanged']} unchanged)[/dim]"
+    )
+
+
+@app.command()
+@click.option("--project", "-p", "project_name", help="Only this project (default: all projects)")
+@click.option("--by", "group_by", default="agent", show_default=True,
+              type=click.Choice(["agent", "task", "run", "model", "project"]),
+              help="Break usage down by")
+def stats(project_name, group_by):
+    """Show where LLM tokens, time and cost go."""
+    from rich.table import Table
+    from coding_agent_plugin.managers import get_project_manager
+    
+    pm = get_project_manager()
+    column = group_by if group_by in ("agent", "model") else f"{group_by}_id"
+    rows = pm.usage_summary(project_name, column)
+    if rows is None:
+        console.print(f"[red]❌ Project '{project_name}' not found[/red]")
+        return
+    if not rows:
+        console.print("[yellow]No LLM usage recorded yet.[/yellow]")
+        return
+    
+    names = {p["id"]: p["name"] for p in pm.list_projects()} if group_by == "project" else {}
+    total = pm.usage_summary(project_name)[0]
+    
+    table = Table(show_header=True, header_style="bold cyan", title=f"LLM usage by {group_by}")
+    table.add_column(group_by.capitalize(), style="green")
+    for title in ("Calls", "Input", "Cached", "Output", "LLM time", "Cost"):
+        table.add_column(title, justify="right")
+    
+    for row in rows + [{**total, column: "Total"}]:
+        key = row[column]
+        table.add_row(
+            names.get(key, key) or "-",
+            f"{row['calls']:,}",
+            f"{row['input_tokens']:,}",
+            f"{row['cached_tokens']:,}",
+            f"{row['output_tokens']:,}",
+            f"{row['latency']:.1f}s",
+            f"${row['cost']:.4f}" if row["cost"] is not None else "-",
+        )
+    console.print(table)
+
+
+@app.group()
+def cache():
+    """Inspect or clear the LLM response cache."""
+    pass
+
+
+@cache.command("stats")
+def cache_stats():
+    """Show LLM response cache statistics."""
+    from coding_agent_plugin.core.config import LLM_CACHE_ENABLED
+    from coding_agent_plugin.services.llm_cache import get_llm_cache
+    
+    stats = get_llm_cache(force=True).stats()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = f"{stats['hits'] / lookups:.1%}" if lookups else "N/A"
+    
+    console.print(Panel.fit(
+        f"[cyan]Enabled:[/cyan] {'yes' if LLM_CACHE_ENABLED else 'no (set LLM_CACHE_ENABLED=true)'}\n"
+        f"[cyan]Entries:[/cyan] {stats['entries']}\n"
+        f"[cyan]Size:[/cyan] {round(stats['size_bytes'] / (1024 * 1024), 2)} MB\n"
+        f"[cyan]Hits:[/cyan] {stats['hits']}\n"
+        f"[cyan]Misses:[/cyan] {stats['misses']}\n"
+        f"[cyan]Hit rate:[/cyan] {hit_rate}",
+        title="[bold]LLM Cache[/bold]",
+        border_style="cyan"
+    ))
+
+
+@cache.command("clear")
+def cache_clear():
+    """Remove all cached LLM responses."""
+    from coding_agent_plugin.services.llm_cache import get_llm_cache
+    
+    get_llm_cache(force=True).clear()
+    console.print("[green]✓ LLM cache cleared[/green]")
+
+
 @app.command()
 def init():
     """Initialize agentic-coder (first-time setup)."""
-    from coding_agent_plugin.models import init_db
+    from coding_agent_plugin.managers import get_project_manager
     from coding_agent_plugin.models.database import AGENTIC_HOME
     
     console.print("\n[bold cyan]🚀 Initializing Agentic Coder...[/bold cyan]\n")
@@ -760,7 +1085,8 @@ def init():
     console.print(f"[green]✓[/green] Created home directory: {AGENTIC_HOME}")
     
     # Initialize database
-    init_db()
+    repository = get_project_manager().repository
+    repository.run_sync(repository.setup())
     console.print(f"[green]✓[/green] Initialized database")
     
     # Create projects directory
@@ -1,14 +1,118 @@
 """Project context system for understanding existing projects."""
 
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 import json
 
+# Leading bytes checked for a NUL to tell binary files apart
+BINARY_SNIFF_BYTES = 8192
+
+
+def _is_binary(path: str) -> bool:
+    """Cheap binary check: a NUL byte near the start of the file."""
+    with open(path, "rb") as f:
+        return b"\0" in f.read(BINARY_SNIFF_BYTES)
+
+
+class FileInfo(NamedTuple):
+    """Metadata of a project file recorded by the initial walk."""
+
+    size: int
+    mtime_ns: int
+
+
+class FileContentCache:
+    """
+    LRU cache of decoded file contents bounded by a byte budget.
+
+    Entries are keyed by path and remember the (size, mtime) they were read
+    at, so a file changed on disk is read again. Files larger than the
+    budget are never cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[FileInfo, str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, info: FileInfo) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            if entry[0] != info:
+                self._discard(path)
+                return None
+            self._entries.move_to_end(path)
+            return entry[1]
+
+    def put(self, path: str, info: FileInfo, content: str) -> None:
+        cost = info.size
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(path)
+            self._entries[path] = (info, content, cost)
+            self.size += cost
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _discard(self, path: str) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+
+class LazyFiles(Mapping):
+    """
+    Read-only mapping of project file path to content, loaded on access.
+
+    Membership, iteration and length only use the metadata from the walk.
+    Files that turn out to be binary or unreadable when accessed raise
+    ``KeyError`` like missing ones.
+    """
+
+    def __init__(self, context: "ProjectContext"):
+        self._context = context
+
+    def __getitem__(self, file_path: str) -> str:
+        content = self._context.get_file_content(file_path)
+        if content is None:
+            raise KeyError(file_path)
+        return content
+
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self._context.file_info
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._context.file_info)
+
+    def __len__(self) -> int:
+        return len(self._context.file_info)
+
 
 class ProjectContext:
     """Manages context and understanding of an existing project."""
     
+    IGNORE_DIRS = {".git", ".agent_context", ".agentic", "__pycache__", "node_modules", ".venv", "venv"}
+    IGNORE_EXTS = {
+        ".pyc", ".pyo", ".db", ".sqlite", ".log",
+        # Binary formats that would be skipped when read anyway
+        ".png", ".jpg", ".jpeg", ".gif", ".ico", ".webp", ".pdf", ".zip", ".gz", ".tar",
+        ".whl", ".so", ".dll", ".exe", ".woff", ".woff2", ".ttf", ".eot", ".mp3", ".mp4",
+    }
+    
     def __init__(self, project_path: str):
         """
         Initialize project context.
@@ -16,10 +120,14 @@ class ProjectContext:
         Args:
             project_path: Path to the project directory
         """
+        from coding_agent_plugin.core.config import PROJECT_CONTEXT_CACHE_BYTES
+        
         self.project_path = Path(project_path)
-        self.files: Dict[str, str] = {}
+        self.file_info: Dict[str, FileInfo] = {}
+        self.files = LazyFiles(self)
         self.structure: Dict[str, List[str]] = {}
         self.agent_context_path = self.project_path / ".agent_context"
+        self._cache = FileContentCache(PROJECT_CONTEXT_CACHE_BYTES)
         
     def is_valid_project(self) -> bool:
         """Check if this is a valid coding-agent project."""
@@ -28,46 +136,25 @@ class ProjectContext:
     
     def load_project(self) -> bool:
         """
-        Load and analyze the project structure.
+        Load the project structure.
+        
+        Only file metadata (path, size, mtime) is collected here, plus a
+        sniff of the first bytes to leave out binary files; contents are
+        read on demand by ``get_file_content``.
         
         Returns:
             bool: True if successful
         """
         try:
-            # Scan all files (excluding hidden and common dirs to ignore)
-            ignore_dirs = {".git", ".agent_context", "__pycache__", "node_modules", ".venv", "venv"}
-            ignore_exts = {".pyc", ".pyo", ".db", ".sqlite", ".log"}
-            
-            for root, dirs, files in os.walk(self.project_path):
-                # Remove ignored directories from search
-                dirs[:] = [d for d in dirs if d not in ignore_dirs]
-                
-                rel_root = Path(root).relative_to(self.project_path)
-                
-                for file in files:
-                    file_path = Path(root) / file
-                    
-                    # Skip ignored extensions
-                    if file_path.suffix in ignore_exts:
-                        continue
-                    
-                    rel_path = file_path.relative_to(self.project_path)
-                    
-                    # Read text files only
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            self.files[str(rel_path)] = content
-                    except (UnicodeDecodeError, PermissionError):
-                        # Skip binary or unreadable files
-                        continue
+            self.file_info.clear()
+            self.structure.clear()
+            self._cache.clear()
+            self._scan(self.project_path, "")
             
             # Build structure
-            for file_path in self.files.keys():
+            for file_path in self.file_info:
                 directory = str(Path(file_path).parent)
-                if directory not in self.structure:
-                    self.structure[directory] = []
-                self.structure[directory].append(Path(file_path).name)
+                self.structure.setdefault(directory, []).append(Path(file_path).name)
             
             return True
             
@@ -75,9 +162,61 @@ class ProjectContext:
             print(f"Error loading project: {e}")
             return False
     
+    def _scan(self, directory: Path, rel_dir: str) -> None:
+        """Record metadata of the files below ``directory``, skipping ignored directories."""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self.IGNORE_DIRS:
+                            self._scan(Path(entry.path), rel_path)
+                    elif entry.is_file() and Path(entry.name).suffix not in self.IGNORE_EXTS:
+                        st = entry.stat()
+                        if st.st_size and _is_binary(entry.path):
+                            continue
+                        self.file_info[rel_path] = FileInfo(st.st_size, st.st_mtime_ns)
+                except OSError:
+                    continue
+    
     def get_file_content(self, file_path: str) -> Optional[str]:
-        """Get content of a specific file."""
-        return self.files.get(file_path)
+        """
+        Get content of a specific file.
+        
+        Contents are served from an LRU cache bounded by
+        PROJECT_CONTEXT_CACHE_BYTES and re-read when the file changed on
+        disk.
+        
+        Returns:
+            File content, or None if the file is unknown, binary or unreadable
+        """
+        if file_path not in self.file_info:
+            return None
+        full_path = self.project_path / file_path
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return None
+        info = FileInfo(st.st_size, st.st_mtime_ns)
+        self.file_info[file_path] = info
+        
+        content = self._cache.get(file_path, info)
+        if content is None:
+            content = self._read(full_path)
+            if content is not None:
+                self._cache.put(file_path, info, content)
+        return content
+    
+    @staticmethod
+    def _read(full_path: Path) -> Optional[str]:
+        try:
+            with open(full_path, "rb") as f:
+                data = f.read()
+            if b"\0" in data[:BINARY_SNIFF_BYTES]:
+                return None
+            return data.decode("utf-8")
+        except (UnicodeDecodeError, OSError):
+            return None
     
     def get_files_by_extension(self, extension: str) -> List[str]:
         """Get all files with a specific extension."""
@@ -88,6 +227,33 @@ class ProjectContext:
         main_names = ["main.py", "app.py", "index.py", "__init__.py", "server.py"]
         return [f for f in self.files.keys() if Path(f).name in main_names]
     
+    def get_files_for_request(self, request: str, limit: int = 5) -> List[str]:
+        """
+        Get the files defining the symbols mentioned in a request.
+        
+        Uses the project's persistent ``SymbolIndex``. Source files found by
+        ``load_project`` are re-stated first, so files modified by earlier
+        requests are parsed again.
+        
+        Returns:
+            Files ranked by relevance (empty if no mentioned symbol is defined)
+        """
+        from coding_agent_plugin.context.symbol_index import SymbolIndex
+        
+        entries = {}
+        for file_path in self.file_info:
+            if not SymbolIndex.supports(file_path):
+                continue
+            try:
+                st = os.stat(self.project_path / file_path)
+            except OSError:
+                continue
+            entries[file_path] = self.file_info[file_path] = FileInfo(st.st_size, st.st_mtime_ns)
+        
+        index = SymbolIndex.for_project(str(self.project_path))
+        index.refresh(entries)
+        return index.route(request, limit)
+    
     def save_conversation_history(self, request: str, changes: List[Dict]) -> bool:
         """
         Save a conversation turn to history.
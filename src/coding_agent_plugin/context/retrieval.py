@@ -0,0 +1,311 @@
+"""Local relevance-ranked retrieval of project files for prompt context."""
+
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from coding_agent_plugin.context.project_context import ProjectContext
+from coding_agent_plugin.managers.blob_store import SNAPSHOT_IGNORE_DIRS
+
+# Rough size of a token for budgeting prompt context
+CHARS_PER_TOKEN = 4
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Score multiplier for chunks in the same directory as the target file
+NEIGHBOUR_BOOST = 1.25
+
+WORD_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+CAMEL_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "this", "that", "to", "with", "def", "self",
+    "return", "import", "none", "true", "false", "if", "else", "not", "const",
+    "let", "var", "function", "create", "file", "code", "add", "make", "use",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms, including the parts of snake_case and camelCase names."""
+    terms = []
+    for word in WORD_PATTERN.findall(text):
+        parts = [p for piece in word.split("_") for p in CAMEL_PATTERN.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(p.lower() for p in parts)
+        terms.append(word.lower())
+    return [t for t in terms if len(t) > 1 and t not in STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in ``text``."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class Chunk:
+    """A range of lines of a project file (``start_line`` is 1-based, ``end_line`` inclusive)."""
+
+    path: str
+    start_line: int
+    end_line: int
+    text: str
+
+
+def chunk_text(path: str, text: str, max_lines: int = 40, min_lines: int = 8) -> List[Chunk]:
+    """
+    Split file content into chunks of at most ``max_lines`` lines.
+
+    Chunks preferably end before an unindented line (a new top-level
+    definition in most languages) once they have ``min_lines`` lines.
+    """
+    lines = text.splitlines()
+    chunks = []
+    start = 0
+    for i in range(1, len(lines) + 1):
+        size = i - start
+        at_boundary = i < len(lines) and lines[i][:1] not in ("", " ", "\t", ")", "]", "}")
+        if i == len(lines) or size >= max_lines or (size >= min_lines and at_boundary):
+            body = "\n".join(lines[start:i])
+            if body.strip():
+                chunks.append(Chunk(path, start + 1, i, body))
+            start = i
+    return chunks
+
+
+class ProjectRetriever:
+    """
+    BM25 index over the chunked text files of a project.
+
+    Files come from the project's ``FileIndex``; only files whose size or
+    mtime changed are re-read and re-chunked when the index is refreshed.
+    Dependency, virtualenv and cache directories (``IGNORE_DIRS``) are
+    skipped. Postings are kept as NumPy arrays so a query only touches the chunks
+    containing its terms. Everything runs locally.
+    """
+
+    MAX_FILE_BYTES = 256 * 1024
+    IGNORE_DIRS = ProjectContext.IGNORE_DIRS | SNAPSHOT_IGNORE_DIRS
+
+    _instances: Dict[str, "ProjectRetriever"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_project(cls, project_path: str) -> "ProjectRetriever":
+        """Get the shared retriever of a project directory."""
+        key = os.path.abspath(project_path)
+        with cls._instances_lock:
+            retriever = cls._instances.get(key)
+            if retriever is None:
+                retriever = cls._instances[key] = cls(key)
+            return retriever
+
+    def __init__(self, project_path: str):
+        """
+        Initialize retriever.
+
+        Args:
+            project_path: Path to the project directory
+        """
+        self.root = Path(project_path)
+        self._lock = threading.RLock()
+        self._files: Dict[str, Tuple[Tuple[int, int], List[Chunk], List[Counter]]] = {}
+        self._stale = True
+        self._chunks: List[Chunk] = []
+        self._vocabulary: Dict[str, int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._postings = np.zeros(0, dtype=np.int64)
+        self._frequencies = np.zeros(0, dtype=np.float64)
+        self._idf = np.zeros(0, dtype=np.float64)
+        self._lengths = np.zeros(0, dtype=np.float64)
+        self._chunk_paths = np.zeros(0, dtype=object)
+        self._chunk_dirs = np.zeros(0, dtype=object)
+
+    @property
+    def paths(self) -> List[str]:
+        """Sorted paths of the indexed files."""
+        with self._lock:
+            self.refresh()
+            return sorted(self._files)
+
+    def refresh(self) -> None:
+        """Re-read files that changed on disk since the last refresh."""
+        from coding_agent_plugin.managers.file_index import FileIndex
+
+        with self._lock:
+            entries = {
+                path: signature
+                for path, signature in FileIndex.for_project(str(self.root)).entries().items()
+                if not any(part in self.IGNORE_DIRS for part in path.split("/")[:-1])
+            }
+            for path in list(self._files):
+                if path not in entries:
+                    del self._files[path]
+                    self._stale = True
+            for path, signature in entries.items():
+                cached = self._files.get(path)
+                if cached is not None and cached[0] == signature:
+                    continue
+                chunks = self._read_chunks(path, signature[0])
+                path_terms = tokenize(path.replace("/", " ").replace(".", " "))
+                self._files[path] = (signature, chunks, [Counter(tokenize(c.text) + path_terms) for c in chunks])
+                self._stale = True
+            if self._stale:
+                self._build()
+
+    def search(self, query: str, top_k: int = 8, target_file: Optional[str] = None) -> List[Tuple[float, Chunk]]:
+        """
+        Rank chunks against a query.
+
+        Args:
+            query: Task description
+            top_k: Maximum number of chunks to return
+            target_file: File being written; its own chunks are skipped and
+                chunks from its directory are boosted
+
+        Returns:
+            (score, chunk) pairs, best first
+        """
+        with self._lock:
+            self.refresh()
+            if not self._chunks:
+                return []
+
+            scores = np.zeros(len(self._chunks), dtype=np.float64)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths / max(self._lengths.mean(), 1.0))
+            for term, weight in Counter(tokenize(query)).items():
+                term_id = self._vocabulary.get(term)
+                if term_id is None:
+                    continue
+                span = slice(self._indptr[term_id], self._indptr[term_id + 1])
+                ids, tf = self._postings[span], self._frequencies[span]
+                scores[ids] += weight * self._idf[term_id] * tf * (BM25_K1 + 1) / (tf + norm[ids])
+
+            if target_file:
+                target = target_file.lstrip("/")
+                scores[self._chunk_dirs == os.path.dirname(target)] *= NEIGHBOUR_BOOST
+                scores[self._chunk_paths == target] = 0.0
+
+            candidates = np.flatnonzero(scores > 0)
+            order = candidates[np.argsort(-scores[candidates], kind="stable")][:top_k]
+            return [(float(scores[i]), self._chunks[i]) for i in order]
+
+    def build_context(
+        self,
+        query: str,
+        target_file: Optional[str] = None,
+        token_budget: Optional[int] = None,
+        top_k: Optional[int] = None,
+    ) -> str:
+        """
+        Build the project context for a prompt.
+
+        The context lists the files related to the task (the target's
+        directory neighbours and the files of the matched snippets) followed
+        by the most relevant snippets, all within ``token_budget``.
+
+        Args:
+            query: Task description
+            target_file: Project-relative path of the file being written
+            token_budget: Maximum tokens of context (default CONTEXT_TOKEN_BUDGET)
+            top_k: Maximum number of snippets (default CONTEXT_TOP_K)
+
+        Returns:
+            Context text, or an empty string if the project has no relevant files
+        """
+        from coding_agent_plugin.core.config import CONTEXT_TOKEN_BUDGET, CONTEXT_TOP_K
+
+        token_budget = CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+        top_k = CONTEXT_TOP_K if top_k is None else top_k
+        if token_budget <= 0:
+            return ""
+
+        results = self.search(query, top_k, target_file)
+        target = (target_file or "").lstrip("/")
+        directory = os.path.dirname(target)
+        neighbours = [p for p in self.paths if p != target and os.path.dirname(p) == directory]
+        related = list(dict.fromkeys([c.path for _, c in results] + neighbours))
+
+        budget = token_budget
+        sections = []
+        while related:
+            header = f"Related files: {', '.join(related)}"
+            if estimate_tokens(header) <= budget // 4 or len(related) == 1:
+                break
+            related = related[:len(related) // 2]
+        if related and estimate_tokens(header) <= budget:
+            sections.append(header)
+            budget -= estimate_tokens(header)
+
+        snippets = []
+        for _, chunk in results:
+            snippet = f"--- {chunk.path} (lines {chunk.start_line}-{chunk.end_line}) ---\n{chunk.text}"
+            cost = estimate_tokens(snippet)
+            if cost > budget:
+                continue
+            snippets.append(snippet)
+            budget -= cost
+        if snippets:
+            sections.append("Relevant code:\n" + "\n\n".join(snippets))
+
+        return "\n\n".join(sections)
+
+    # Internals
+
+    def _read_chunks(self, path: str, size: int) -> List[Chunk]:
+        if size > self.MAX_FILE_BYTES:
+            return []
+        try:
+            with open(self.root / path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        if b"\0" in data[:8192]:
+            return []
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            return []
+        return chunk_text(path, text)
+
+    def _build(self) -> None:
+        """Rebuild the postings arrays from the per-file term counts."""
+        self._chunks = []
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        chunk_ids: List[int] = []
+        frequencies: List[int] = []
+        lengths: List[int] = []
+        for path in sorted(self._files):
+            _, chunks, counts = self._files[path]
+            for chunk, terms in zip(chunks, counts):
+                chunk_id = len(self._chunks)
+                self._chunks.append(chunk)
+                lengths.append(sum(terms.values()))
+                for term, count in terms.items():
+                    term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                    chunk_ids.append(chunk_id)
+                    frequencies.append(count)
+
+        terms = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(terms, kind="stable")
+        document_frequency = np.bincount(terms, minlength=len(vocabulary))
+        n = len(self._chunks)
+
+        self._vocabulary = vocabulary
+        self._indptr = np.concatenate(([0], np.cumsum(document_frequency))).astype(np.int64)
+        self._postings = np.asarray(chunk_ids, dtype=np.int64)[order]
+        self._frequencies = np.asarray(frequencies, dtype=np.float64)[order]
+        self._idf = np.log(1 + (n - document_frequency + 0.5) / (document_frequency + 0.5))
+        self._lengths = np.asarray(lengths, dtype=np.float64)
+        self._chunk_paths = np.array([c.path for c in self._chunks], dtype=object)
+        self._chunk_dirs = np.array([os.path.dirname(c.path) for c in self._chunks], dtype=object)
+        self._stale = False
@@ -0,0 +1,300 @@
+"""Persistent index of the symbols defined, imported and called in project files."""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .retrieval import STOPWORDS
+
+PYTHON_EXTENSIONS = {".py", ".pyi"}
+SCRIPT_EXTENSIONS = {".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"}
+
+JS_DEFINITION_PATTERNS = [
+    re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)", re.MULTILINE),
+    re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)", re.MULTILINE),
+    re.compile(r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)", re.MULTILINE),
+    re.compile(r"^\s*(?:export\s+)?(?:interface|type|enum)\s+([A-Za-z_$][\w$]*)", re.MULTILINE),
+    # Class methods: indented "name(args) {" that is not a control statement
+    re.compile(
+        r"^[ \t]+(?:(?:public|private|protected|static|async|readonly|get|set)\s+)*"
+        r"([A-Za-z_$][\w$]*)\s*(?:<[^>\n]*>)?\s*\([^)\n]*\)\s*(?::\s*[^{\n]+)?\{",
+        re.MULTILINE,
+    ),
+]
+JS_IMPORT_PATTERNS = [
+    re.compile(r"^\s*import\s+(?:[^'\"\n]+?\s+from\s+)?['\"]([^'\"]+)['\"]", re.MULTILINE),
+    re.compile(r"\brequire\(\s*['\"]([^'\"]+)['\"]\s*\)"),
+]
+JS_CALL_PATTERN = re.compile(r"(?<![\w$.])(?:[\w$]+\.)*([A-Za-z_$][\w$]*)\s*\(")
+JS_KEYWORDS = {
+    "if", "for", "while", "switch", "catch", "return", "function", "typeof", "new",
+    "await", "super", "import", "require", "constructor", "else", "do", "with",
+}
+
+WORD_PATTERN = re.compile(r"[A-Za-z_$][\w$]*")
+
+
+class SymbolIndex:
+    """
+    Definitions, imports and call references per file, stored in ``.agentic/symbols.json``.
+
+    Python files are parsed with ``ast``; JavaScript and TypeScript files
+    with lightweight regular expressions. Entries are keyed by the SHA-256
+    of the file content and also remember its size and mtime, so on refresh
+    unchanged files are not even hashed and touched-but-identical files are
+    not parsed again.
+    """
+
+    FILENAME = "symbols.json"
+    VERSION = 1
+
+    _instances: Dict[str, "SymbolIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_project(cls, project_path: str) -> "SymbolIndex":
+        """Get the shared symbol index of a project directory."""
+        key = os.path.abspath(project_path)
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls._instances[key] = cls(key)
+            return index
+
+    def __init__(self, project_path: str):
+        """
+        Initialize symbol index.
+
+        Args:
+            project_path: Path to the project directory
+        """
+        self.root = Path(project_path)
+        self.path = self.root / ".agentic" / self.FILENAME
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dirty = False
+        self._files: Dict[str, Dict] = {}
+        self._definitions: Optional[Dict[str, Set[str]]] = None
+
+    @staticmethod
+    def supports(file_path: str) -> bool:
+        """Whether symbols are extracted from files of this type."""
+        return Path(file_path).suffix in PYTHON_EXTENSIONS | SCRIPT_EXTENSIONS
+
+    # Queries
+
+    def symbols(self, file_path: str) -> Optional[Dict[str, List[str]]]:
+        """Get the definitions, imports and references recorded for a file."""
+        with self._lock:
+            self._load()
+            entry = self._files.get(file_path)
+            if entry is None:
+                return None
+            return {key: list(entry[key]) for key in ("definitions", "imports", "references")}
+
+    def find_definitions(self, name: str) -> List[str]:
+        """Files defining ``name`` (a plain name, or ``Class.method``)."""
+        with self._lock:
+            return sorted(self._definition_map().get(name, ()))
+
+    def find_references(self, name: str) -> List[str]:
+        """Files calling ``name``."""
+        with self._lock:
+            self._load()
+            return sorted(path for path, entry in self._files.items() if name in entry["references"])
+
+    def route(self, request: str, limit: int = 5) -> List[str]:
+        """
+        Pick the files an improvement request should modify.
+
+        Every identifier in the request that names a definition counts for
+        the files defining it; names defined in many files count less.
+        Exact-case matches are preferred over case-insensitive ones.
+
+        Args:
+            request: Improvement request
+            limit: Maximum number of files
+
+        Returns:
+            Files ranked by how many mentioned symbols they define
+        """
+        with self._lock:
+            definitions = self._definition_map()
+            folded: Dict[str, Set[str]] = {}
+            for name, paths in definitions.items():
+                folded.setdefault(name.lower(), set()).update(paths)
+
+            scores: Dict[str, float] = {}
+            for word in dict.fromkeys(WORD_PATTERN.findall(request)):
+                if len(word) < 3 or word.lower() in STOPWORDS:
+                    continue
+                paths = definitions.get(word)
+                weight = 1.0
+                if not paths:
+                    paths = folded.get(word.lower())
+                    weight = 0.5
+                if not paths:
+                    continue
+                for path in paths:
+                    scores[path] = scores.get(path, 0.0) + weight / len(paths)
+
+            ranked = sorted(scores, key=lambda path: (-scores[path], path))
+            return ranked[:limit]
+
+    # Updates
+
+    def refresh(self, entries: Optional[Mapping[str, Tuple[int, int]]] = None) -> None:
+        """
+        Bring the index up to date.
+
+        Args:
+            entries: Project files as path -> (size, mtime_ns); defaults to
+                the project's ``FileIndex``
+        """
+        if entries is None:
+            from coding_agent_plugin.managers.file_index import FileIndex
+            entries = FileIndex.for_project(str(self.root)).entries()
+
+        with self._lock:
+            self._load()
+            supported = {path: (size, mtime) for path, (size, mtime) in entries.items() if self.supports(path)}
+            for path in list(self._files):
+                if path not in supported:
+                    del self._files[path]
+                    self._dirty = True
+            for path, (size, mtime) in supported.items():
+                entry = self._files.get(path)
+                if entry is not None and entry["size"] == size and entry["mtime"] == mtime:
+                    continue
+                self._update_file(path, entry)
+            if self._dirty:
+                self._definitions = None
+                self._save()
+
+    # Internals
+
+    def _update_file(self, path: str, entry: Optional[Dict]) -> None:
+        try:
+            with open(self.root / path, "rb") as f:
+                st = os.fstat(f.fileno())
+                data = f.read()
+        except OSError:
+            if self._files.pop(path, None) is not None:
+                self._dirty = True
+            return
+        digest = hashlib.sha256(data).hexdigest()
+        if entry is None or entry["hash"] != digest:
+            entry = {"hash": digest, **parse_symbols(path, data.decode("utf-8", errors="replace"))}
+        entry["size"], entry["mtime"] = st.st_size, st.st_mtime_ns
+        self._files[path] = entry
+        self._dirty = True
+
+    def _definition_map(self) -> Dict[str, Set[str]]:
+        self._load()
+        if self._definitions is None:
+            definitions: Dict[str, Set[str]] = {}
+            for path, entry in self._files.items():
+                for name in entry["definitions"]:
+                    definitions.setdefault(name, set()).add(path)
+                    if "." in name:
+                        definitions.setdefault(name.rsplit(".", 1)[1], set()).add(path)
+            self._definitions = definitions
+        return self._definitions
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self._files = data["files"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            self._files = {}
+
+    def _save(self) -> None:
+        if not self.root.exists():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "files": self._files}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def parse_symbols(path: str, source: str) -> Dict[str, List[str]]:
+    """
+    Extract symbols from a source file.
+
+    Returns:
+        Dict with sorted ``definitions``, ``imports`` and ``references``
+    """
+    suffix = Path(path).suffix
+    if suffix in PYTHON_EXTENSIONS:
+        definitions, imports, references = _parse_python(source)
+    elif suffix in SCRIPT_EXTENSIONS:
+        definitions, imports, references = _parse_script(source)
+    else:
+        definitions, imports, references = set(), set(), set()
+    return {
+        "definitions": sorted(definitions),
+        "imports": sorted(imports),
+        "references": sorted(references - definitions),
+    }
+
+
+def _parse_python(source: str) -> Tuple[Set[str], Set[str], Set[str]]:
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return set(), set(), set()
+
+    definitions: Set[str] = set()
+    imports: Set[str] = set()
+    references: Set[str] = set()
+
+    def define(nodes: Iterable[ast.stmt], prefix: str = "") -> None:
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                definitions.add(prefix + node.name)
+                if isinstance(node, ast.ClassDef) and not prefix:
+                    define(node.body, node.name + ".")
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and not prefix:
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                definitions.update(t.id for t in targets if isinstance(t, ast.Name))
+
+    define(tree.body)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            imports.add(module)
+            imports.update(f"{module}.{alias.name}" for alias in node.names if alias.name != "*")
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                references.add(node.func.id)
+            elif isinstance(node.func, ast.Attribute):
+                references.add(node.func.attr)
+    return definitions, imports, references
+
+
+def _parse_script(source: str) -> Tuple[Set[str], Set[str], Set[str]]:
+    # Drop comments so commented-out code is not indexed
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.DOTALL)
+    source = re.sub(r"(?m)(^|[^:\\])//.*$", r"\1", source)
+
+    definitions = {
+        name for pattern in JS_DEFINITION_PATTERNS for name in pattern.findall(source)
+        if name not in JS_KEYWORDS
+    }
+    imports = {module for pattern in JS_IMPORT_PATTERNS for module in pattern.findall(source)}
+    references = {name for name in JS_CALL_PATTERN.findall(source) if name not in JS_KEYWORDS}
+    return definitions, imports, references
@@ -7,18 +7,108 @@ from dotenv import load_dotenv
 
 _ = load_dotenv()
 
-DATABASE_URL: str | None = os.getenv("DATABASE_URL")
+DATABASE_URL: str | None = os.getenv("DATABASE_URL")  # Package API (setup()/create(), core/database.py)
+# Workspace database of the CLI and agents (models/db_models.py); default: ~/.agentic-coder/data.db.
+# Must not point at DATABASE_URL: both schemas define a different ``projects`` table
+AGENTIC_DATABASE_URL: str | None = os.getenv("AGENTIC_DATABASE_URL")
 DATABASE_ECHO: bool = os.getenv("DATABASE_ECHO", "false").lower() == "true"
 
+# Sync models layer (projects, files, versions): pooled connections per thread; SQLite waits
+# up to DATABASE_BUSY_TIMEOUT seconds for the write lock and caches prepared statements per connection
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_BUSY_TIMEOUT = float(os.getenv("DATABASE_BUSY_TIMEOUT", "15"))
+DATABASE_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "256"))
+
 LLM_BASE_URL: str | None = os.getenv("LLM_BASE_URL")
 LLM_MODEL: str | None = os.getenv("LLM_MODEL")
 LLM_API_KEY: str | None = os.getenv("LLM_API_KEY")
+LLM_STREAMING: bool = os.getenv("LLM_STREAMING", "false").lower() == "true"  # Stream generated code to disk
+
+# LLM HTTP connection pool (shared by all agents)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))  # Seconds
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "600"))  # Seconds
+
+# LLM Response Cache (opt-in)
+LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "sqlite")  # sqlite | memory
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(Path.home() / ".agentic-coder" / "llm_cache.db"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # Seconds, 0 = never expire
 
 
 # Retry Configuration
 AGENT_MAX_RETRIES = int(os.getenv("AGENT_MAX_RETRIES", "3"))
 AGENT_RETRY_DELAY = int(os.getenv("AGENT_RETRY_DELAY", "2"))  # Seconds
 
+# Orchestration Configuration
+AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))  # Planned tasks run in parallel
+
+# LLM rate limiting, shared by all agents and projects per provider and model.
+# RPM/TPM of 0 are learned from x-ratelimit-* response headers; the concurrency
+# window adapts (AIMD) between 1 and LLM_CONCURRENCY_MAX
+LLM_RATE_LIMIT_ENABLED: bool = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() == "true"
+LLM_RATE_LIMIT_RPM = float(os.getenv("LLM_RATE_LIMIT_RPM", "0"))
+LLM_RATE_LIMIT_TPM = float(os.getenv("LLM_RATE_LIMIT_TPM", "0"))
+LLM_RATE_LIMIT_COMPLETION_TOKENS = int(os.getenv("LLM_RATE_LIMIT_COMPLETION_TOKENS", "1000"))  # Estimate per call
+LLM_CONCURRENCY_INITIAL = int(os.getenv("LLM_CONCURRENCY_INITIAL", "8"))
+LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "64"))
+
+# Sandboxed execution (ExecutionAgent): concurrency cap, wall-clock timeouts in seconds,
+# per-process rlimits (0 = unlimited) and output kept per stream
+EXECUTION_MAX_CONCURRENCY = int(os.getenv("EXECUTION_MAX_CONCURRENCY", "4"))
+EXECUTION_TIMEOUT = float(os.getenv("EXECUTION_TIMEOUT", "30"))
+EXECUTION_CODE_TIMEOUT = float(os.getenv("EXECUTION_CODE_TIMEOUT", "10"))
+EXECUTION_CPU_SECONDS = int(os.getenv("EXECUTION_CPU_SECONDS", "60"))
+EXECUTION_MEMORY_MB = int(os.getenv("EXECUTION_MEMORY_MB", "2048"))
+EXECUTION_MAX_OPEN_FILES = int(os.getenv("EXECUTION_MAX_OPEN_FILES", "256"))
+EXECUTION_MAX_OUTPUT_BYTES = int(os.getenv("EXECUTION_MAX_OUTPUT_BYTES", str(1024 * 1024)))
+
+# Warm interpreter pool (opt-in): run_code and pytest runs fork from a preloaded interpreter
+WARM_POOL_ENABLED: bool = os.getenv("WARM_POOL_ENABLED", "false").lower() == "true"
+WARM_POOL_PRELOAD = os.getenv("WARM_POOL_PRELOAD", "pytest,fastapi,pydantic,sqlalchemy,numpy,pandas")
+
+# Git: commit each completed task's files from a background worker, coalescing writes
+# made within GIT_COMMIT_DEBOUNCE seconds into one commit
+GIT_COMMIT_PER_TASK: bool = os.getenv("GIT_COMMIT_PER_TASK", "false").lower() == "true"
+GIT_COMMIT_DEBOUNCE = float(os.getenv("GIT_COMMIT_DEBOUNCE", "2"))
+
+# Restore the files written by a failed task attempt before the retry, and by the ErrorAgent when it finally fails
+TASK_ROLLBACK: bool = os.getenv("TASK_ROLLBACK", "true").lower() == "true"
+
+# Progress events: also write them as NDJSON to a file path, tcp://host:port or unix:/socket
+AGENT_EVENTS_SINK = os.getenv("AGENT_EVENTS_SINK", "")
+
+# LLM usage accounting: record every call's tokens and latency in the llm_usage table.
+# LLM_PRICING prices calls as "model=input/output[,model=...]" in USD per million tokens
+LLM_USAGE_TRACKING: bool = os.getenv("LLM_USAGE_TRACKING", "true").lower() == "true"
+LLM_USAGE_BATCH_SIZE = int(os.getenv("LLM_USAGE_BATCH_SIZE", "50"))
+LLM_PRICING = os.getenv("LLM_PRICING", "")
+
+# File modification: "patch" asks for search/replace edits, "full" for the whole file,
+# "auto" patches files of at least FILE_EDIT_PATCH_MIN_CHARS characters
+FILE_EDIT_MODE = os.getenv("FILE_EDIT_MODE", "auto")
+FILE_EDIT_PATCH_MIN_CHARS = int(os.getenv("FILE_EDIT_PATCH_MIN_CHARS", "2000"))
+
+# Prompt context: relevant snippets retrieved from the project, within a token budget
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+CONTEXT_TOP_K = int(os.getenv("CONTEXT_TOP_K", "8"))
+
+# Existing-project context (improve): file contents are loaded on demand into an LRU
+# cache of at most PROJECT_CONTEXT_CACHE_BYTES
+PROJECT_CONTEXT_CACHE_BYTES = int(os.getenv("PROJECT_CONTEXT_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# Threads copying and hashing files when importing into a project (StorageManager.copy_to_project)
+STORAGE_COPY_WORKERS = int(os.getenv("STORAGE_COPY_WORKERS", str(min(32, (os.cpu_count() or 1) + 4))))
+
+# Content-addressed store for snapshot file contents, shared by all projects
+# (zstd when 'zstandard' is installed, zlib otherwise)
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", str(Path.home() / ".agentic-coder" / "objects"))
+BLOB_COMPRESSION_LEVEL = int(os.getenv("BLOB_COMPRESSION_LEVEL", "3"))
+
 # Project Configuration
 AGENTIC_PROJECTS_DIR = os.getenv("AGENTIC_PROJECTS_DIR", str(Path.home() / ".agentic-coder" / "projects"))
 
@@ -0,0 +1,367 @@
+"""Typed progress events for orchestration runs."""
+
+import asyncio
+import contextvars
+import json
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import IO, Any, Callable, ClassVar, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+
+E = TypeVar("E", bound="Event")
+
+Handler = Callable[["Event"], None]
+
+_run_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("run_id", default=None)
+_project_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("event_project_id", default=None)
+_task_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("event_task_id", default=None)
+
+
+def current_run_id() -> Optional[str]:
+    """ID of the orchestration run in the current context, if any."""
+    return _run_id.get()
+
+
+def current_project_id() -> Optional[str]:
+    """ID of the project the current run works on, if any."""
+    return _project_id.get()
+
+
+def current_task_id() -> Optional[str]:
+    """ID of the plan task running in the current context, if any."""
+    return _task_id.get()
+
+
+def new_run_id(project_id: Optional[str] = None) -> str:
+    """Start a run (on a project) in the current context; returns its ID."""
+    run_id = uuid.uuid4().hex[:12]
+    _run_id.set(run_id)
+    _project_id.set(project_id)
+    return run_id
+
+
+def ensure_run(project_id: str) -> str:
+    """Join the current run if it works on ``project_id``, otherwise start one."""
+    run_id = _run_id.get()
+    if run_id is None or _project_id.get() != project_id:
+        run_id = new_run_id(project_id)
+    return run_id
+
+
+@contextmanager
+def task_scope(task_id: Optional[str]) -> Iterator[None]:
+    """Attribute events emitted in this block to a plan task."""
+    token = _task_id.set(task_id)
+    try:
+        yield
+    finally:
+        _task_id.reset(token)
+
+
+@dataclass
+class Event:
+    """Base event: a type name, a timestamp and the ID of the run it belongs to."""
+
+    type: ClassVar[str] = "event"
+
+    ts: float = field(default_factory=time.time, kw_only=True)
+    run_id: Optional[str] = field(default_factory=current_run_id, kw_only=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, **asdict(self)}
+
+
+@dataclass
+class RunStarted(Event):
+    type: ClassVar[str] = "run_started"
+
+    project_id: str
+    prompt: str
+    resume: bool = False
+
+
+@dataclass
+class PlanReady(Event):
+    type: ClassVar[str] = "plan_ready"
+
+    project_id: str
+    tasks: List[Dict[str, Any]]
+    resumed: bool = False
+
+
+@dataclass
+class TaskStarted(Event):
+    type: ClassVar[str] = "task_started"
+
+    task_id: Optional[str]
+    description: Optional[str]
+    agent: str
+
+
+@dataclass
+class TaskCompleted(Event):
+    type: ClassVar[str] = "task_completed"
+
+    task_id: Optional[str]
+    description: Optional[str]
+    duration: float
+    files: List[str] = field(default_factory=list)
+
+
+@dataclass
+class TaskFailed(Event):
+    type: ClassVar[str] = "task_failed"
+
+    task_id: Optional[str]
+    description: Optional[str]
+    error: str
+    attempt: int
+    final: bool
+
+
+@dataclass
+class LLMCall(Event):
+    type: ClassVar[str] = "llm_call"
+
+    agent: str
+    latency: float
+    cached: bool = False
+    model: Optional[str] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    error: Optional[str] = None
+    project_id: Optional[str] = field(default_factory=current_project_id)
+    task_id: Optional[str] = field(default_factory=current_task_id)
+
+
+@dataclass
+class FileWritten(Event):
+    type: ClassVar[str] = "file_written"
+
+    project_path: str
+    path: str
+    size: Optional[int] = None
+
+
+@dataclass
+class RunFinished(Event):
+    type: ClassVar[str] = "run_finished"
+
+    project_id: str
+    status: str
+    completed: int
+    failed: int
+    duration: float
+
+
+class EventStream:
+    """
+    Async iterator over the events published while it is open.
+
+    Events published from other threads are handed to the stream's loop
+    thread-safely. When more than ``maxsize`` events are waiting the oldest
+    are dropped, so a slow consumer never stalls the run.
+    """
+
+    def __init__(self, bus: "EventBus", maxsize: int = 1000):
+        self._bus = bus
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._maxsize = maxsize
+        self.dropped = 0
+        self._closed = False
+        bus.subscribe(self._publish)
+
+    def _publish(self, event: Optional["Event"]) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Optional["Event"]) -> None:
+        if event is not None and self._queue.qsize() >= self._maxsize:
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    def close(self) -> None:
+        """Unsubscribe; iteration ends after the already queued events."""
+        if not self._closed:
+            self._closed = True
+            self._bus.unsubscribe(self._publish)
+            self._publish(None)
+
+    def __aiter__(self) -> "EventStream":
+        return self
+
+    async def __anext__(self) -> "Event":
+        event = await self._queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    async def __aenter__(self) -> "EventStream":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+
+class NDJSONSink:
+    """
+    Writes events as newline-delimited JSON.
+
+    The target is a file path (appended to), ``tcp://host:port``,
+    ``unix:/path/to/socket``, or an open text stream. Write errors are
+    swallowed after closing the target, so a consumer going away does not
+    fail the run.
+    """
+
+    def __init__(self, target: Union[str, IO[str]]):
+        self.target = target
+        self._lock = threading.Lock()
+        self._owned = isinstance(target, str)
+        self._stream: Optional[IO[str]] = self._open(target) if self._owned else target
+
+    @staticmethod
+    def _open(target: str) -> IO[str]:
+        if target.startswith("tcp://"):
+            host, _, port = target[len("tcp://"):].rpartition(":")
+            sock = socket.create_connection((host, int(port)))
+        elif target.startswith("unix:"):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(target[len("unix:"):])
+        else:
+            return open(target, "a", buffering=1, encoding="utf-8")
+        return sock.makefile("w", encoding="utf-8")
+
+    def __call__(self, event: Event) -> None:
+        line = json.dumps(event.to_dict(), default=str) + "\n"
+        with self._lock:
+            if self._stream is None:
+                return
+            try:
+                self._stream.write(line)
+                self._stream.flush()
+            except (OSError, ValueError):
+                self._close()
+
+    def _close(self) -> None:
+        if self._stream is not None and self._owned:
+            try:
+                self._stream.close()
+            except OSError:
+                pass
+        self._stream = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+
+class EventBus:
+    """
+    Publish/subscribe hub for run events.
+
+    Emitters check ``wants`` (or use ``emit``) so that building an event
+    costs nothing while nobody is subscribed to its type. Handlers are
+    called synchronously in the publishing thread and must be quick;
+    exceptions they raise are ignored.
+    """
+
+    def __init__(self):
+        self._handlers: Tuple[Tuple[Handler, Optional[tuple]], ...] = ()
+        self._wanted: Dict[type, bool] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether anyone is subscribed."""
+        return bool(self._handlers)
+
+    def wants(self, event_type: Type[Event]) -> bool:
+        """Whether anyone is subscribed to ``event_type``."""
+        if not self._handlers:
+            return False
+        wanted = self._wanted.get(event_type)
+        if wanted is None:
+            wanted = self._wanted[event_type] = any(
+                types is None or issubclass(event_type, types) for _, types in self._handlers
+            )
+        return wanted
+
+    def subscribe(self, handler: Handler, types: Optional[Tuple[Type[Event], ...]] = None) -> Handler:
+        """Call ``handler`` with every published event (or only those of ``types``)."""
+        with self._lock:
+            self._handlers = self._handlers + ((handler, tuple(types) if types else None),)
+            self._wanted = {}
+        return handler
+
+    def unsubscribe(self, handler: Handler) -> None:
+        with self._lock:
+            self._handlers = tuple((h, types) for h, types in self._handlers if h != handler)
+            self._wanted = {}
+
+    def publish(self, event: Event) -> None:
+        for handler, types in self._handlers:
+            if types is not None and not isinstance(event, types):
+                continue
+            try:
+                handler(event)
+            except Exception:
+                pass
+
+    def emit(self, event_type: Type[E], **fields: Any) -> None:
+        """Build and publish an event, only if anyone is subscribed to its type."""
+        if self.wants(event_type):
+            self.publish(event_type(**fields))
+
+    def stream(self, maxsize: int = 1000) -> EventStream:
+        """
+        Iterate over events from now on (call from a running event loop).
+
+        Example:
+            async with bus.stream() as events:
+                async for event in events:
+                    ...
+        """
+        return EventStream(self, maxsize)
+
+    def add_sink(self, target: Union[str, IO[str]]) -> NDJSONSink:
+        """Write every event as NDJSON to a file, socket or stream."""
+        return self.subscribe(NDJSONSink(target))
+
+
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """
+    Get the process-wide event bus.
+
+    An NDJSON sink is attached on first use when AGENT_EVENTS_SINK is set.
+
+    Returns:
+        Shared EventBus instance
+    """
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            from coding_agent_plugin.core.config import AGENT_EVENTS_SINK
+
+            _bus = EventBus()
+            if AGENT_EVENTS_SINK:
+                try:
+                    _bus.add_sink(AGENT_EVENTS_SINK)
+                except OSError as e:
+                    print(f"Warning: Cannot open event sink {AGENT_EVENTS_SINK}: {e}")
+        return _bus
@@ -0,0 +1,278 @@
+"""Sandboxed, non-blocking execution of commands and generated code."""
+
+import asyncio
+import codecs
+import os
+import shutil
+import signal
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Mapping, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Called with the stream name ("stdout" or "stderr") and each decoded chunk
+OutputCallback = Callable[[str, str], None]
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ExecutionResult:
+    """Outcome of one sandboxed process."""
+
+    command: str
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    duration: float
+    timed_out: bool = False
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    def format(self) -> str:
+        """Render the result for agent logs."""
+        notes = []
+        if self.timed_out:
+            notes.append(f"Timed out after {self.duration:.1f}s; process group killed")
+        elif self.returncode is not None:
+            notes.append(f"Exit code: {self.returncode}")
+        if self.truncated:
+            notes.append("Output truncated")
+        return f"Command: {self.command}\nStdout:\n{self.stdout}\nStderr:\n{self.stderr}\n" + "\n".join(notes)
+
+
+class SandboxExecutor:
+    """
+    Runs processes with ``asyncio.create_subprocess_exec`` under resource limits.
+
+    Every process gets its own session (process group), rlimits on CPU
+    time, address space and open files (set by a ``/bin/sh`` launcher that
+    then execs the program; ``preexec_fn`` is not fork-safe in this
+    multi-threaded process), and a wall-clock timeout after
+    which the whole group is killed. Output is read incrementally, passed
+    to an optional callback, and kept up to ``max_output_bytes`` per
+    stream. At most ``max_concurrency`` processes run at once per event
+    loop. Cancelling ``run`` also kills the process group.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cpu_seconds: Optional[int] = None,
+        memory_bytes: Optional[int] = None,
+        max_open_files: Optional[int] = None,
+        max_output_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize executor (defaults come from the EXECUTION_* settings).
+
+        Args:
+            max_concurrency: Maximum number of processes running at once
+            timeout: Default wall-clock timeout in seconds
+            cpu_seconds: RLIMIT_CPU per process (0 = unlimited)
+            memory_bytes: RLIMIT_AS per process (0 = unlimited)
+            max_open_files: RLIMIT_NOFILE per process (0 = unlimited)
+            max_output_bytes: Output kept per stream
+        """
+        from coding_agent_plugin.core import config
+
+        self.max_concurrency = max_concurrency or config.EXECUTION_MAX_CONCURRENCY
+        self.timeout = timeout if timeout is not None else config.EXECUTION_TIMEOUT
+        self.cpu_seconds = cpu_seconds if cpu_seconds is not None else config.EXECUTION_CPU_SECONDS
+        self.memory_bytes = memory_bytes if memory_bytes is not None else config.EXECUTION_MEMORY_MB * 1024 * 1024
+        self.max_open_files = max_open_files if max_open_files is not None else config.EXECUTION_MAX_OPEN_FILES
+        self.max_output_bytes = max_output_bytes if max_output_bytes is not None else config.EXECUTION_MAX_OUTPUT_BYTES
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    async def run(
+        self,
+        argv: Sequence[str],
+        cwd: Optional[str] = None,
+        timeout: Optional[float] = None,
+        env: Optional[Mapping[str, str]] = None,
+        on_output: Optional[OutputCallback] = None,
+    ) -> ExecutionResult:
+        """
+        Run a program without a shell.
+
+        Args:
+            argv: Program and arguments
+            cwd: Working directory
+            timeout: Wall-clock timeout in seconds (default ``self.timeout``)
+            env: Environment (default: inherited)
+            on_output: Called with ("stdout" | "stderr", text) as output arrives
+
+        Returns:
+            ExecutionResult (a failure to start is reported with returncode None)
+        """
+        command = " ".join(argv)
+        timeout = self.timeout if timeout is None else timeout
+        async with self.slot():
+            start = time.monotonic()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self._with_limits(argv, cwd, env),
+                    cwd=cwd,
+                    env=dict(env) if env is not None else None,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=True,
+                )
+            except OSError as e:
+                return ExecutionResult(command, None, "", f"Failed to start: {e}", time.monotonic() - start)
+
+            stdout = _OutputBuffer("stdout", self.max_output_bytes, on_output)
+            stderr = _OutputBuffer("stderr", self.max_output_bytes, on_output)
+            readers = [
+                asyncio.ensure_future(stdout.drain(process.stdout)),
+                asyncio.ensure_future(stderr.drain(process.stderr)),
+            ]
+            timed_out = False
+            try:
+                await asyncio.wait_for(asyncio.gather(process.wait(), *readers), timeout or None)
+            except asyncio.TimeoutError:
+                timed_out = True
+                _kill_group(process)
+                await process.wait()
+                # Pipes held open by processes that escaped the group must not block us
+                await asyncio.wait(readers, timeout=1.0)
+            except BaseException:
+                _kill_group(process)
+                for reader in readers:
+                    reader.cancel()
+                raise
+            finally:
+                for reader in readers:
+                    if not reader.done():
+                        reader.cancel()
+
+            return ExecutionResult(
+                command=command,
+                returncode=process.returncode,
+                stdout=stdout.text(),
+                stderr=stderr.text(),
+                duration=time.monotonic() - start,
+                timed_out=timed_out,
+                truncated=stdout.truncated or stderr.truncated,
+            )
+
+    async def run_shell(self, command: str, cwd: Optional[str] = None, **kwargs) -> ExecutionResult:
+        """Run a shell command line (``/bin/sh -c``) with the same limits as ``run``."""
+        result = await self.run(["/bin/sh", "-c", command], cwd=cwd, **kwargs)
+        result.command = command
+        return result
+
+    def slot(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent processes in the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _with_limits(self, argv: Sequence[str], cwd: Optional[str], env: Optional[Mapping[str, str]]) -> list:
+        """
+        Prefix ``argv`` with a shell that lowers the soft rlimits and execs the program.
+
+        Raises:
+            FileNotFoundError: The program does not exist (the shell would only exit 127)
+        """
+        ulimits = []
+        if resource is not None and os.path.exists("/bin/sh"):
+            limits = [
+                (resource.RLIMIT_CPU, "-t", self.cpu_seconds, 1),
+                (resource.RLIMIT_AS, "-v", self.memory_bytes, 1024),
+                (resource.RLIMIT_NOFILE, "-n", self.max_open_files, 1),
+            ]
+            for which, flag, value, unit in limits:
+                if not value:
+                    continue
+                hard = resource.getrlimit(which)[1]
+                if hard != resource.RLIM_INFINITY:
+                    value = min(value, hard)
+                ulimits.append(f"ulimit -S {flag} {value // unit} 2>/dev/null;")
+        if not ulimits:
+            return list(argv)
+
+        program = argv[0]
+        if os.sep in program:
+            found = os.path.join(cwd or "", program)
+            found = found if os.path.isfile(found) else None
+        else:
+            path = (env if env is not None else os.environ).get("PATH", os.defpath)
+            found = shutil.which(program, path=path)
+        if found is None:
+            raise FileNotFoundError(f"No such file or directory: {program!r}")
+        return ["/bin/sh", "-c", " ".join(ulimits) + ' exec "$@"', "sh", *argv]
+
+
+class _OutputBuffer:
+    """Collects one output stream up to a byte cap, forwarding decoded chunks."""
+
+    def __init__(self, name: str, max_bytes: int, on_output: Optional[OutputCallback]):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.on_output = on_output
+        self.truncated = False
+        self._data = bytearray()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    async def drain(self, stream: asyncio.StreamReader) -> None:
+        while True:
+            data = await stream.read(READ_CHUNK_SIZE)
+            if not data:
+                break
+            room = self.max_bytes - len(self._data)
+            if len(data) > room:
+                self.truncated = True
+            if room > 0:
+                self._data += data[:room]
+            if self.on_output:
+                text = self._decoder.decode(data)
+                if text:
+                    self.on_output(self.name, text)
+
+    def text(self) -> str:
+        return self._data.decode("utf-8", errors="replace")
+
+
+def _kill_group(process: asyncio.subprocess.Process) -> None:
+    """Kill the process and everything it started in its session."""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        elif process.returncode is None:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+_executor: Optional[SandboxExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> SandboxExecutor:
+    """
+    Get the process-wide SandboxExecutor.
+
+    Agents share this instance so the concurrency cap applies to all of them.
+
+    Returns:
+        Shared SandboxExecutor instance
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = SandboxExecutor()
+        return _executor
@@ -0,0 +1,277 @@
+"""Warm interpreter pool: run Python scripts and tests in children forked from a preloaded parent."""
+
+import asyncio
+import atexit
+import concurrent.futures
+import itertools
+import json
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .executor import ExecutionResult, SandboxExecutor, get_executor
+
+ZYGOTE_SCRIPT = Path(__file__).with_name("zygote.py")
+
+
+class WarmPoolError(RuntimeError):
+    """Raised when the fork server cannot be started or dies."""
+    pass
+
+
+class WarmPool:
+    """
+    Fork server for one Python interpreter (typically a project's venv).
+
+    The server process (``core/zygote.py``) imports the preload modules once.
+    Every run forks a fresh child from it, so a script or pytest selection
+    starts with the interpreter and heavy dependencies already loaded
+    instead of paying their startup cost again. Children get the same
+    rlimits, timeout handling (the child's process group is killed),
+    output cap and concurrency slots as ``SandboxExecutor``.
+
+    The pool is independent of any event loop: a reader thread resolves
+    the replies of the server.
+    """
+
+    def __init__(self, python: str, preload: Sequence[str] = (), executor: Optional[SandboxExecutor] = None):
+        """
+        Initialize pool (the server starts on first use).
+
+        Args:
+            python: Interpreter to run the server with
+            preload: Modules imported by the server before forking
+            executor: Source of limits and concurrency slots (default: shared executor)
+        """
+        self.python = python
+        self.preload = list(preload)
+        self.executor = executor or get_executor()
+        self.preloaded: List[str] = []
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: Dict[int, Tuple[concurrent.futures.Future, concurrent.futures.Future]] = {}
+        self._ids = itertools.count(1)
+        self._tmpdir: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Start the server if it is not running and wait until its modules are loaded."""
+        with self._lock:
+            if self.running:
+                return
+            self._tmpdir = self._tmpdir or tempfile.mkdtemp(prefix="agentic-warm-")
+            try:
+                process = subprocess.Popen(
+                    [self.python, str(ZYGOTE_SCRIPT), ",".join(self.preload)],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
+            except OSError as e:
+                raise WarmPoolError(f"Failed to start warm pool for {self.python}: {e}") from e
+            ready = process.stdout.readline()
+            try:
+                self.preloaded = json.loads(ready)["preloaded"]
+            except (ValueError, KeyError, TypeError):
+                process.kill()
+                process.wait()
+                raise WarmPoolError(f"Warm pool for {self.python} failed to start")
+            self._process = process
+            threading.Thread(target=self._read_replies, args=(process,), daemon=True).start()
+
+    def close(self) -> None:
+        """Stop the server (running children are killed) and remove temp files."""
+        with self._lock:
+            process, self._process = self._process, None
+            if process is not None:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+            if self._tmpdir:
+                shutil.rmtree(self._tmpdir, ignore_errors=True)
+                self._tmpdir = None
+
+    async def run_script(self, script: str, args: Sequence[str] = (), cwd: Optional[str] = None,
+                         timeout: Optional[float] = None) -> ExecutionResult:
+        """Run a Python script as ``__main__`` in a forked child."""
+        return await self._run("script", [script, *args], " ".join(["python", script, *args]), cwd, timeout)
+
+    async def run_pytest(self, args: Sequence[str] = (), cwd: Optional[str] = None,
+                         timeout: Optional[float] = None) -> ExecutionResult:
+        """Run ``pytest.main(args)`` in a forked child."""
+        return await self._run("pytest", list(args), " ".join(["pytest", *args]), cwd, timeout)
+
+    async def _run(self, mode: str, argv: List[str], command: str, cwd: Optional[str],
+                   timeout: Optional[float]) -> ExecutionResult:
+        timeout = self.executor.timeout if timeout is None else timeout
+        async with self.executor.slot():
+            if not self.running:
+                await asyncio.get_running_loop().run_in_executor(None, self.start)
+            request_id = next(self._ids)
+            stdout_path = os.path.join(self._tmpdir, f"{request_id}.out")
+            stderr_path = os.path.join(self._tmpdir, f"{request_id}.err")
+            started: concurrent.futures.Future = concurrent.futures.Future()
+            finished: concurrent.futures.Future = concurrent.futures.Future()
+            self._pending[request_id] = (started, finished)
+
+            start = time.monotonic()
+            self._send({
+                "id": request_id,
+                "mode": mode,
+                "argv": argv,
+                "cwd": cwd,
+                "stdout": stdout_path,
+                "stderr": stderr_path,
+                "rlimits": self._rlimits(),
+            })
+            timed_out = False
+            pid = None
+            try:
+                pid = await asyncio.wrap_future(started)
+                returncode = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(finished)), timeout or None)
+            except asyncio.TimeoutError:
+                timed_out = True
+                _kill_group(pid)
+                returncode = await asyncio.wrap_future(finished)
+            except BaseException:
+                _kill_group(pid)
+                self._pending.pop(request_id, None)
+                raise
+            finally:
+                duration = time.monotonic() - start
+
+            stdout, stdout_truncated = self._collect(stdout_path)
+            stderr, stderr_truncated = self._collect(stderr_path)
+            return ExecutionResult(
+                command=command,
+                returncode=returncode,
+                stdout=stdout,
+                stderr=stderr,
+                duration=duration,
+                timed_out=timed_out,
+                truncated=stdout_truncated or stderr_truncated,
+            )
+
+    def _rlimits(self) -> Dict[str, int]:
+        limits = {
+            "RLIMIT_CPU": self.executor.cpu_seconds,
+            "RLIMIT_AS": self.executor.memory_bytes,
+            "RLIMIT_NOFILE": self.executor.max_open_files,
+        }
+        return {name: value for name, value in limits.items() if value}
+
+    def _send(self, request: Dict) -> None:
+        process = self._process
+        try:
+            with self._write_lock:
+                process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+                process.stdin.flush()
+        except (OSError, AttributeError, ValueError) as e:
+            self._fail(request["id"], WarmPoolError(f"Warm pool is not running: {e}"))
+
+    def _read_replies(self, process: subprocess.Popen) -> None:
+        for line in process.stdout:
+            try:
+                reply = json.loads(line)
+                started, finished = self._pending[reply["id"]]
+            except (ValueError, KeyError, TypeError):
+                continue
+            if "error" in reply:
+                self._fail(reply["id"], WarmPoolError(reply["error"]))
+            elif "pid" in reply:
+                started.set_result(reply["pid"])
+            elif "returncode" in reply:
+                self._pending.pop(reply["id"], None)
+                finished.set_result(reply["returncode"])
+        # Server exited: fail whatever is still waiting on it
+        for request_id in list(self._pending):
+            self._fail(request_id, WarmPoolError("Warm pool server exited"))
+
+    def _fail(self, request_id: int, error: Exception) -> None:
+        futures = self._pending.pop(request_id, None)
+        for future in futures or ():
+            if not future.done():
+                future.set_exception(error)
+
+    def _collect(self, path: str) -> Tuple[str, bool]:
+        limit = self.executor.max_output_bytes
+        try:
+            with open(path, "rb") as f:
+                data = f.read(limit + 1)
+            os.remove(path)
+        except OSError:
+            return "", False
+        return data[:limit].decode("utf-8", errors="replace"), len(data) > limit
+
+
+def _kill_group(pid: Optional[int]) -> None:
+    if pid is None:
+        return
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def find_python(project_path: Optional[str] = None) -> str:
+    """The project's venv interpreter if it has one, else ``python3``."""
+    if project_path:
+        for venv in (".venv", "venv", "env"):
+            candidate = Path(project_path) / venv / "bin" / "python"
+            if candidate.exists():
+                return str(candidate)
+    return "python3"
+
+
+_pools: Dict[str, WarmPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_warm_pool(python: str) -> WarmPool:
+    """
+    Get the shared warm pool of an interpreter.
+
+    Pools preload the modules in WARM_POOL_PRELOAD and are stopped at exit.
+
+    Args:
+        python: Interpreter path or command
+
+    Returns:
+        Shared WarmPool instance
+    """
+    from coding_agent_plugin.core.config import WARM_POOL_PRELOAD
+
+    key = shutil.which(python) or python
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            preload = [m.strip() for m in WARM_POOL_PRELOAD.split(",") if m.strip()]
+            pool = _pools[key] = WarmPool(key, preload)
+        return pool
+
+
+@atexit.register
+def shutdown_warm_pools() -> None:
+    """Stop every warm pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
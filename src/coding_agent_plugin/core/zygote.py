@@ -0,0 +1,174 @@
+"""
+Fork server for the warm interpreter pool.
+
+Run as a script with the project's interpreter (standard library only, so
+it works in any venv):
+
+    python zygote.py module1,module2
+
+It imports the given modules, reports ``{"ready": true}`` and then reads
+one JSON request per line on stdin. For each request it forks a child that
+starts a new session, redirects stdout/stderr to the requested files,
+applies rlimits, changes directory and runs the script (``runpy``) or a
+pytest selection in-process. Replies are JSON lines on stdout:
+``{"id", "pid"}`` once the child is running, ``{"id", "returncode"}``
+when it exits, or ``{"id", "error"}`` if it could not be started.
+"""
+
+import json
+import os
+import selectors
+import signal
+import sys
+import time
+
+
+def _reply(fd: int, message: dict) -> None:
+    data = (json.dumps(message) + "\n").encode("utf-8")
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _preload(modules):
+    loaded = []
+    for name in modules:
+        try:
+            __import__(name)
+            loaded.append(name)
+        except Exception:
+            pass
+    return loaded
+
+
+def _run_child(request: dict, inherited_fds) -> None:
+    """Body of the forked child; never returns."""
+    code = 1
+    try:
+        os.setsid()
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        for fd in inherited_fds:
+            os.close(fd)
+
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        for fd, path in ((1, request["stdout"]), (2, request["stderr"])):
+            target = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.dup2(target, fd)
+            os.close(target)
+
+        try:
+            import resource
+            for name, value in (request.get("rlimits") or {}).items():
+                which = getattr(resource, name)
+                soft, hard = resource.getrlimit(which)
+                if hard != resource.RLIM_INFINITY:
+                    value = min(value, hard)
+                resource.setrlimit(which, (value, hard))
+        except (ImportError, ValueError, OSError):
+            pass
+
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+        argv = request["argv"]
+        if request.get("mode") == "pytest":
+            import pytest
+            sys.argv = ["pytest"] + argv
+            code = int(pytest.main(argv))
+        else:
+            import runpy
+            script = os.path.abspath(argv[0])
+            sys.argv = [script] + argv[1:]
+            sys.path[0:1] = [os.path.dirname(script)]
+            runpy.run_path(script, run_name="__main__")
+            code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code & 0xFF)
+
+
+def main() -> None:
+    # Keep the protocol on private descriptors so stray prints cannot corrupt it
+    requests_fd = os.dup(0)
+    replies_fd = os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(2, 1)
+
+    modules = [m for m in (sys.argv[1] if len(sys.argv) > 1 else "").split(",") if m]
+    start = time.monotonic()
+    loaded = _preload(modules)
+    _reply(replies_fd, {"ready": True, "preloaded": loaded, "seconds": round(time.monotonic() - start, 3)})
+
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_w, False)
+    signal.set_wakeup_fd(wakeup_w)
+    signal.signal(signal.SIGCHLD, lambda *args: None)
+    inherited = (requests_fd, replies_fd, wakeup_r, wakeup_w)
+
+    selector = selectors.DefaultSelector()
+    selector.register(requests_fd, selectors.EVENT_READ, "requests")
+    selector.register(wakeup_r, selectors.EVENT_READ, "children")
+    children = {}
+    buffer = b""
+
+    while True:
+        for key, _ in selector.select():
+            if key.data == "children":
+                os.read(wakeup_r, 4096)
+                while children:
+                    try:
+                        pid, status = os.waitpid(-1, os.WNOHANG)
+                    except ChildProcessError:
+                        break
+                    if pid == 0:
+                        break
+                    request_id = children.pop(pid, None)
+                    if request_id is not None:
+                        _reply(replies_fd, {"id": request_id, "returncode": os.waitstatus_to_exitcode(status)})
+                continue
+
+            data = os.read(requests_fd, 65536)
+            if not data:
+                for pid in children:
+                    try:
+                        os.killpg(pid, signal.SIGKILL)
+                    except OSError:
+                        pass
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                try:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    pid = os.fork()
+                except OSError as e:
+                    _reply(replies_fd, {"id": request["id"], "error": str(e)})
+                    continue
+                if pid == 0:
+                    _run_child(request, inherited)
+                children[pid] = request["id"]
+                _reply(replies_fd, {"id": request["id"], "pid": pid})
+
+
+if __name__ == "__main__":
+    main()
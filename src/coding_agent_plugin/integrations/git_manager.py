@@ -1,8 +1,11 @@
 """Git integration for automatic version control."""
 
+import asyncio
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
 
 
 class GitManager:
@@ -17,6 +20,7 @@ class GitManager:
         """
         self.project_path = Path(project_path)
         self.repo = None
+        self._pipeline: Optional["CommitPipeline"] = None
     
     def init_repo(self) -> bool:
         """
@@ -71,22 +75,67 @@ Thumbs.db
             print(f"Warning: Failed to initialize git: {e}")
             return False
     
-    def commit(self, message: str, add_all: bool = True) -> bool:
+    def stage(self, paths: Iterable[str]) -> List[str]:
+        """
+        Stage specific paths through the index, without scanning the work tree.
+        
+        Written files are added, deleted files removed; ignored paths and
+        paths outside the repository are skipped.
+        
+        Args:
+            paths: File paths, absolute or relative to the project root
+            
+        Returns:
+            Staged paths (relative to the project root)
+        """
+        if not self.repo:
+            return []
+        
+        root = Path(self.repo.working_tree_dir).resolve()
+        relative = set()
+        for path in paths:
+            full = (root / path).resolve() if not os.path.isabs(path) else Path(path).resolve()
+            try:
+                rel = full.relative_to(root).as_posix()
+            except ValueError:
+                continue
+            if rel != "." and not rel.startswith(".git/") and not os.path.isdir(full):
+                relative.add(rel)
+        if not relative:
+            return []
+        
+        ignored = set(self.repo.ignored(*sorted(relative)))
+        existing = sorted(rel for rel in relative - ignored if (root / rel).exists())
+        if existing:
+            self.repo.index.add(existing)
+        
+        deleted = sorted(rel for rel in relative - ignored if not (root / rel).exists())
+        tracked = [rel for rel in deleted if (rel, 0) in self.repo.index.entries]
+        if tracked:
+            self.repo.index.remove(tracked)
+        
+        return existing + tracked
+    
+    def commit(self, message: str, add_all: bool = True, paths: Optional[Iterable[str]] = None) -> bool:
         """
         Create a git commit.
         
         Args:
             message: Commit message
-            add_all: Whether to add all files before committing
+            add_all: Whether to add all files before committing (ignored when paths are given)
+            paths: Stage only these files (see ``stage``)
             
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if successful, False otherwise (or nothing of ``paths`` to stage)
         """
         try:
             if not self.repo:
                 return False
             
-            if add_all:
+            if paths is not None:
+                if not self.stage(paths):
+                    return False
+            elif add_all:
                 self.repo.git.add(A=True)
             
             self.repo.index.commit(message)
@@ -118,3 +167,107 @@ Thumbs.db
         except Exception as e:
             print(f"Warning: Failed to commit file: {e}")
             return False
+    
+    def pipeline(self) -> "CommitPipeline":
+        """Get this repository's background commit pipeline."""
+        if self._pipeline is None:
+            self._pipeline = CommitPipeline(self)
+        return self._pipeline
+
+
+class CommitPipeline:
+    """
+    Debounced background commits.
+    
+    ``submit`` records the files an agent wrote and returns immediately. A
+    worker thread waits until GIT_COMMIT_DEBOUNCE seconds have passed since
+    the first pending write, then stages exactly the pending paths and
+    makes one commit for all of them, so git work never runs on the event
+    loop and bursts of writes become a single commit.
+    """
+    
+    def __init__(self, git_manager: GitManager, debounce: Optional[float] = None):
+        """
+        Initialize pipeline (the worker starts on first submit).
+        
+        Args:
+            git_manager: Repository to commit to (must be initialized)
+            debounce: Seconds to collect writes before committing (default: GIT_COMMIT_DEBOUNCE)
+        """
+        from coding_agent_plugin.core.config import GIT_COMMIT_DEBOUNCE
+        
+        self.git = git_manager
+        self.debounce = GIT_COMMIT_DEBOUNCE if debounce is None else debounce
+        self.commits = 0
+        self._paths: set = set()
+        self._messages: List[str] = []
+        self._deadline: Optional[float] = None
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+    
+    def submit(self, paths: Iterable[str], message: str) -> None:
+        """Queue written files for the next commit."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Commit pipeline is closed")
+            self._paths.update(str(p) for p in paths if p)
+            self._messages.append(message)
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.debounce
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="git-commits", daemon=True)
+                self._worker.start()
+            self._cond.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Commit pending writes now and wait until they are committed.
+        
+        Returns:
+            True if nothing is pending anymore
+        """
+        with self._cond:
+            if self._deadline is not None:
+                self._deadline = time.monotonic()
+                self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._messages and not self._busy, timeout)
+    
+    async def aflush(self, timeout: Optional[float] = None) -> bool:
+        """Async variant of ``flush``."""
+        return await asyncio.to_thread(self.flush, timeout)
+    
+    def close(self) -> None:
+        """Flush and stop the worker."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._messages and time.monotonic() >= self._deadline:
+                        break
+                    if self._closed and not self._messages:
+                        return
+                    timeout = None if not self._messages else self._deadline - time.monotonic()
+                    self._cond.wait(timeout)
+                paths, messages = sorted(self._paths), self._messages
+                self._paths, self._messages, self._deadline = set(), [], None
+                self._busy = True
+            try:
+                if len(messages) == 1:
+                    message = messages[0]
+                else:
+                    message = f"{messages[0]} (+{len(messages) - 1} more)\n\n" + "\n".join(f"- {m}" for m in messages)
+                if self.git.commit(message, paths=paths):
+                    self.commits += 1
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -1,6 +1,10 @@
 """Managers package initialization."""
 
-from coding_agent_plugin.managers.project_manager import ProjectManager
+from coding_agent_plugin.managers.project_manager import ProjectManager, get_project_manager
 from coding_agent_plugin.managers.storage_manager import StorageManager
+from coding_agent_plugin.managers.blob_store import BlobStore, get_blob_store
+from coding_agent_plugin.managers.checkpoint_manager import CheckpointManager
+from coding_agent_plugin.managers.task_journal import TaskJournal
+from coding_agent_plugin.managers.task_snapshot import TaskSnapshot
 
-__all__ = ["ProjectManager", "StorageManager"]
+__all__ = ["ProjectManager", "get_project_manager", "StorageManager", "BlobStore", "get_blob_store", "CheckpointManager", "TaskJournal", "TaskSnapshot"]
@@ -0,0 +1,317 @@
+"""Content-addressed, compressed object store for project file contents."""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Optional: blobs fall back to zlib
+    zstandard = None
+
+from coding_agent_plugin.managers.file_index import FileIndex
+
+# Bytes read per step when hashing, compressing and restoring blobs
+CHUNK_SIZE = 1024 * 1024
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Directories that are rebuilt rather than versioned (besides .agentic and .git)
+SNAPSHOT_IGNORE_DIRS = {"__pycache__", "node_modules", ".venv", "venv", ".pytest_cache", ".mypy_cache", ".ruff_cache"}
+
+Manifest = Dict[str, Dict[str, Any]]
+
+
+class BlobStore:
+    """
+    Object store keyed by the SHA-256 of the uncompressed content.
+
+    Blobs live in ``<root>/<hash[:2]>/<hash[2:]>``, compressed with zstd
+    (or zlib when ``zstandard`` is not installed; both are read back). The
+    hash is the same as ``ProjectFile.content_hash``, so identical files are
+    stored once across all projects and versions. Writes go through a
+    temporary file and an atomic rename, so concurrent writers of the same
+    content are harmless.
+    """
+
+    def __init__(self, root: Optional[str] = None, level: Optional[int] = None):
+        """
+        Initialize blob store.
+
+        Args:
+            root: Store directory (default: BLOB_STORE_DIR)
+            level: Compression level (default: BLOB_COMPRESSION_LEVEL)
+        """
+        from coding_agent_plugin.core.config import BLOB_STORE_DIR, BLOB_COMPRESSION_LEVEL
+
+        self.root = Path(root or BLOB_STORE_DIR)
+        self.level = BLOB_COMPRESSION_LEVEL if level is None else level
+        self._tmp = self.root / "tmp"
+
+    def path(self, digest: str) -> Path:
+        """Location of a blob."""
+        return self.root / digest[:2] / digest[2:]
+
+    def has(self, digest: str) -> bool:
+        """Whether a blob is stored."""
+        return self.path(digest).exists()
+
+    def put_bytes(self, data: bytes) -> str:
+        """Store content; returns its hash."""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.has(digest):
+            compressor = self._compressor()
+            self._commit(digest, [compressor.compress(data), compressor.flush()])
+        return digest
+
+    def put_file(self, file_path: str) -> Tuple[str, int]:
+        """
+        Store a file, hashing and compressing it in one streaming pass.
+
+        Returns:
+            (hash, size in bytes)
+        """
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        compressor = self._compressor()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with open(file_path, "rb") as src, os.fdopen(fd, "wb") as dst:
+                while chunk := src.read(CHUNK_SIZE):
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    dst.write(compressor.compress(chunk))
+                dst.write(compressor.flush())
+            digest = hasher.hexdigest()
+            target = self.path(digest)
+            if target.exists():
+                os.remove(tmp_path)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, target)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_bytes(self, digest: str) -> bytes:
+        """Content of a blob."""
+        return b"".join(self._read(digest))
+
+    def write_to(self, digest: str, dest: str, mode: Optional[int] = None, mtime_ns: Optional[int] = None) -> None:
+        """
+        Materialize a blob as a file, atomically replacing ``dest``.
+
+        Args:
+            digest: Blob hash
+            dest: Target file path
+            mode: Permission bits to apply
+            mtime_ns: Modification time to apply
+
+        Raises:
+            FileNotFoundError: If the blob is missing
+            ValueError: If the blob content does not match its hash
+        """
+        Path(dest).parent.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest), prefix=".blob-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self._read(digest):
+                    hasher.update(chunk)
+                    f.write(chunk)
+            if hasher.hexdigest() != digest:
+                raise ValueError(f"Blob {digest} is corrupt")
+            if mode is not None:
+                os.chmod(tmp_path, mode)
+            if mtime_ns is not None:
+                os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+            os.replace(tmp_path, dest)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def prune(self, keep: Set[str]) -> int:
+        """Delete every blob not in ``keep``; returns the number removed."""
+        removed = 0
+        for shard in self.root.iterdir() if self.root.exists() else ():
+            if not shard.is_dir() or len(shard.name) != 2:
+                continue
+            for blob in shard.iterdir():
+                if shard.name + blob.name not in keep:
+                    blob.unlink(missing_ok=True)
+                    removed += 1
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        return removed
+
+    # Internals
+
+    def _compressor(self):
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=self.level).compressobj()
+        return zlib.compressobj(max(1, min(self.level, 9)))
+
+    def _commit(self, digest: str, chunks: Iterable[bytes]) -> None:
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            target = self.path(digest)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read(self, digest: str):
+        with open(self.path(digest), "rb") as f:
+            head = f.read(len(ZSTD_MAGIC))
+            f.seek(0)
+            if head == ZSTD_MAGIC:
+                if zstandard is None:
+                    raise RuntimeError("Blob is zstd-compressed; install 'zstandard' to read it")
+                decompressor = zstandard.ZstdDecompressor().decompressobj()
+            else:
+                decompressor = zlib.decompressobj()
+            while chunk := f.read(CHUNK_SIZE):
+                yield decompressor.decompress(chunk)
+            if hasattr(decompressor, "flush"):
+                yield decompressor.flush()
+
+
+def _versioned(rel: str) -> bool:
+    return not any(part in SNAPSHOT_IGNORE_DIRS for part in rel.split("/"))
+
+
+def _versioned_files(root: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Current (size, mtime_ns) of the versioned files of a directory.
+
+    The FileIndex lists the files, but its stats are refreshed only for
+    directories whose mtime changed, so in-place edits would be missed:
+    every file is stat'ed again here.
+    """
+    files = {}
+    for rel in FileIndex.for_project(root).entries(include_hidden=True):
+        if not _versioned(rel):
+            continue
+        try:
+            st = os.stat(os.path.join(root, rel))
+        except FileNotFoundError:
+            continue
+        files[rel] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def snapshot_directory(
+    root: str, store: BlobStore, previous: Optional[Manifest] = None, workers: Optional[int] = None
+) -> Manifest:
+    """
+    Store every versioned file of a directory and return its manifest.
+
+    Files whose size and mtime match ``previous`` (and whose blob exists)
+    are not read again.
+
+    Args:
+        root: Project directory
+        store: Blob store
+        previous: Manifest of the last snapshot
+        workers: Threads hashing and compressing changed files
+
+    Returns:
+        Mapping of relative path to ``{"hash", "size", "mtime", "mode"}``
+    """
+    from coding_agent_plugin.core.config import STORAGE_COPY_WORKERS
+
+    previous = previous or {}
+    manifest: Manifest = {}
+    changed = []
+    for rel, (size, mtime) in _versioned_files(root).items():
+        entry = previous.get(rel)
+        if entry and entry["size"] == size and entry["mtime"] == mtime and store.has(entry["hash"]):
+            manifest[rel] = dict(entry)
+        else:
+            changed.append(rel)
+
+    def store_file(rel: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        path = os.path.join(root, rel)
+        try:
+            st = os.stat(path)
+            digest, size = store.put_file(path)
+        except FileNotFoundError:
+            return rel, None  # Deleted while snapshotting
+        return rel, {"hash": digest, "size": size, "mtime": st.st_mtime_ns, "mode": st.st_mode & 0o7777}
+
+    if changed:
+        with ThreadPoolExecutor(max_workers=max(1, workers or STORAGE_COPY_WORKERS)) as pool:
+            for rel, entry in pool.map(store_file, changed):
+                if entry is not None:
+                    manifest[rel] = entry
+    return dict(sorted(manifest.items()))
+
+
+def restore_directory(root: str, store: BlobStore, manifest: Manifest) -> Dict[str, int]:
+    """
+    Make a directory match a manifest.
+
+    Files already matching their manifest entry (same size and mtime) are
+    left alone, so restoring touches only what changed. Versioned files not
+    in the manifest are deleted; ignored directories (``node_modules``,
+    virtualenvs, caches) are kept.
+
+    Returns:
+        Counts of restored, deleted and unchanged files
+    """
+    index = FileIndex.for_project(root)
+    current = _versioned_files(root)
+    restored = unchanged = deleted = 0
+
+    for rel, entry in manifest.items():
+        if current.get(rel) == (entry["size"], entry["mtime"]):
+            unchanged += 1
+            continue
+        path = os.path.join(root, rel)
+        store.write_to(entry["hash"], path, mode=entry.get("mode"), mtime_ns=entry["mtime"])
+        index.record_write(path)
+        restored += 1
+
+    for rel in current.keys() - manifest.keys():
+        path = os.path.join(root, rel)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        index.record_delete(path)
+        deleted += 1
+
+    return {"restored": restored, "deleted": deleted, "unchanged": unchanged}
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Get the shared blob store (BLOB_STORE_DIR).
+
+    Returns:
+        Shared BlobStore instance
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore()
+        return _store
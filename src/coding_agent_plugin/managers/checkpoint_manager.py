@@ -0,0 +1,158 @@
+"""Checkpoint manager for resumable autonomous runs."""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class CheckpointManager:
+    """Persists the plan and completed tasks of a run in ``.agentic/checkpoint.json``."""
+
+    FILENAME = "checkpoint.json"
+
+    def __init__(self, project_path: str):
+        """
+        Initialize checkpoint manager.
+
+        Args:
+            project_path: Path to the project directory
+        """
+        self.project_path = Path(project_path)
+        self.path = self.project_path / ".agentic" / self.FILENAME
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def plan_hash(workflow: Dict[str, Any]) -> str:
+        """Stable hash of a plan."""
+        payload = json.dumps(workflow, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def file_hash(path: Path) -> Optional[str]:
+        """SHA-256 of a file, or None if it does not exist."""
+        if not path.is_file():
+            return None
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the saved checkpoint.
+
+        Returns:
+            Checkpoint dictionary or None if there is no usable checkpoint
+        """
+        with self._lock:
+            if self._state is None:
+                try:
+                    with open(self.path, "r") as f:
+                        self._state = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    return None
+            return self._state
+
+    def start(self, prompt: str, workflow: Dict[str, Any]) -> None:
+        """
+        Start a new checkpoint for a plan, discarding any previous progress.
+
+        Args:
+            prompt: User prompt of the run
+            workflow: Plan produced by the PlanningAgent
+        """
+        with self._lock:
+            self._state = {
+                "prompt": prompt,
+                "plan_hash": self.plan_hash(workflow),
+                "plan": workflow,
+                "status": "running",
+                "started_at": datetime.now().isoformat(),
+                "completed": {},
+            }
+            self._save()
+
+    def record(self, task_key: str, file_path: Optional[str] = None) -> None:
+        """
+        Record a completed task.
+
+        Args:
+            task_key: Task identifier within the plan
+            file_path: File written by the task (absolute or project-relative)
+        """
+        entry: Dict[str, Any] = {"completed_at": datetime.now().isoformat()}
+        if file_path:
+            full_path = Path(file_path)
+            if not full_path.is_absolute():
+                full_path = self.project_path / file_path
+            try:
+                entry["file_path"] = str(full_path.relative_to(self.project_path))
+            except ValueError:
+                entry["file_path"] = str(full_path)
+            entry["file_hash"] = self.file_hash(full_path)
+
+        with self._lock:
+            if self._state is None:
+                return
+            completed = self._state["completed"]
+            completed.pop(task_key, None)
+            completed[task_key] = entry
+            self._save()
+
+    def finish(self, status: str = "completed") -> None:
+        """Mark the run as finished."""
+        with self._lock:
+            if self._state is None:
+                return
+            self._state["status"] = status
+            self._state["finished_at"] = datetime.now().isoformat()
+            self._save()
+
+    def completed_tasks(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the completed tasks that are still valid.
+
+        A task is valid when its output file still exists and matches the hash
+        recorded by the last task that wrote it. Anything else is re-run.
+
+        Returns:
+            Mapping of task key to checkpoint entry
+        """
+        state = self.load()
+        if not state:
+            return {}
+
+        completed = state.get("completed", {})
+        latest_hash: Dict[str, Optional[str]] = {}
+        for entry in completed.values():
+            if "file_path" in entry:
+                latest_hash[entry["file_path"]] = entry.get("file_hash")
+
+        current_hash = {
+            path: self.file_hash(self.project_path / path) for path in latest_hash
+        }
+
+        valid = {}
+        for key, entry in completed.items():
+            path = entry.get("file_path")
+            if path is not None:
+                if current_hash[path] is None or current_hash[path] != latest_hash[path]:
+                    continue
+            valid[key] = entry
+        return valid
+
+    def _save(self) -> None:
+        """Atomically write the checkpoint to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
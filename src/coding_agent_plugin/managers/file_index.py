@@ -0,0 +1,334 @@
+"""Incremental index of the files in a project directory."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from coding_agent_plugin.core.events import FileWritten, get_event_bus
+
+
+class FileIndex:
+    """
+    Persistent index of project files stored in ``.agentic/file_index.json``.
+
+    The index records the size and mtime of every file and the mtime of every
+    directory. Agents report their own writes through ``record_write`` and
+    ``record_delete``; everything else is picked up by ``reconcile``, which
+    only stats directories and rescans those whose mtime changed (creating,
+    deleting or renaming an entry updates the mtime of its directory).
+    Listings, counts and total size are then answered from memory.
+
+    In-place edits of existing files made outside the agents do not touch
+    the directory mtime, so their size is refreshed by ``reconcile(full=True)``.
+    """
+
+    FILENAME = "file_index.json"
+    EXCLUDED_DIRS = {".agentic", ".git"}
+
+    # Directories modified this recently are rescanned on the next reconcile,
+    # since a change in the same mtime tick would otherwise go unnoticed.
+    RACY_WINDOW = 2.0
+
+    _instances: Dict[str, "FileIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_project(cls, project_path: str) -> "FileIndex":
+        """Get the shared index of a project directory."""
+        key = os.path.abspath(project_path)
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls._instances[key] = cls(key)
+            return index
+
+    def __init__(self, project_path: str):
+        """
+        Initialize file index.
+
+        Args:
+            project_path: Path to the project directory
+        """
+        self.root = Path(project_path)
+        self.path = self.root / ".agentic" / self.FILENAME
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dirty = False
+        self._files: Dict[str, List[int]] = {}  # path -> [size, mtime_ns]
+        self._dirs: Dict[str, int] = {}  # dir path ("" is the root) -> mtime_ns
+        self._dir_files: Dict[str, Set[str]] = {}
+        self._dir_subdirs: Dict[str, Set[str]] = {}
+        self._total_size = 0
+        self._sorted: Optional[List[str]] = None
+
+    # Queries
+
+    def list_files(self, include_hidden: bool = False) -> List[str]:
+        """
+        List indexed files.
+
+        Args:
+            include_hidden: Include dotfiles, hidden directories and __pycache__
+
+        Returns:
+            Sorted list of relative file paths
+        """
+        with self._lock:
+            self.reconcile()
+            if self._sorted is None:
+                self._sorted = sorted(self._files)
+            if include_hidden:
+                return list(self._sorted)
+            return [path for path in self._sorted if not _is_hidden(path)]
+
+    def entries(self, include_hidden: bool = False) -> Dict[str, Tuple[int, int]]:
+        """
+        Get the size and mtime of indexed files.
+
+        Args:
+            include_hidden: Include dotfiles, hidden directories and __pycache__
+
+        Returns:
+            Mapping of relative file path to (size, mtime_ns)
+        """
+        with self._lock:
+            self.reconcile()
+            return {
+                path: (size, mtime)
+                for path, (size, mtime) in self._files.items()
+                if include_hidden or not _is_hidden(path)
+            }
+
+    def stats(self) -> Dict[str, int]:
+        """Get file count and total size in bytes."""
+        with self._lock:
+            self.reconcile()
+            return {"file_count": len(self._files), "total_size_bytes": self._total_size}
+
+    # Updates
+
+    def record_write(self, file_path: str) -> None:
+        """
+        Record a file written by the agents.
+
+        Args:
+            file_path: Absolute or project-relative path of the file
+        """
+        rel = self._relative(file_path)
+        if rel is None:
+            return
+        bus = get_event_bus()
+        if bus.wants(FileWritten):
+            try:
+                size = os.path.getsize(self.root / rel)
+            except OSError:
+                size = None
+            bus.publish(FileWritten(project_path=str(self.root), path=rel, size=size))
+        with self._lock:
+            self._load()
+            directory = _parent(rel)
+            if directory not in self._dirs:
+                # New directory: index it (and any other new ancestors) from disk
+                while _parent(directory) not in self._dirs and directory:
+                    directory = _parent(directory)
+                self._scan_dir(directory)
+                return
+            try:
+                st = os.stat(self.root / rel)
+            except OSError:
+                self._remove_file(rel)
+                return
+            self._set_file(rel, st.st_size, st.st_mtime_ns)
+            self._stamp_dir(directory)
+
+    def record_delete(self, file_path: str) -> None:
+        """
+        Record a file deleted by the agents.
+
+        Args:
+            file_path: Absolute or project-relative path of the file
+        """
+        rel = self._relative(file_path)
+        if rel is None:
+            return
+        with self._lock:
+            self._load()
+            self._remove_file(rel)
+            if _parent(rel) in self._dirs:
+                self._stamp_dir(_parent(rel))
+
+    def reconcile(self, full: bool = False) -> None:
+        """
+        Bring the index up to date with the directory on disk.
+
+        Args:
+            full: Rescan every directory and stat every file
+        """
+        with self._lock:
+            self._load()
+            if full:
+                self._reset()
+                self._scan_dir("")
+            elif "" not in self._dirs:
+                self._scan_dir("")
+            else:
+                for directory in sorted(self._dirs, key=len):
+                    if directory not in self._dirs:
+                        continue  # Removed while rescanning a parent
+                    try:
+                        mtime = os.stat(self.root / directory).st_mtime_ns
+                    except OSError:
+                        self._remove_dir(directory)
+                        continue
+                    if mtime != self._dirs[directory]:
+                        self._scan_dir(directory)
+            if self._dirty:
+                self._save()
+
+    # Internals
+
+    def _relative(self, file_path: str) -> Optional[str]:
+        path = Path(file_path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.root)
+            except ValueError:
+                return None
+        rel = path.as_posix().lstrip("/")
+        if rel.startswith("./"):
+            rel = rel[2:]
+        if not rel or rel == "." or any(part in self.EXCLUDED_DIRS for part in rel.split("/")):
+            return None
+        return rel
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            for directory, mtime in data["dirs"].items():
+                self._dirs[directory] = mtime
+                self._dir_files.setdefault(directory, set())
+                self._dir_subdirs.setdefault(directory, set())
+                if directory:
+                    self._dir_subdirs.setdefault(_parent(directory), set()).add(directory)
+            for rel, (size, mtime) in data["files"].items():
+                self._files[rel] = [size, mtime]
+                self._dir_files.setdefault(_parent(rel), set()).add(rel)
+                self._total_size += size
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            self._reset()
+            self._scan_dir("")
+
+    def _save(self) -> None:
+        if not self.root.exists():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "dirs": self._dirs, "files": self._files}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _reset(self) -> None:
+        self._files.clear()
+        self._dirs.clear()
+        self._dir_files.clear()
+        self._dir_subdirs.clear()
+        self._total_size = 0
+        self._sorted = None
+        self._dirty = True
+
+    def _stamp_dir(self, directory: str) -> None:
+        try:
+            mtime = os.stat(self.root / directory).st_mtime_ns
+        except OSError:
+            self._remove_dir(directory)
+            return
+        if time.time() - mtime / 1e9 < self.RACY_WINDOW:
+            mtime = -1
+        if self._dirs.get(directory) != mtime:
+            self._dirs[directory] = mtime
+            self._dirty = True
+
+    def _scan_dir(self, directory: str) -> None:
+        """Rescan one directory, recursing into subdirectories not seen before."""
+        try:
+            entries = list(os.scandir(self.root / directory))
+        except OSError:
+            self._remove_dir(directory)
+            return
+
+        self._dir_files.setdefault(directory, set())
+        self._dir_subdirs.setdefault(directory, set())
+        if directory:
+            self._dir_subdirs.setdefault(_parent(directory), set()).add(directory)
+        self._stamp_dir(directory)
+
+        seen_files = set()
+        seen_dirs = set()
+        for entry in entries:
+            rel = f"{directory}/{entry.name}" if directory else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in self.EXCLUDED_DIRS:
+                        continue
+                    seen_dirs.add(rel)
+                    if rel not in self._dirs:
+                        self._scan_dir(rel)
+                elif entry.is_file():
+                    st = entry.stat()
+                    seen_files.add(rel)
+                    self._set_file(rel, st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+
+        for rel in self._dir_files[directory] - seen_files:
+            self._remove_file(rel)
+        for rel in self._dir_subdirs[directory] - seen_dirs:
+            self._remove_dir(rel)
+
+    def _set_file(self, rel: str, size: int, mtime: int) -> None:
+        entry = self._files.get(rel)
+        if entry == [size, mtime]:
+            return
+        if entry is None:
+            self._dir_files.setdefault(_parent(rel), set()).add(rel)
+            self._sorted = None
+        else:
+            self._total_size -= entry[0]
+        self._files[rel] = [size, mtime]
+        self._total_size += size
+        self._dirty = True
+
+    def _remove_file(self, rel: str) -> None:
+        entry = self._files.pop(rel, None)
+        if entry is None:
+            return
+        self._total_size -= entry[0]
+        self._dir_files.get(_parent(rel), set()).discard(rel)
+        self._sorted = None
+        self._dirty = True
+
+    def _remove_dir(self, directory: str) -> None:
+        for rel in list(self._dir_files.pop(directory, ())):
+            self._remove_file(rel)
+        for subdir in list(self._dir_subdirs.pop(directory, ())):
+            self._remove_dir(subdir)
+        if directory:
+            self._dir_subdirs.get(_parent(directory), set()).discard(directory)
+        if self._dirs.pop(directory, None) is not None:
+            self._dirty = True
+
+
+def _parent(rel: str) -> str:
+    return rel.rpartition("/")[0]
+
+
+def _is_hidden(rel: str) -> bool:
+    return any(part.startswith(".") or part == "__pycache__" for part in rel.split("/"))
@@ -1,15 +1,67 @@
 """Project manager for creating and managing projects."""
 
+import asyncio
+import shutil
+import threading
+import uuid
 from pathlib import Path
 from typing import List, Optional, Dict
-from datetime import datetime
 
-from coding_agent_plugin.models import Project, UserSettings, get_db_session, init_db
-from coding_agent_plugin.models.database import AGENTIC_HOME
+from coding_agent_plugin.managers.file_index import FileIndex
+from coding_agent_plugin.managers.blob_store import get_blob_store, restore_directory, snapshot_directory
+from coding_agent_plugin.repositories.workspace import get_workspace_repository
+
+
+class _ProjectCache:
+    """Process-wide cache of project records, indexed by ID and by name."""
+    
+    def __init__(self):
+        self._by_id: Dict[str, Dict] = {}
+        self._by_name: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name_or_id: str) -> Optional[Dict]:
+        with self._lock:
+            project_id = self._by_name.get(name_or_id, name_or_id)
+            record = self._by_id.get(project_id)
+        if record is None:
+            return None
+        # Another process may have deleted the project behind our back
+        if record["storage_path"] and not Path(record["storage_path"]).exists():
+            self.invalidate(name_or_id)
+            return None
+        return dict(record)
+    
+    def put(self, record: Dict) -> None:
+        with self._lock:
+            self._by_id[record["id"]] = dict(record)
+            self._by_name[record["name"]] = record["id"]
+    
+    def invalidate(self, name_or_id: Optional[str] = None) -> None:
+        """Drop one project (by name or ID), or everything when omitted."""
+        with self._lock:
+            if name_or_id is None:
+                self._by_id.clear()
+                self._by_name.clear()
+                return
+            project_id = self._by_name.get(name_or_id, name_or_id)
+            record = self._by_id.pop(project_id, None)
+            self._by_name.pop(name_or_id, None)
+            if record is not None:
+                self._by_name.pop(record["name"], None)
+
+
+_project_cache = _ProjectCache()
 
 
 class ProjectManager:
-    """Manages project creation, listing, and switching."""
+    """
+    Manages project creation, listing, and switching.
+    
+    Every method has an async variant (``aget_project``, ``acreate_project``,
+    ...) for use inside coroutines; both go through the shared
+    ``WorkspaceRepository``, whose queries run on its own event loop.
+    """
     @property
     def db_path(self) -> str:
         """Get database path or URL."""
@@ -29,91 +81,81 @@ class ProjectManager:
             List of relative file paths
         """
         project = self.get_project(project_name_or_id)
+        return self._list_files(project)
+    
+    async def alist_files(self, project_name_or_id: str) -> List[str]:
+        """Async variant of ``list_files``."""
+        project = await self.aget_project(project_name_or_id)
+        return self._list_files(project)
+    
+    @staticmethod
+    def _list_files(project: Optional[Dict]) -> List[str]:
         if not project:
             return []
             
-        base_path = Path(project.storage_path) # Access storage_path directly from Project object
+        base_path = Path(project["storage_path"])
         if not base_path.exists():
             return []
             
-        files = []
-        for path in base_path.rglob("*"):
-            if path.is_file():
-                # Get relative path
-                rel_path = path.relative_to(base_path)
-                
-                # Skip hidden directories and files
-                if any(part.startswith(".") for part in rel_path.parts):
-                    continue
-                if any(part == "__pycache__" for part in rel_path.parts):
-                    continue
-                    
-                files.append(str(rel_path))
-                
-        return sorted(files)
+        # Hidden files/directories and __pycache__ are skipped
+        return FileIndex.for_project(project["storage_path"]).list_files()
     
     def __init__(self):
         """Initialize project manager."""
         from coding_agent_plugin.core.config import AGENTIC_PROJECTS_DIR
         
-        # Ensure database is initialized
-        init_db()
+        self.repository = get_workspace_repository()
         
         # Use configured projects directory
         self.projects_dir = Path(AGENTIC_PROJECTS_DIR).resolve()
         self.projects_dir.mkdir(parents=True, exist_ok=True)
     
-    def create_project(self, name: str, description: Optional[str] = None) -> Project:
+    def create_project(
+        self, name: str, description: Optional[str] = None, template: Optional[str] = None
+    ) -> Dict:
         """
         Create a new project.
         
         Args:
             name: Project name (must be unique)
             description: Optional project description
+            template: Project (name or ID) whose files the new project starts with
             
         Returns:
-            Created Project object
+            Created project record
             
         Raises:
-            ValueError: If project with name already exists
+            ValueError: If project with name already exists, or the template is not found
         """
-        with get_db_session() as session:
-            # Check if project already exists
-            existing = session.query(Project).filter_by(name=name).first()
-            if existing:
-                raise ValueError(f"Project '{name}' already exists")
-            
-            # Create project object first to generate ID
-            # We set a temporary storage path that we'll update immediately
-            project = Project(
-                name=name,
-                description=description,
-                storage_path="",  # Temporary
-                project_metadata={}
-            )
-            session.add(project)
-            session.flush()  # Generate ID
-            
-            # Now use the ID for the folder name
-            project_id = project.id
-            storage_path = str(self.projects_dir / project_id)
-            
-            # Create directory
-            Path(storage_path).mkdir(parents=True, exist_ok=True)
-            
-            # Create .agentic metadata directory
-            metadata_dir = Path(storage_path) / ".agentic"
-            metadata_dir.mkdir(exist_ok=True)
-            
-            # Update project with real path
-            project.storage_path = storage_path
-            
-            # Commit happens automatically on exit context if no error
-            
-            # Get project data before session closes
-            project_dict = project.to_dict()
-            
-        return project_dict
+        return self.repository.run_sync(self.acreate_project(name, description, template))
+    
+    async def acreate_project(
+        self, name: str, description: Optional[str] = None, template: Optional[str] = None
+    ) -> Dict:
+        """Async variant of ``create_project``."""
+        template_project = None
+        if template:
+            template_project = await self.aget_project(template)
+            if not template_project:
+                raise ValueError(f"Template project '{template}' not found")
+        
+        # The project ID names its folder
+        project_id = str(uuid.uuid4())
+        storage_path = str(self.projects_dir / project_id)
+        record = await self.repository.create_project(project_id, name, storage_path, description)
+        
+        # Create directory with its .agentic metadata directory
+        (Path(storage_path) / ".agentic").mkdir(parents=True, exist_ok=True)
+        _project_cache.put(record)
+        
+        if template_project:
+            # Materialize the template's current files from the blob store; the
+            # new project's first version shares all of the template's blobs
+            manifest = await self._snapshot_manifest(template_project)
+            await asyncio.to_thread(restore_directory, storage_path, get_blob_store(), manifest)
+            await self._record_version(project_id, f"Created from template '{template_project['name']}'", manifest, {})
+        
+        return dict(record)
     
     def list_projects(self) -> List[Dict]:
         """
@@ -122,31 +164,87 @@ class ProjectManager:
         Returns:
             List of project dictionaries
         """
-        with get_db_session() as session:
-            projects = session.query(Project).order_by(Project.created_at.desc()).all()
-            return [p.to_dict() for p in projects]
+        return self.repository.run_sync(self.alist_projects())
+    
+    async def alist_projects(self) -> List[Dict]:
+        """Async variant of ``list_projects``."""
+        records = await self.repository.list_projects()
+        for record in records:
+            _project_cache.put(record)
+        return records
     
     def get_project(self, name_or_id: str) -> Optional[Dict]:
         """
         Get project by name or ID.
         
+        Results are served from a process-wide cache after the first lookup.
+        
         Args:
             name_or_id: Project name or ID
             
         Returns:
             Project dictionary or None if not found
         """
-        with get_db_session() as session:
-            # Try by name first
-            project = session.query(Project).filter_by(name=name_or_id).first()
-            if project:
-                return project.to_dict()
+        cached = _project_cache.get(name_or_id)
+        if cached is not None:
+            return cached
+        return self.repository.run_sync(self.aget_project(name_or_id))
+    
+    async def aget_project(self, name_or_id: str) -> Optional[Dict]:
+        """Async variant of ``get_project``."""
+        cached = _project_cache.get(name_or_id)
+        if cached is not None:
+            return cached
+        
+        record = await self.repository.get_project(name_or_id)
+        if not record:
+            return None
+        
+        _project_cache.put(record)
+        return dict(record)
+    
+    def update_project(
+        self,
+        name_or_id: str,
+        description: Optional[str] = None,
+        project_metadata: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Update project description and/or metadata.
+        
+        Args:
+            name_or_id: Project name or ID
+            description: New description
+            project_metadata: Metadata keys to merge into the existing metadata
             
-            # Try by ID
-            project = session.query(Project).filter_by(id=name_or_id).first()
-            if project:
-                return project.to_dict()
+        Returns:
+            Updated project dictionary or None if not found
+        """
+        return self.repository.run_sync(self.aupdate_project(name_or_id, description, project_metadata))
+    
+    async def aupdate_project(
+        self,
+        name_or_id: str,
+        description: Optional[str] = None,
+        project_metadata: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """Async variant of ``update_project``."""
+        record = await self.repository.update_project(name_or_id, description, project_metadata)
+        if not record:
             return None
+        
+        _project_cache.invalidate(record["id"])
+        _project_cache.put(record)
+        return record
+    
+    def invalidate_cache(self, name_or_id: Optional[str] = None) -> None:
+        """
+        Drop cached project records (e.g. after editing the database externally).
+        
+        Args:
+            name_or_id: Project to drop; all projects when omitted
+        """
+        _project_cache.invalidate(name_or_id)
     
     def delete_project(self, name_or_id: str) -> bool:
         """
@@ -158,25 +256,21 @@ class ProjectManager:
         Returns:
             True if deleted, False if not found
         """
-        with get_db_session() as session:
-            # Find project
-            project = session.query(Project).filter(
-                (Project.name == name_or_id) | (Project.id == name_or_id)
-            ).first()
-            
-            if not project:
-                return False
-            
-            # Delete project directory
-            import shutil
-            storage_path = Path(project.storage_path)
-            if storage_path.exists():
-                shutil.rmtree(storage_path)
-            
-            # Delete from database (cascade will delete files and versions)
-            session.delete(project)
-            
-            return True
+        return self.repository.run_sync(self.adelete_project(name_or_id))
+    
+    async def adelete_project(self, name_or_id: str) -> bool:
+        """Async variant of ``delete_project``."""
+        record = await self.repository.delete_project(name_or_id)
+        if not record:
+            return False
+        
+        # Delete project directory
+        storage_path = Path(record["storage_path"])
+        if storage_path.exists():
+            await asyncio.to_thread(shutil.rmtree, storage_path)
+        
+        _project_cache.invalidate(record["id"])
+        return True
     
     def get_current_project(self) -> Optional[str]:
         """
@@ -185,9 +279,11 @@ class ProjectManager:
         Returns:
             Current project name or None
         """
-        with get_db_session() as session:
-            setting = session.query(UserSettings).filter_by(key="current_project").first()
-            return setting.value if setting else None
+        return self.repository.run_sync(self.aget_current_project())
+    
+    async def aget_current_project(self) -> Optional[str]:
+        """Async variant of ``get_current_project``."""
+        return await self.repository.get_setting("current_project")
     
     def set_current_project(self, name_or_id: str) -> bool:
         """
@@ -199,21 +295,146 @@ class ProjectManager:
         Returns:
             True if set successfully, False if project not found
         """
+        return self.repository.run_sync(self.aset_current_project(name_or_id))
+    
+    async def aset_current_project(self, name_or_id: str) -> bool:
+        """Async variant of ``set_current_project``."""
         # Verify project exists
-        project = self.get_project(name_or_id)
+        project = await self.aget_project(name_or_id)
         if not project:
             return False
         
-        with get_db_session() as session:
-            # Update or create current_project setting
-            setting = session.query(UserSettings).filter_by(key="current_project").first()
-            if setting:
-                setting.value = project.name
-            else:
-                setting = UserSettings(key="current_project", value=project.name)
-                session.add(setting)
+        await self.repository.set_setting("current_project", project["name"])
+        return True
+    
+    def snapshot_project(self, name_or_id: str, description: Optional[str] = None) -> Optional[Dict]:
+        """
+        Record the project's files as a new version.
+        
+        Contents go to the shared blob store (deduplicated by hash); the
+        version stores the manifest. Files unchanged since the last
+        snapshot are not read again.
+        
+        Args:
+            name_or_id: Project name or ID
+            description: Version description
+            
+        Returns:
+            Version number and added/modified/deleted counts, or None if the project is not found
+        """
+        return self.repository.run_sync(self.asnapshot_project(name_or_id, description))
+    
+    async def asnapshot_project(self, name_or_id: str, description: Optional[str] = None) -> Optional[Dict]:
+        """Async variant of ``snapshot_project``."""
+        project = await self.aget_project(name_or_id)
+        if not project:
+            return None
+        latest = await self.repository.get_version(project["id"])
+        previous = (latest["changes"] or {}).get("files", {}) if latest else {}
+        manifest = await self._snapshot_manifest(project, previous)
+        return await self._record_version(project["id"], description, manifest, previous)
+    
+    def list_versions(self, name_or_id: str) -> Optional[List[Dict]]:
+        """
+        List project versions (without their manifests), oldest first.
+        
+        Args:
+            name_or_id: Project name or ID
+            
+        Returns:
+            List of version dictionaries, or None if the project is not found
+        """
+        return self.repository.run_sync(self.alist_versions(name_or_id))
+    
+    async def alist_versions(self, name_or_id: str) -> Optional[List[Dict]]:
+        """Async variant of ``list_versions``."""
+        project = await self.aget_project(name_or_id)
+        if not project:
+            return None
+        versions = await self.repository.list_versions(project["id"])
+        for version in versions:
+            changes = version.pop("changes") or {}
+            version["file_count"] = len(changes.get("files", {}))
+            for key in ("added", "modified", "deleted"):
+                version[key] = len(changes.get(key, []))
+        return versions
+    
+    def restore_project(self, name_or_id: str, version: int) -> Optional[Dict]:
+        """
+        Roll the project's files back to a version.
+        
+        Only files that differ from the version are rewritten; files added
+        since are deleted. Take a snapshot first to keep the current state.
+        
+        Args:
+            name_or_id: Project name or ID
+            version: Version number
             
-            return True
+        Returns:
+            Counts of restored, deleted and unchanged files, or None if the project or version is not found
+        """
+        return self.repository.run_sync(self.arestore_project(name_or_id, version))
+    
+    async def arestore_project(self, name_or_id: str, version: int) -> Optional[Dict]:
+        """Async variant of ``restore_project``."""
+        project = await self.aget_project(name_or_id)
+        if not project:
+            return None
+        snapshot = await self.repository.get_version(project["id"], version)
+        if not snapshot:
+            return None
+        manifest = (snapshot["changes"] or {}).get("files", {})
+        before = {r["file_path"] for r in await self.repository.list_file_records(project["id"])}
+        result = await asyncio.to_thread(restore_directory, project["storage_path"], get_blob_store(), manifest)
+        await self.repository.upsert_files(project["id"], [(rel, e["hash"], e["size"]) for rel, e in manifest.items()])
+        for rel in before - manifest.keys():
+            await self.repository.delete_file(project["id"], rel)
+        return result
+    
+    async def _snapshot_manifest(self, project: Dict, previous: Optional[Dict] = None) -> Dict:
+        if previous is None:
+            latest = await self.repository.get_version(project["id"])
+            previous = (latest["changes"] or {}).get("files", {}) if latest else {}
+        return await asyncio.to_thread(snapshot_directory, project["storage_path"], get_blob_store(), previous)
+    
+    async def _record_version(self, project_id: str, description: Optional[str], manifest: Dict, previous: Dict) -> Dict:
+        changes = {
+            "files": manifest,
+            "added": sorted(manifest.keys() - previous.keys()),
+            "modified": sorted(rel for rel in manifest.keys() & previous.keys() if manifest[rel]["hash"] != previous[rel]["hash"]),
+            "deleted": sorted(previous.keys() - manifest.keys()),
+        }
+        version = await self.repository.add_version(project_id, description, changes)
+        await self.repository.upsert_files(project_id, [(rel, e["hash"], e["size"]) for rel, e in manifest.items()])
+        return {
+            "version": version,
+            "file_count": len(manifest),
+            **{key: len(changes[key]) for key in ("added", "modified", "deleted")},
+        }
+    
+    def usage_summary(self, name_or_id: Optional[str] = None, group_by: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Summarize recorded LLM usage.
+        
+        Args:
+            name_or_id: Project name or ID (all projects when omitted)
+            group_by: "project_id", "run_id", "task_id", "agent" or "model"
+            
+        Returns:
+            Usage rows (see ``WorkspaceRepository.usage_summary``), or None if
+            the project is not found
+        """
+        return self.repository.run_sync(self.ausage_summary(name_or_id, group_by))
+    
+    async def ausage_summary(self, name_or_id: Optional[str] = None, group_by: Optional[str] = None) -> Optional[List[Dict]]:
+        """Async variant of ``usage_summary``."""
+        project_id = None
+        if name_or_id is not None:
+            project = await self.aget_project(name_or_id)
+            if not project:
+                return None
+            project_id = project["id"]
+        return await self.repository.usage_summary(project_id, group_by)
     
     def get_project_stats(self, name_or_id: str) -> Optional[Dict]:
         """
@@ -229,21 +450,44 @@ class ProjectManager:
         if not project:
             return None
         
-        storage_path = Path(project.storage_path)
+        storage_path = Path(project["storage_path"])
         
         # Count files and calculate total size
         file_count = 0
         total_size = 0
         
         if storage_path.exists():
-            for file in storage_path.rglob("*"):
-                if file.is_file() and not str(file).startswith(str(storage_path / ".agentic")):
-                    file_count += 1
-                    total_size += file.stat().st_size
+            index_stats = FileIndex.for_project(project["storage_path"]).stats()
+            file_count = index_stats["file_count"]
+            total_size = index_stats["total_size_bytes"]
+        
+        usage = self.repository.run_sync(self.repository.usage_summary(project["id"]))[0]
         
         return {
-            **project.to_dict(),
+            **project,
             "file_count": file_count,
             "total_size_bytes": total_size,
-            "total_size_mb": round(total_size / (1024 * 1024), 2)
+            "total_size_mb": round(total_size / (1024 * 1024), 2),
+            "usage": usage
         }
+
+
+_project_manager: Optional[ProjectManager] = None
+_project_manager_lock = threading.Lock()
+
+
+def get_project_manager() -> ProjectManager:
+    """
+    Get the process-wide ProjectManager.
+    
+    Agents and CLI commands share this instance instead of constructing their
+    own, so database setup and directory creation happen only once.
+    
+    Returns:
+        Shared ProjectManager instance
+    """
+    global _project_manager
+    with _project_manager_lock:
+        if _project_manager is None:
+            _project_manager = ProjectManager()
+        return _project_manager
@@ -1,12 +1,31 @@
 """Storage manager for project files."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import hashlib
+import os
 import shutil
 
-from coding_agent_plugin.models import ProjectFile, get_db_session
-from coding_agent_plugin.managers.project_manager import ProjectManager
+from coding_agent_plugin.managers.project_manager import get_project_manager
+from coding_agent_plugin.managers.file_index import FileIndex
+from coding_agent_plugin.managers import task_snapshot
+
+# Bytes read per step when copying and hashing files
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _copy_and_hash(source: str, dest: str) -> Tuple[str, int]:
+    """Copy a file (with its metadata) and hash it in the same pass."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        while chunk := src.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+            dst.write(chunk)
+            size += len(chunk)
+    shutil.copystat(source, dest)
+    return digest.hexdigest(), size
 
 
 class StorageManager:
@@ -14,7 +33,8 @@ class StorageManager:
     
     def __init__(self):
         """Initialize storage manager."""
-        self.project_manager = ProjectManager()
+        self.project_manager = get_project_manager()
+        self.repository = self.project_manager.repository
     
     def save_file(self, project_name_or_id: str, file_path: str, content: str) -> bool:
         """
@@ -36,37 +56,20 @@ class StorageManager:
             raise ValueError(f"Project '{project_name_or_id}' not found")
         
         # Full file path
-        full_path = Path(project.storage_path) / file_path
+        full_path = Path(project["storage_path"]) / file_path
         full_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Write file
+        task_snapshot.preserve(str(full_path))
         full_path.write_text(content, encoding="utf-8")
+        FileIndex.for_project(project["storage_path"]).record_write(str(full_path))
         
         # Calculate hash and size
         content_hash = hashlib.sha256(content.encode()).hexdigest()
         size_bytes = len(content.encode())
         
         # Update database
-        with get_db_session() as session:
-           # Check if file entry exists
-            file_entry = session.query(ProjectFile).filter_by(
-                project_id=project.id,
-                file_path=file_path
-            ).first()
-            
-            if file_entry:
-                # Update existing
-                file_entry.content_hash = content_hash
-                file_entry.size_bytes = size_bytes
-            else:
-                # Create new
-                file_entry = ProjectFile(
-                    project_id=project.id,
-                    file_path=file_path,
-                    content_hash=content_hash,
-                    size_bytes=size_bytes
-                )
-                session.add(file_entry)
+        self.repository.run_sync(self.repository.upsert_file(project["id"], file_path, content_hash, size_bytes))
         
         return True
     
@@ -81,11 +84,18 @@ class StorageManager:
         Returns:
             File content or None if not found
         """
-        project = self.project_manager.get_project(project_name_or_id)
+        return self._read_file(self.project_manager.get_project(project_name_or_id), file_path)
+    
+    async def aget_file(self, project_name_or_id: str, file_path: str) -> Optional[str]:
+        """Async variant of ``get_file``."""
+        return self._read_file(await self.project_manager.aget_project(project_name_or_id), file_path)
+    
+    @staticmethod
+    def _read_file(project, file_path: str) -> Optional[str]:
         if not project:
             return None
         
-        full_path = Path(project.storage_path) / file_path
+        full_path = Path(project["storage_path"]) / file_path
         if not full_path.exists():
             return None
         
@@ -105,18 +115,11 @@ class StorageManager:
         if not project:
             return []
         
-        storage_path = Path(project.storage_path)
-        files = []
-        
-        for file in storage_path.rglob("*"):
-            if file.is_file():
-                # Skip .agentic directory
-                if ".agentic" in file.parts:
-                    continue
-                relative_path = file.relative_to(storage_path)
-                files.append(str(relative_path))
+        if not Path(project["storage_path"]).exists():
+            return []
         
-        return sorted(files)
+        # Everything except the .agentic and .git directories
+        return FileIndex.for_project(project["storage_path"]).list_files(include_hidden=True)
     
     def delete_file(self, project_name_or_id: str, file_path: str) -> bool:
         """
@@ -133,22 +136,17 @@ class StorageManager:
         if not project:
             return False
         
-        full_path = Path(project.storage_path) / file_path
+        full_path = Path(project["storage_path"]) / file_path
         if not full_path.exists():
             return False
         
         # Delete file
+        task_snapshot.preserve(str(full_path))
         full_path.unlink()
+        FileIndex.for_project(project["storage_path"]).record_delete(str(full_path))
         
         # Delete from database
-        with get_db_session() as session:
-            file_entry = session.query(ProjectFile).filter_by(
-                project_id=project.id,
-                file_path=file_path
-            ).first()
-            
-            if file_entry:
-                session.delete(file_entry)
+        self.repository.run_sync(self.repository.delete_file(project["id"], file_path))
         
         return True
     
@@ -156,6 +154,10 @@ class StorageManager:
         """
         Copy file or directory to project storage.
         
+        Files are copied and hashed in one streaming pass on a thread pool
+        (STORAGE_COPY_WORKERS), then registered with a single batched upsert.
+        Binary files are copied and tracked like text files.
+        
         Args:
             source_path: Source file or directory path
             project_name_or_id: Project name or ID
@@ -164,28 +166,43 @@ class StorageManager:
         Returns:
             True if copied successfully
         """
+        from coding_agent_plugin.core.config import STORAGE_COPY_WORKERS
+        
         project = self.project_manager.get_project(project_name_or_id)
         if not project:
             return False
         
         source = Path(source_path)
-        dest = Path(project.storage_path) / dest_path
+        root = Path(project["storage_path"])
+        dest = root / dest_path
         
+        # (source, destination, path relative to the project)
+        copies = []
         if source.is_file():
+            copies.append((str(source), str(dest), Path(dest_path).as_posix()))
+        elif source.is_dir():
+            for directory, _, filenames in os.walk(source):
+                target_dir = dest / Path(directory).relative_to(source)
+                target_dir.mkdir(parents=True, exist_ok=True)
+                for filename in filenames:
+                    target = target_dir / filename
+                    copies.append((os.path.join(directory, filename), str(target), target.relative_to(root).as_posix()))
+        else:
+            return True
+        
+        if copies:
             dest.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(source, dest)
+            with ThreadPoolExecutor(max_workers=max(1, STORAGE_COPY_WORKERS)) as pool:
+                hashes = list(pool.map(lambda copy: _copy_and_hash(copy[0], copy[1]), copies))
             
-            # Track in database
-            content = dest.read_text(encoding="utf-8")
-            self.save_file(project.name, dest_path, content)
-        elif source.is_dir():
-            shutil.copytree(source, dest, dirs_exist_ok=True)
+            index = FileIndex.for_project(project["storage_path"])
+            for _, target, _ in copies:
+                index.record_write(target)
             
-            # Track all files in database
-            for file in dest.rglob("*"):
-                if file.is_file():
-                    relative_path = file.relative_to(Path(project.storage_path))
-                    content = file.read_text(encoding="utf-8")
-                    self.save_file(project.name, str(relative_path), content)
+            # Track in database
+            self.repository.run_sync(self.repository.upsert_files(
+                project["id"],
+                [(rel, content_hash, size) for (_, _, rel), (content_hash, size) in zip(copies, hashes)],
+            ))
         
         return True
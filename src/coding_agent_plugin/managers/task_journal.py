@@ -0,0 +1,210 @@
+"""Append-only journal of task status with a debounced tasks.md view."""
+
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class TaskJournal:
+    """
+    Task state of a project run, journaled to ``.agentic/tasks.jsonl``.
+
+    ``init`` starts a new journal with the plan's tasks; every status change
+    is one appended line, written with a single ``O_APPEND`` write so
+    concurrent updates (from parallel tasks or other processes) never
+    interleave. State is kept in memory keyed by task id, so updates are
+    O(1). The human-readable ``.agentic/tasks.md`` is re-rendered from
+    memory at most once per ``RENDER_DELAY`` seconds, and on ``flush``.
+    """
+
+    JOURNAL_FILENAME = "tasks.jsonl"
+    VIEW_FILENAME = "tasks.md"
+
+    # Seconds to wait for further updates before re-rendering tasks.md
+    RENDER_DELAY = 0.5
+
+    MARKERS = {"pending": " ", "in_progress": "/", "completed": "x", "failed": "!"}
+
+    _instances: Dict[str, "TaskJournal"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_project(cls, project_path: str) -> "TaskJournal":
+        """Get the shared journal of a project directory."""
+        key = os.path.abspath(project_path)
+        with cls._instances_lock:
+            journal = cls._instances.get(key)
+            if journal is None:
+                journal = cls._instances[key] = cls(key)
+            return journal
+
+    def __init__(self, project_path: str):
+        """
+        Initialize task journal.
+
+        Args:
+            project_path: Path to the project directory
+        """
+        self.directory = Path(project_path) / ".agentic"
+        self.path = self.directory / self.JOURNAL_FILENAME
+        self.view_path = self.directory / self.VIEW_FILENAME
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._timer: Optional[threading.Timer] = None
+
+    # Queries
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        """Tasks in plan order, each with id, description, agent and status."""
+        with self._lock:
+            self._load()
+            return [dict(task, id=task_id) for task_id, task in self._tasks.items()]
+
+    def status(self, task_id: str) -> Optional[str]:
+        """Current status of a task, or None if it is not in the journal."""
+        with self._lock:
+            self._load()
+            task = self._tasks.get(str(task_id))
+            return task["status"] if task else None
+
+    def find(self, description: str) -> Optional[str]:
+        """Id of the first task whose description is exactly ``description``."""
+        with self._lock:
+            self._load()
+            return next((task_id for task_id, task in self._tasks.items() if task["description"] == description), None)
+
+    # Updates
+
+    def init(self, tasks: List[Dict[str, Any]]) -> None:
+        """
+        Start a new journal for a plan and render tasks.md.
+
+        Args:
+            tasks: Planned tasks; ids default to their 1-based position
+        """
+        with self._lock:
+            self._loaded = True
+            self._tasks = {}
+            for index, task in enumerate(tasks):
+                task_id = str(task["id"]) if task.get("id") is not None else str(index + 1)
+                self._tasks[task_id] = {
+                    "description": task.get("description", "Unknown task"),
+                    "agent": task.get("agent", "unknown"),
+                    "status": "pending",
+                }
+            entry = {"op": "init", "at": datetime.now().isoformat(), "tasks": self.tasks()}
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.path)
+            self.flush()
+
+    def update(self, task_id: str, status: str) -> bool:
+        """
+        Record a status change.
+
+        A task only moves to ``in_progress`` from ``pending``, and a
+        completed task stays completed unless it is explicitly reset to
+        ``pending`` or ``failed``.
+
+        Returns:
+            True if the status changed
+        """
+        task_id = str(task_id)
+        with self._lock:
+            self._load()
+            task = self._tasks.get(task_id)
+            if task is None or not self._allowed(task["status"], status):
+                return False
+            task["status"] = status
+            self._append({"op": "status", "at": datetime.now().isoformat(), "id": task_id, "status": status})
+            self._schedule_render()
+            return True
+
+    def flush(self) -> None:
+        """Render tasks.md now, cancelling any pending render."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._loaded:
+                self._render()
+
+    # Internals
+
+    @staticmethod
+    def _allowed(current: str, new: str) -> bool:
+        if current == new:
+            return False
+        if new == "in_progress":
+            return current == "pending"
+        if current == "completed":
+            return new in ("pending", "failed")
+        return True
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        data = (json.dumps(entry) + "\n").encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def _schedule_render(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(self.RENDER_DELAY, self._debounced_render)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _debounced_render(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._render()
+
+    def _render(self) -> None:
+        lines = ["# Project Tasks\n\n"]
+        for task in self._tasks.values():
+            marker = self.MARKERS.get(task["status"], " ")
+            lines.append(f"- [{marker}] {task['description']} (Agent: {task['agent']})\n")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.view_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.view_path)
+
+    def _load(self) -> None:
+        """Replay the journal written by a previous instance or process."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line
+                    if entry.get("op") == "init":
+                        self._tasks = {
+                            str(task["id"]): {k: task[k] for k in ("description", "agent", "status")}
+                            for task in entry["tasks"]
+                        }
+                    elif entry.get("op") == "status" and entry.get("id") in self._tasks:
+                        self._tasks[entry["id"]]["status"] = entry["status"]
+        except FileNotFoundError:
+            pass
+
+
+@atexit.register
+def _flush_all() -> None:
+    """Render pending tasks.md views before the process exits."""
+    with TaskJournal._instances_lock:
+        journals = list(TaskJournal._instances.values())
+    for journal in journals:
+        journal.flush()
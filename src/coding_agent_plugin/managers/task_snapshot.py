@@ -0,0 +1,149 @@
+"""Copy-on-write snapshots of the files a task writes, for rolling back failed tasks."""
+
+import contextvars
+import difflib
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from coding_agent_plugin.managers.blob_store import BlobStore, get_blob_store
+from coding_agent_plugin.managers.file_index import FileIndex
+
+# Pre-image of a file: (blob hash, mode, mtime_ns), or None if it did not exist
+PreImage = Optional[Tuple[str, int, int]]
+
+_current: contextvars.ContextVar[Optional["TaskSnapshot"]] = contextvars.ContextVar("task_snapshot", default=None)
+
+
+class TaskSnapshot:
+    """
+    Pre-images of the files one task modifies.
+
+    Nothing is copied up front: writers call ``preserve`` (through the
+    module-level helper) right before they overwrite or delete a file, and
+    the first call per path stores the current content in the blob store.
+    ``rollback`` puts back exactly those files - restoring overwritten
+    ones, deleting created ones - so undoing a task costs O(files it
+    changed), independent of project size. ``diff`` describes what a
+    failed attempt wrote before it is rolled back. ``commit`` keeps the
+    changes and forgets the pre-images.
+
+    The active snapshot is held in a context variable, so concurrently
+    scheduled tasks (each running in its own asyncio task) capture only
+    their own writes.
+    """
+
+    def __init__(self, project_path: str, store: Optional[BlobStore] = None):
+        """
+        Initialize snapshot.
+
+        Args:
+            project_path: Project directory; writes outside it are not captured
+            store: Blob store for pre-images (default: shared store)
+        """
+        self.root = os.path.abspath(project_path)
+        self.store = store or get_blob_store()
+        self._preimages: Dict[str, PreImage] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def paths(self) -> List[str]:
+        """Absolute paths captured so far."""
+        with self._lock:
+            return sorted(self._preimages)
+
+    def preserve(self, file_path: str) -> None:
+        """Capture a file's current state before its first modification."""
+        path = os.path.abspath(file_path)
+        if os.path.commonpath([self.root, path]) != self.root:
+            return
+        with self._lock:
+            if path in self._preimages:
+                return
+            try:
+                st = os.stat(path)
+                digest, _ = self.store.put_file(path)
+                self._preimages[path] = (digest, st.st_mode & 0o7777, st.st_mtime_ns)
+            except FileNotFoundError:
+                self._preimages[path] = None
+
+    def diff(self) -> str:
+        """Unified diff from the captured pre-images to the current files."""
+        with self._lock:
+            preimages = dict(self._preimages)
+        chunks = []
+        for path, preimage in sorted(preimages.items()):
+            rel = os.path.relpath(path, self.root)
+            try:
+                before = self.store.get_bytes(preimage[0]).decode("utf-8") if preimage else ""
+                with open(path, "rb") as f:
+                    after = f.read().decode("utf-8")
+            except FileNotFoundError:
+                after = ""
+            except UnicodeDecodeError:
+                chunks.append(f"Binary file {rel} changed\n")
+                continue
+            chunks.extend(difflib.unified_diff(
+                before.splitlines(keepends=True),
+                after.splitlines(keepends=True),
+                fromfile=f"a/{rel}" if preimage else "/dev/null",
+                tofile=f"b/{rel}" if os.path.exists(path) else "/dev/null",
+            ))
+        return "".join(chunk if chunk.endswith("\n") else chunk + "\n" for chunk in chunks)
+
+    def rollback(self) -> int:
+        """
+        Restore every captured file and forget the pre-images.
+
+        Returns:
+            Number of files restored or removed
+        """
+        with self._lock:
+            preimages, self._preimages = self._preimages, {}
+        index = FileIndex.for_project(self.root)
+        for path, preimage in preimages.items():
+            if preimage is None:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                index.record_delete(path)
+            else:
+                digest, mode, mtime_ns = preimage
+                self.store.write_to(digest, path, mode=mode, mtime_ns=mtime_ns)
+                index.record_write(path)
+        return len(preimages)
+
+    def commit(self) -> List[str]:
+        """
+        Keep the task's changes.
+
+        Returns:
+            Absolute paths of the files the task changed
+        """
+        with self._lock:
+            preimages, self._preimages = self._preimages, {}
+        return sorted(preimages)
+
+
+@contextmanager
+def activate(snapshot: Optional[TaskSnapshot]) -> Iterator[Optional[TaskSnapshot]]:
+    """Make ``snapshot`` capture writes in the current context (None disables capturing)."""
+    token = _current.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _current.reset(token)
+
+
+def current() -> Optional[TaskSnapshot]:
+    """Snapshot of the running task, if any."""
+    return _current.get()
+
+
+def preserve(file_path: str) -> None:
+    """Capture ``file_path`` in the running task's snapshot (no-op outside tasks)."""
+    snapshot = _current.get()
+    if snapshot is not None:
+        snapshot.preserve(file_path)
@@ -1,6 +1,6 @@
 """Models package initialization."""
 
-from coding_agent_plugin.models.db_models import Base, Project, ProjectFile, ProjectVersion, UserSettings
+from coding_agent_plugin.models.db_models import Base, Project, ProjectFile, ProjectVersion, UserSettings, LLMUsage
 from coding_agent_plugin.models.database import init_db, get_db_session, get_db, engine
 
 __all__ = [
@@ -9,6 +9,7 @@ __all__ = [
     "ProjectFile",
     "ProjectVersion",
     "UserSettings",
+    "LLMUsage",
     "init_db",
     "get_db_session",
     "get_db",
@@ -1,12 +1,14 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import sessionmaker
 from pathlib import Path
 from contextlib import contextmanager
-import os
+from typing import Optional
 
+from coding_agent_plugin.core import config
 from coding_agent_plugin.models.db_models import Base
 
 
@@ -14,24 +16,190 @@ from coding_agent_plugin.models.db_models import Base
 AGENTIC_HOME = Path.home() / ".agentic-coder"
 DATABASE_PATH = AGENTIC_HOME / "data.db"
 
-# Ensure directory exists
-AGENTIC_HOME.mkdir(parents=True, exist_ok=True)
+# Async drivers (as used by core/database.py) and their sync counterparts
+SYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql",
+    "postgresql+psycopg_async": "postgresql+psycopg",
+    "mysql+aiomysql": "mysql+pymysql",
+    "mysql+asyncmy": "mysql+pymysql",
+}
+
+# Sync drivers and the async ones used by the repository layer
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+psycopg_async",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def _sync_url(url: str) -> str:
+    """Map an async database URL onto the equivalent sync driver."""
+    parsed = make_url(url)
+    driver = SYNC_DRIVERS.get(parsed.drivername)
+    if driver:
+        parsed = parsed.set(drivername=driver)
+    return parsed.render_as_string(hide_password=False)
+
+
+def _async_url(url: str) -> str:
+    """Map a sync database URL onto the equivalent async driver."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver:
+        parsed = parsed.set(drivername=driver)
+    return parsed.render_as_string(hide_password=False)
+
+
+def _configure_sqlite(dbapi_connection, connection_record) -> None:
+    """WAL journal, relaxed fsync and a busy timeout for every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(config.DATABASE_BUSY_TIMEOUT * 1000)}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str) -> Engine:
+    """
+    Create the engine for the sync models layer.
+
+    SQLite files get a pool of connections (one per concurrently active
+    thread, up to DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW), each opened
+    in WAL mode with ``synchronous=NORMAL`` and a busy timeout, so readers
+    never block the writer and concurrent writers (other threads or CLI
+    processes) wait for the lock instead of failing with ``database is
+    locked``. Other databases get a pre-pinged connection pool.
+
+    Args:
+        url: SQLAlchemy database URL (async drivers are mapped to sync ones)
+
+    Returns:
+        Engine
+    """
+    url = make_url(_sync_url(url))
+
+    if url.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            echo=config.DATABASE_ECHO,
+            pool_pre_ping=True,
+            pool_size=config.DATABASE_POOL_SIZE,
+            max_overflow=config.DATABASE_MAX_OVERFLOW,
+        )
+
+    if url.database and url.database != ":memory:":
+        Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+
+    engine = create_engine(
+        url,
+        echo=config.DATABASE_ECHO,
+        connect_args={
+            "check_same_thread": False,  # Pooled connections move between threads
+            "timeout": config.DATABASE_BUSY_TIMEOUT,
+            "cached_statements": config.DATABASE_STATEMENT_CACHE_SIZE,
+        },
+        pool_size=config.DATABASE_POOL_SIZE,
+        max_overflow=config.DATABASE_MAX_OVERFLOW,
+    )
+
+    event.listen(engine, "connect", _configure_sqlite)
+    return engine
+
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    """
+    Create the async engine used by ``WorkspaceRepository``.
+
+    Same schema, pooling and SQLite settings as ``create_db_engine``, on an
+    async driver (aiosqlite, asyncpg).
+
+    Args:
+        url: SQLAlchemy database URL (sync drivers are mapped to async ones)
+
+    Returns:
+        AsyncEngine
+    """
+    url = make_url(_async_url(url))
+
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(
+            url,
+            echo=config.DATABASE_ECHO,
+            pool_pre_ping=True,
+            pool_size=config.DATABASE_POOL_SIZE,
+            max_overflow=config.DATABASE_MAX_OVERFLOW,
+        )
+
+    if url.database and url.database != ":memory:":
+        Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+
+    engine = create_async_engine(
+        url,
+        echo=config.DATABASE_ECHO,
+        connect_args={
+            "timeout": config.DATABASE_BUSY_TIMEOUT,
+            "cached_statements": config.DATABASE_STATEMENT_CACHE_SIZE,
+        },
+        pool_size=config.DATABASE_POOL_SIZE,
+        max_overflow=config.DATABASE_MAX_OVERFLOW,
+    )
+    event.listen(engine.sync_engine, "connect", _configure_sqlite)
+    return engine
+
+
+def workspace_database_url(url: Optional[str] = None, package_url: Optional[str] = None) -> str:
+    """
+    Resolve the workspace database URL.
+
+    Args:
+        url: Configured URL (default: AGENTIC_DATABASE_URL)
+        package_url: URL of the package API (default: DATABASE_URL)
+
+    Returns:
+        Sync SQLAlchemy URL (default: SQLite at ~/.agentic-coder/data.db)
+
+    Raises:
+        ValueError: If both layers would share one database
+    """
+    url = config.AGENTIC_DATABASE_URL if url is None else url
+    package_url = config.DATABASE_URL if package_url is None else package_url
+    if not url:
+        return f"sqlite:///{DATABASE_PATH}"
+    url = _sync_url(url)
+    if package_url and url == _sync_url(package_url):
+        raise ValueError(
+            "AGENTIC_DATABASE_URL must differ from DATABASE_URL: "
+            "the workspace and the package API define different 'projects' tables"
+        )
+    return url
+
+
+DATABASE_URL = workspace_database_url()
 
 # Create engine
-engine = create_engine(
-    f"sqlite:///{DATABASE_PATH}",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-    echo=False
-)
+engine = create_db_engine(DATABASE_URL)
+
+# Create session factory (every session checks out its own pooled connection)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 
-# Create session factory
-SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+_initialized = False
 
 
-def init_db():
-    """Initialize database tables."""
+def init_db(force: bool = False):
+    """Initialize database tables (only once per process unless forced)."""
+    global _initialized
+    if _initialized and not force:
+        return
     Base.metadata.create_all(bind=engine)
+    _initialized = True
 
 
 @contextmanager
@@ -1,6 +1,6 @@
 """SQLAlchemy database models for agentic-coder."""
 
-from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Boolean, Text, DateTime, JSON, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -69,3 +69,24 @@ class UserSettings(Base):
     
     key = Column(String, primary_key=True)
     value = Column(Text, nullable=False)
+
+
+class LLMUsage(Base):
+    """One LLM call: tokens, latency and what it was made for."""
+    
+    __tablename__ = "llm_usage"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    project_id = Column(String, index=True)
+    run_id = Column(String, index=True)
+    task_id = Column(String)
+    agent = Column(String, nullable=False)
+    model = Column(String)
+    input_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    cached_tokens = Column(Integer, default=0)
+    latency = Column(Float, default=0.0)
+    cost = Column(Float)
+    cached = Column(Boolean, default=False)
+    error = Column(Text)
+    created_at = Column(DateTime, default=func.now())
@@ -0,0 +1,422 @@
+"""Workspace repository: async access to projects, files, versions and settings."""
+
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Coroutine, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import case, delete, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from ..models.database import DATABASE_URL, create_async_db_engine
+from ..models.db_models import Base, LLMUsage, Project, ProjectFile, ProjectVersion, UserSettings
+
+T = TypeVar("T")
+
+# Columns ``usage_summary`` can group by
+USAGE_GROUPS = ("project_id", "run_id", "task_id", "agent", "model")
+
+# Rows per statement when upserting files (stays below SQLite's bound-parameter limit)
+FILE_BATCH_SIZE = 500
+
+
+def _on_db_loop(method):
+    """Run a repository coroutine on the repository's own event loop."""
+
+    @functools.wraps(method)
+    async def wrapper(self: "WorkspaceRepository", *args, **kwargs):
+        coro = method(self, *args, **kwargs)
+        if self._loop is not None and asyncio.get_running_loop() is self._loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    return wrapper
+
+
+class WorkspaceRepository:
+    """
+    Async data access for the ``models/db_models.py`` schema.
+
+    The repository owns an async engine (aiosqlite for the default SQLite
+    file, asyncpg when AGENTIC_DATABASE_URL points at Postgres) that lives on a
+    dedicated event loop thread. Every public coroutine is executed there,
+    so callers on any loop - agents running concurrent LLM calls, pytest's
+    per-test loops - never block on the database and never share
+    connections across loops. Sync callers (the CLI) use ``run_sync``.
+    """
+
+    def __init__(self, url: str = DATABASE_URL):
+        """
+        Initialize repository (the engine and loop start on first use).
+
+        Args:
+            url: Database URL; sync drivers are mapped to async ones
+        """
+        self.url = url
+        self._engine: Optional[AsyncEngine] = None
+        self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self._schema_ready = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # Event loop
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the repository loop."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="agentic-db", daemon=True)
+                self._thread.start()
+                self._loop = loop
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run_sync(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the repository loop and wait for its result."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run_sync() cannot be called from the repository loop; await the coroutine instead")
+        return self.submit(coro).result()
+
+    def close(self) -> None:
+        """Dispose the engine and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        if self._engine is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._engine.dispose(), loop).result(timeout=5)
+            except Exception:
+                pass
+            self._engine = None
+            self._session_factory = None
+            self._schema_ready = False
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+    @_on_db_loop
+    async def setup(self) -> None:
+        """Create the schema if it does not exist yet."""
+        async with self._session():
+            pass
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """Transactional session: committed on success, rolled back on error."""
+        if self._engine is None:
+            self._engine = create_async_db_engine(self.url)
+            self._session_factory = async_sessionmaker(self._engine, expire_on_commit=False, autoflush=False)
+        if not self._schema_ready:
+            async with self._engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            self._schema_ready = True
+        async with self._session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    # Projects
+
+    @staticmethod
+    def _project_query(name_or_id: str):
+        # A project named like another project's ID wins over the ID match
+        return (
+            select(Project)
+            .where(or_(Project.name == name_or_id, Project.id == name_or_id))
+            .order_by(Project.name != name_or_id)
+            .limit(1)
+        )
+
+    @_on_db_loop
+    async def create_project(
+        self,
+        project_id: str,
+        name: str,
+        storage_path: str,
+        description: Optional[str] = None,
+        project_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Insert a project.
+
+        Raises:
+            ValueError: If a project with the name already exists
+        """
+        try:
+            async with self._session() as session:
+                if await session.scalar(select(Project.id).where(Project.name == name)):
+                    raise ValueError(f"Project '{name}' already exists")
+                project = Project(
+                    id=project_id,
+                    name=name,
+                    description=description,
+                    storage_path=storage_path,
+                    project_metadata=project_metadata or {},
+                )
+                session.add(project)
+                await session.flush()
+                await session.refresh(project)
+                return project.to_dict()
+        except IntegrityError:
+            raise ValueError(f"Project '{name}' already exists") from None
+
+    @_on_db_loop
+    async def get_project(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        """Project by name or ID."""
+        async with self._session() as session:
+            project = await session.scalar(self._project_query(name_or_id))
+            return project.to_dict() if project else None
+
+    @_on_db_loop
+    async def list_projects(self) -> List[Dict[str, Any]]:
+        """All projects, newest first."""
+        async with self._session() as session:
+            projects = await session.scalars(select(Project).order_by(Project.created_at.desc()))
+            return [p.to_dict() for p in projects]
+
+    @_on_db_loop
+    async def update_project(
+        self,
+        name_or_id: str,
+        description: Optional[str] = None,
+        project_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Set the description and/or merge metadata keys; None if not found."""
+        async with self._session() as session:
+            project = await session.scalar(self._project_query(name_or_id))
+            if not project:
+                return None
+            if description is not None:
+                project.description = description
+            if project_metadata:
+                project.project_metadata = {**(project.project_metadata or {}), **project_metadata}
+            await session.flush()
+            await session.refresh(project)
+            return project.to_dict()
+
+    @_on_db_loop
+    async def delete_project(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        """Delete a project with its file, version and usage rows; returns the deleted record."""
+        async with self._session() as session:
+            project = await session.scalar(self._project_query(name_or_id))
+            if not project:
+                return None
+            record = project.to_dict()
+            await session.execute(delete(ProjectFile).where(ProjectFile.project_id == project.id))
+            await session.execute(delete(ProjectVersion).where(ProjectVersion.project_id == project.id))
+            await session.execute(delete(LLMUsage).where(LLMUsage.project_id == project.id))
+            await session.delete(project)
+            return record
+
+    # Files
+
+    @_on_db_loop
+    async def upsert_files(self, project_id: str, files: Iterable[Tuple[str, str, int]]) -> int:
+        """
+        Record files of a project in one transaction.
+
+        Args:
+            project_id: Project ID
+            files: ``(file_path, content_hash, size_bytes)`` tuples
+
+        Returns:
+            Number of files recorded
+        """
+        files = list({path: (path, content_hash, size) for path, content_hash, size in files}.values())
+        async with self._session() as session:
+            for start in range(0, len(files), FILE_BATCH_SIZE):
+                batch = files[start:start + FILE_BATCH_SIZE]
+                existing = {
+                    row.file_path: row
+                    for row in await session.scalars(
+                        select(ProjectFile).where(
+                            ProjectFile.project_id == project_id,
+                            ProjectFile.file_path.in_([path for path, _, _ in batch]),
+                        )
+                    )
+                }
+                for path, content_hash, size in batch:
+                    row = existing.get(path)
+                    if row is None:
+                        session.add(ProjectFile(
+                            project_id=project_id, file_path=path, content_hash=content_hash, size_bytes=size
+                        ))
+                    else:
+                        row.content_hash = content_hash
+                        row.size_bytes = size
+        return len(files)
+
+    async def upsert_file(self, project_id: str, file_path: str, content_hash: str, size_bytes: int) -> None:
+        """Record one file of a project."""
+        await self.upsert_files(project_id, [(file_path, content_hash, size_bytes)])
+
+    @_on_db_loop
+    async def delete_file(self, project_id: str, file_path: str) -> bool:
+        """Forget a file; True if it was recorded."""
+        async with self._session() as session:
+            result = await session.execute(
+                delete(ProjectFile).where(ProjectFile.project_id == project_id, ProjectFile.file_path == file_path)
+            )
+            return result.rowcount > 0
+
+    @_on_db_loop
+    async def list_file_records(self, project_id: str) -> List[Dict[str, Any]]:
+        """Recorded files of a project with their hash and size."""
+        async with self._session() as session:
+            rows = await session.scalars(
+                select(ProjectFile).where(ProjectFile.project_id == project_id).order_by(ProjectFile.file_path)
+            )
+            return [
+                {"file_path": row.file_path, "content_hash": row.content_hash, "size_bytes": row.size_bytes}
+                for row in rows
+            ]
+
+    # Versions
+
+    @_on_db_loop
+    async def add_version(self, project_id: str, description: Optional[str] = None,
+                          changes: Optional[Dict[str, Any]] = None) -> int:
+        """Append a project version; returns its number (starting at 1)."""
+        async with self._session() as session:
+            latest = await session.scalar(
+                select(func.max(ProjectVersion.version)).where(ProjectVersion.project_id == project_id)
+            )
+            version = (latest or 0) + 1
+            session.add(ProjectVersion(project_id=project_id, version=version, description=description, changes=changes))
+            return version
+
+    @_on_db_loop
+    async def get_version(self, project_id: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """A version of a project (the latest when ``version`` is omitted)."""
+        async with self._session() as session:
+            query = select(ProjectVersion).where(ProjectVersion.project_id == project_id)
+            if version is None:
+                query = query.order_by(ProjectVersion.version.desc())
+            else:
+                query = query.where(ProjectVersion.version == version)
+            row = await session.scalar(query.limit(1))
+            return self._version_dict(row) if row else None
+
+    @_on_db_loop
+    async def list_versions(self, project_id: str) -> List[Dict[str, Any]]:
+        """Versions of a project, oldest first."""
+        async with self._session() as session:
+            rows = await session.scalars(
+                select(ProjectVersion).where(ProjectVersion.project_id == project_id).order_by(ProjectVersion.version)
+            )
+            return [self._version_dict(row) for row in rows]
+
+    @staticmethod
+    def _version_dict(row: ProjectVersion) -> Dict[str, Any]:
+        return {
+            "version": row.version,
+            "description": row.description,
+            "changes": row.changes,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }
+
+    # LLM usage
+
+    @_on_db_loop
+    async def add_llm_usage(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Record LLM calls in one statement.
+
+        Args:
+            records: Dictionaries with ``LLMUsage`` column values
+
+        Returns:
+            Number of calls recorded
+        """
+        records = list(records)
+        if records:
+            async with self._session() as session:
+                await session.execute(insert(LLMUsage), records)
+        return len(records)
+
+    @_on_db_loop
+    async def usage_summary(self, project_id: Optional[str] = None,
+                            group_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Aggregate recorded LLM calls.
+
+        Args:
+            project_id: Only calls made for this project
+            group_by: One of ``USAGE_GROUPS``; omitted for a single total row
+
+        Returns:
+            Rows with call count, token sums, total latency, cost (None when
+            no call was priced), cache hits and errors (plus the ``group_by``
+            key), largest token consumers first
+        """
+        if group_by is not None and group_by not in USAGE_GROUPS:
+            raise ValueError(f"Cannot group usage by '{group_by}'")
+        tokens = func.coalesce(func.sum(LLMUsage.input_tokens), 0) + func.coalesce(func.sum(LLMUsage.output_tokens), 0)
+        columns = [
+            func.count(LLMUsage.id).label("calls"),
+            func.coalesce(func.sum(LLMUsage.input_tokens), 0).label("input_tokens"),
+            func.coalesce(func.sum(LLMUsage.output_tokens), 0).label("output_tokens"),
+            func.coalesce(func.sum(LLMUsage.cached_tokens), 0).label("cached_tokens"),
+            func.coalesce(func.sum(LLMUsage.latency), 0.0).label("latency"),
+            func.sum(LLMUsage.cost).label("cost"),
+            func.coalesce(func.sum(case((LLMUsage.cached.is_(True), 1), else_=0)), 0).label("cache_hits"),
+            func.coalesce(func.sum(case((LLMUsage.error.is_not(None), 1), else_=0)), 0).label("errors"),
+        ]
+        key = getattr(LLMUsage, group_by) if group_by else None
+        query = select(*([key.label(group_by)] if key is not None else []), *columns)
+        if project_id is not None:
+            query = query.where(LLMUsage.project_id == project_id)
+        if key is not None:
+            query = query.group_by(key).order_by(tokens.desc())
+        async with self._session() as session:
+            rows = (await session.execute(query)).mappings().all()
+            return [dict(row) for row in rows]
+
+    # Settings
+
+    @_on_db_loop
+    async def get_setting(self, key: str) -> Optional[str]:
+        """Value of a user setting."""
+        async with self._session() as session:
+            return await session.scalar(select(UserSettings.value).where(UserSettings.key == key))
+
+    @_on_db_loop
+    async def set_setting(self, key: str, value: str) -> None:
+        """Create or update a user setting."""
+        async with self._session() as session:
+            await session.merge(UserSettings(key=key, value=value))
+
+
+_repository: Optional[WorkspaceRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_workspace_repository() -> WorkspaceRepository:
+    """
+    Get the process-wide workspace repository.
+
+    Returns:
+        Shared WorkspaceRepository instance
+    """
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = WorkspaceRepository()
+        return _repository
+
+
+@atexit.register
+def _close_repository() -> None:
+    if _repository is not None:
+        _repository.close()
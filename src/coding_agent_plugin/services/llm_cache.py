@@ -0,0 +1,286 @@
+"""Content-addressed cache for LLM responses."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+from ..core import config
+
+
+class CacheBackend(ABC):
+    """Storage backend for serialized LLM responses."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored value, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting least recently used entries if needed."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Return entry count, total size and hit/miss counters."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU backend, mostly useful for tests and short-lived runs."""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024, ttl: float = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.time() - entry[1] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.time())
+            self._size += len(value)
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._size -= len(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """On-disk LRU backend stored in a single SQLite file."""
+
+    def __init__(self, path: str, max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024, ttl: float = 0):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS llm_cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _count(self, name: str) -> None:
+        self._conn.execute(
+            "INSERT INTO llm_cache_stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self._count("misses")
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._count("hits")
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, now),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        if self.ttl:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        for key, entry_size in self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY accessed_at"
+        ).fetchall():
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            count -= 1
+            size -= entry_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.execute("DELETE FROM llm_cache_stats")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM llm_cache_stats").fetchall())
+        return {
+            "entries": count,
+            "size_bytes": size,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
+
+
+class LLMResponseCache:
+    """Caches chat model responses keyed by a hash of the full request."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    @staticmethod
+    def make_key(
+        model: str, temperature: Any, messages: Sequence[BaseMessage], base_url: Optional[str] = None
+    ) -> str:
+        """Hash (provider endpoint, model, temperature, messages) into a cache key."""
+        payload = json.dumps(
+            {
+                "base_url": base_url,
+                "model": model,
+                "temperature": temperature,
+                "messages": [[message.type, message.content] for message in messages],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def key_for(self, func: Callable, args: Sequence[Any]) -> Optional[str]:
+        """
+        Build the cache key for a ``chat_model.ainvoke(messages)`` call.
+
+        Returns None for any other kind of operation, which is then never cached.
+        """
+        owner = getattr(func, "__self__", None)
+        model = getattr(owner, "model_name", None)
+        if getattr(func, "__name__", None) != "ainvoke" or not isinstance(model, str) or not args:
+            return None
+        messages = args[0]
+        if not isinstance(messages, (list, tuple)) or not all(isinstance(m, BaseMessage) for m in messages):
+            return None
+        base_url = getattr(owner, "openai_api_base", None)
+        return self.make_key(
+            model,
+            getattr(owner, "temperature", None),
+            messages,
+            base_url if isinstance(base_url, str) else None,
+        )
+
+    def get(self, key: str) -> Optional[BaseMessage]:
+        """Return the cached response message, if any."""
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        return messages_from_dict([json.loads(value)])[0]
+
+    def set(self, key: str, response: Any) -> None:
+        """Store a response message (other return types are ignored)."""
+        if isinstance(response, BaseMessage):
+            self.backend.set(key, json.dumps(message_to_dict(response)))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self.backend.stats()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache(force: bool = False) -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide response cache.
+
+    Args:
+        force: Return the cache even when LLM_CACHE_ENABLED is off
+
+    Returns:
+        LLMResponseCache, or None when caching is disabled
+    """
+    global _cache
+    if not (config.LLM_CACHE_ENABLED or force):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            if config.LLM_CACHE_BACKEND == "memory":
+                backend: CacheBackend = MemoryCacheBackend(
+                    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                    max_bytes=config.LLM_CACHE_MAX_BYTES,
+                    ttl=config.LLM_CACHE_TTL,
+                )
+            else:
+                backend = SQLiteCacheBackend(
+                    config.LLM_CACHE_PATH,
+                    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                    max_bytes=config.LLM_CACHE_MAX_BYTES,
+                    ttl=config.LLM_CACHE_TTL,
+                )
+            _cache = LLMResponseCache(backend)
+        return _cache
@@ -0,0 +1,178 @@
+"""Process-wide registry of pooled LLM clients."""
+
+import asyncio
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from ..core import config
+from .rate_limiter import capture_rate_limit_headers
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """Async transport keeping one keep-alive connection pool per event loop.
+
+    Pooled connections cannot be shared between event loops, and the CLI may
+    run several loops over the lifetime of the process. Routing each request
+    to the pool of the running loop lets a single ``httpx.AsyncClient`` be
+    shared safely by every agent.
+    """
+
+    def __init__(self, limits: httpx.Limits):
+        self._limits = limits
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(limits=self._limits)
+            self._transports[loop] = transport
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._get_transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    def close_all(self) -> None:
+        """Close the pools of every loop, from any thread.
+
+        Pools of running loops are closed on their own loop without waiting;
+        pools of idle or closed loops are closed here.
+        """
+        transports = list(self._transports.items())
+        self._transports = weakref.WeakKeyDictionary()
+        for loop, transport in transports:
+            _close_on_loop(loop, transport.aclose())
+
+
+def _close_on_loop(loop: asyncio.AbstractEventLoop, coro) -> None:
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    try:
+        if loop is running:
+            loop.create_task(coro)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(coro, loop)
+        elif not loop.is_closed():
+            loop.run_until_complete(coro)
+        else:
+            asyncio.run(coro)
+    except Exception:
+        coro.close()
+
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_chat_models: Dict[Tuple[str, Optional[str], Optional[str], float], ChatOpenAI] = {}
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(config.LLM_TIMEOUT, connect=5.0)
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared synchronous HTTP client."""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=_limits(), timeout=_timeout())
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared asynchronous HTTP client."""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None:
+            _async_http_client = httpx.AsyncClient(
+                transport=_LoopLocalTransport(_limits()),
+                timeout=_timeout(),
+                event_hooks={"response": [capture_rate_limit_headers]},
+            )
+        return _async_http_client
+
+
+def get_chat_model(
+    temperature: float = 0.2,
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> ChatOpenAI:
+    """
+    Get a shared ChatOpenAI instance.
+
+    Instances are keyed by (model, base_url, api_key, temperature) and all of
+    them use the shared HTTP clients, so agents reuse warm connections instead
+    of each opening their own pool.
+
+    Args:
+        temperature: Sampling temperature
+        model: Model name (defaults to LLM_MODEL, then gpt-4o)
+        base_url: Custom OpenAI-compatible endpoint (defaults to LLM_BASE_URL)
+        api_key: API key (defaults to LLM_API_KEY)
+
+    Returns:
+        ChatOpenAI instance
+    """
+    model = model or config.LLM_MODEL or "gpt-4o"
+    base_url = base_url or config.LLM_BASE_URL
+    api_key = api_key or config.LLM_API_KEY
+    key = (model, base_url, api_key, temperature)
+
+    with _lock:
+        chat_model = _chat_models.get(key)
+        if chat_model is not None:
+            return chat_model
+
+    # Set up ChatOpenAI with custom base_url and api_key if using NVIDIA or other providers
+    kwargs = {
+        "model": model,
+        "temperature": temperature,
+        "http_client": get_http_client(),
+        "http_async_client": get_async_http_client(),
+        # Streamed completions report token usage in their last chunk
+        "stream_usage": True,
+    }
+    if api_key:
+        kwargs["api_key"] = api_key
+    if base_url:
+        kwargs["base_url"] = base_url
+
+    with _lock:
+        return _chat_models.setdefault(key, ChatOpenAI(**kwargs))
+
+
+def reset_llm_clients() -> None:
+    """Drop all cached models and close the HTTP clients (e.g. after changing configuration)."""
+    global _http_client, _async_http_client
+    with _lock:
+        _chat_models.clear()
+        http_client, async_http_client = _http_client, _async_http_client
+        _http_client = None
+        _async_http_client = None
+    if http_client is not None:
+        http_client.close()
+    if async_http_client is not None:
+        # AsyncClient.aclose() only closes the pool of the calling loop
+        async_http_client._transport.close_all()
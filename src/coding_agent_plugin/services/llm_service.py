@@ -1,9 +1,14 @@
 """Service for handling LLM calls."""
 
+from contextlib import nullcontext
 from httpx._models import Response
 from typing import Any
+import time
 import httpx
 from ..core.config import LLM_API_KEY, LLM_BASE_URL, LLM_MODEL
+from ..core.events import LLMCall, get_event_bus
+from .llm_clients import get_async_http_client
+from .rate_limiter import estimate_tokens, get_rate_limiter
 
 
 class LLMService:
@@ -34,13 +39,30 @@ class LLMService:
             "model": self.model,
             "prompt": prompt,
         }
-        async with httpx.AsyncClient() as client:
+        bus = get_event_bus()
+        started = time.perf_counter()
+        # Shared keep-alive pool: no new connection/TLS handshake per call
+        client: httpx.AsyncClient = get_async_http_client()
+        limiter = get_rate_limiter(self.url, self.model)
+        async with limiter.slot(estimate_tokens([prompt])) if limiter else nullcontext() as slot:
             response: Response = await client.post(self.url, headers=headers, json=data)
             _ = response.raise_for_status()
             result = response.json()
             # Example token count (adjust based on your LLM response format)
-            tokens_used = result.get("usage", {}).get("total_tokens", 0)
-            return {
-                "response": result,
-                "tokens_used": tokens_used,
-            }
+            usage = result.get("usage") or {}
+            tokens_used = usage.get("total_tokens", 0)
+            if slot is not None and tokens_used:
+                slot.used_tokens = tokens_used
+        if bus.wants(LLMCall):
+            bus.publish(LLMCall(
+                agent="llm_service",
+                latency=time.perf_counter() - started,
+                model=self.model,
+                input_tokens=usage.get("prompt_tokens"),
+                output_tokens=usage.get("completion_tokens"),
+                cached_tokens=(usage.get("prompt_tokens_details") or {}).get("cached_tokens"),
+            ))
+        return {
+            "response": result,
+            "tokens_used": tokens_used,
+        }
@@ -19,6 +19,7 @@ class PromptService:
                     "phase": "scaffold|coding|verification",
                     "description": "Task description",
                     "agent": "task|coding|execution",
+                    "depends_on": [],
                     "details": {{
                         "action": "create_dirs", 
                         "paths": ["dir1"],
@@ -30,6 +31,7 @@ class PromptService:
             ]
         }}
         Ensure the plan is detailed and covers scaffolding, coding, and verification.
+        Use "depends_on" to list the ids of earlier tasks whose files a task imports or needs.
         IMPORTANT: Return ONLY the JSON object. Do not include any markdown formatting or explanation.
         """
 
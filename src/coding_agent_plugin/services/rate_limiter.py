@@ -0,0 +1,347 @@
+"""Shared, adaptive rate limiting for LLM calls."""
+
+import asyncio
+import collections
+import contextvars
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Mapping, Optional, Tuple
+
+from ..core import config
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds in an ``x-ratelimit-reset-*`` value such as ``"6m0s"``, ``"20ms"`` or ``"1.5"``."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    return sum(float(number) * _UNITS[unit] for number, unit in parts) if parts else None
+
+
+class TokenBucket:
+    """
+    Per-minute budget refilled continuously (the model providers use).
+
+    A limit of 0 means unknown: the bucket never delays until a limit is
+    learned. Consumption may drive the level negative (a call used more
+    tokens than estimated); later callers then wait for the debt to refill.
+    """
+
+    def __init__(self, per_minute: float = 0):
+        self.per_minute = 0.0
+        self.level = 0.0
+        self.updated = time.monotonic()
+        self.set_limit(per_minute)
+
+    def set_limit(self, per_minute: float) -> None:
+        """Change the per-minute limit, keeping the level within the new capacity."""
+        if per_minute > 0 and self.per_minute <= 0:
+            self.level = per_minute
+        self.per_minute = float(per_minute)
+        if self.per_minute > 0:
+            self.level = min(self.level, self.per_minute)
+
+    def _refill(self, now: float) -> None:
+        if self.per_minute > 0:
+            self.level = min(self.per_minute, self.level + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` (at most a full bucket) is available."""
+        if self.per_minute <= 0:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.per_minute) - self.level
+        return max(0.0, missing * 60 / self.per_minute)
+
+    def take(self, amount: float, now: float) -> None:
+        if self.per_minute > 0:
+            self._refill(now)
+            self.level -= amount
+
+    def sync(self, remaining: float, now: float) -> None:
+        """Adopt the provider's view of the remaining budget if it is lower."""
+        if self.per_minute > 0:
+            self._refill(now)
+            self.level = min(self.level, remaining)
+
+
+@dataclass
+class _Waiter:
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    tokens: float
+    project: str
+
+
+@dataclass
+class Slot:
+    """Permission for one call; report what happened through its attributes."""
+
+    limiter: "AdaptiveRateLimiter"
+    tokens: float
+    headers: Optional[Mapping[str, str]] = None
+    used_tokens: Optional[int] = None
+
+
+_current_slot: contextvars.ContextVar[Optional[Slot]] = contextvars.ContextVar("llm_slot", default=None)
+
+
+class AdaptiveRateLimiter:
+    """
+    Request, token and concurrency governor for one provider and model.
+
+    - Requests per minute and tokens per minute are token buckets, sized
+      from LLM_RATE_LIMIT_RPM / LLM_RATE_LIMIT_TPM and then learned from the
+      ``x-ratelimit-limit-*`` / ``x-ratelimit-remaining-*`` headers of every
+      response.
+    - Concurrency follows AIMD: the window grows by ``1/window`` per
+      successful call made while it was full and halves on a rate-limit
+      response, when all callers also pause for ``retry-after``. Throughput
+      converges on the provider ceiling instead of every caller backing
+      off and stampeding in lockstep.
+    - Waiting callers are queued per project and served round-robin, so one
+      large run cannot starve the others.
+
+    One limiter is shared by every agent and event loop of the process
+    (see ``get_rate_limiter``).
+    """
+
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        concurrency: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            rpm: Requests per minute (default: LLM_RATE_LIMIT_RPM, 0 = learn from headers)
+            tpm: Tokens per minute (default: LLM_RATE_LIMIT_TPM, 0 = learn from headers)
+            concurrency: Initial concurrency window (default: LLM_CONCURRENCY_INITIAL)
+            max_concurrency: Window ceiling (default: LLM_CONCURRENCY_MAX)
+        """
+        self.requests = TokenBucket(config.LLM_RATE_LIMIT_RPM if rpm is None else rpm)
+        self.tokens = TokenBucket(config.LLM_RATE_LIMIT_TPM if tpm is None else tpm)
+        self.max_concurrency = max_concurrency or config.LLM_CONCURRENCY_MAX
+        self.window = float(min(concurrency or config.LLM_CONCURRENCY_INITIAL, self.max_concurrency))
+        self.active = 0
+        self.paused_until = 0.0
+        self.rate_limited = 0
+        self._queues: Dict[str, Deque[_Waiter]] = {}
+        self._order: Deque[str] = collections.deque()
+        self._wakeup: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        """Callers queued for a slot."""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    @asynccontextmanager
+    async def slot(self, tokens: float = 0, project: Optional[str] = None) -> AsyncIterator[Slot]:
+        """
+        Wait for permission to make one call.
+
+        Args:
+            tokens: Estimated tokens the call consumes (prompt plus completion)
+            project: Fairness key (default: the current run's project)
+
+        Yields:
+            Slot; set ``used_tokens`` to correct the estimate. Response
+            headers are captured automatically from the shared HTTP client.
+        """
+        from ..core.events import current_project_id
+
+        await self._acquire(tokens, project or current_project_id() or "")
+        slot = Slot(self, tokens)
+        token = _current_slot.set(slot)
+        rate_limited = False
+        try:
+            yield slot
+        except Exception as e:
+            rate_limited = _is_rate_limit(e)
+            raise
+        finally:
+            _current_slot.reset(token)
+            self._release(slot, rate_limited)
+
+    async def _acquire(self, tokens: float, project: str) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop, loop.create_future(), tokens, project)
+        with self._lock:
+            if project not in self._queues:
+                self._queues[project] = collections.deque()
+                self._order.append(project)
+            self._queues[project].append(waiter)
+            delay = self._dispatch()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), timeout=delay)
+                    return
+                except asyncio.TimeoutError:
+                    with self._lock:
+                        delay = self._dispatch()
+        except BaseException:
+            with self._lock:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self.active -= 1  # Granted while being cancelled: give the slot back
+                    self._schedule(self._dispatch())
+                else:
+                    waiter.future.cancel()
+            raise
+
+    def _dispatch(self) -> Optional[float]:
+        """Grant queued callers while capacity allows; returns seconds until the next grant is possible."""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        while self._order and self.active < max(1, int(self.window)):
+            project = self._order[0]
+            queue = self._queues[project]
+            while queue and queue[0].future.done():
+                queue.popleft()  # Cancelled
+            if not queue:
+                del self._queues[project]
+                self._order.popleft()
+                continue
+            waiter = queue[0]
+            delay = max(self.requests.delay(1, now), self.tokens.delay(waiter.tokens, now))
+            if delay > 0:
+                return delay
+            queue.popleft()
+            self._order.rotate(-1)
+            self.requests.take(1, now)
+            self.tokens.take(waiter.tokens, now)
+            self.active += 1
+            waiter.loop.call_soon_threadsafe(_grant, waiter.future)
+        return None
+
+    def _release(self, slot: Slot, rate_limited: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            was_full = self.active >= int(self.window)
+            self.active -= 1
+            if slot.used_tokens is not None:
+                self.tokens.take(slot.used_tokens - slot.tokens, now)
+            retry_after = self._learn(slot.headers or {}, now)
+            if rate_limited:
+                self.rate_limited += 1
+                self.window = max(1.0, self.window / 2)
+                pause = retry_after if retry_after is not None else config.AGENT_RETRY_DELAY
+                self.paused_until = max(self.paused_until, now + pause)
+            elif was_full:
+                self.window = min(float(self.max_concurrency), self.window + 1 / self.window)
+            self._schedule(self._dispatch())
+
+    def _schedule(self, delay: Optional[float]) -> None:
+        """
+        Dispatch again after ``delay`` (call with the lock held).
+
+        Callers that queued while the window was full wait without a
+        timeout, so a release that hits a pause or an empty bucket must
+        leave a timer behind or they would never be granted.
+        """
+        if delay is None:
+            return
+        due = time.monotonic() + delay
+        if self._wakeup is not None and self._wakeup <= due:
+            return
+        loops = {waiter.loop for queue in self._queues.values() for waiter in queue if not waiter.future.done()}
+        if not loops:
+            return
+        self._wakeup = due
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(loop.call_later, delay, self._wake)
+            except RuntimeError:
+                pass  # Loop closed; its waiters are gone
+
+    def _wake(self) -> None:
+        with self._lock:
+            self._wakeup = None
+            self._schedule(self._dispatch())
+
+    def _learn(self, headers: Mapping[str, str], now: float) -> Optional[float]:
+        """Update the buckets from rate-limit headers; returns the server's retry-after, if any."""
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            limit = _number(headers.get(f"x-ratelimit-limit-{kind}"))
+            if limit:
+                bucket.set_limit(limit)
+            remaining = _number(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if remaining is not None:
+                bucket.sync(remaining, now)
+                reset = parse_reset(headers.get(f"x-ratelimit-reset-{kind}"))
+                if remaining <= 0 and reset:
+                    self.paused_until = max(self.paused_until, now + reset)
+        return _number(headers.get("retry-after"))
+
+
+def _grant(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _is_rate_limit(error: BaseException) -> bool:
+    if getattr(error, "status_code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+async def capture_rate_limit_headers(response) -> None:
+    """httpx response hook: hand response headers to the slot of the call that made the request."""
+    slot = _current_slot.get()
+    if slot is not None:
+        slot.headers = response.headers
+
+
+def estimate_tokens(messages) -> int:
+    """Rough token estimate of a chat request (4 characters per token plus the completion allowance)."""
+    chars = 0
+    for message in messages if isinstance(messages, (list, tuple)) else ():
+        content = getattr(message, "content", message)
+        chars += len(content) if isinstance(content, str) else len(str(content))
+    return chars // 4 + config.LLM_RATE_LIMIT_COMPLETION_TOKENS
+
+
+_limiters: Dict[Tuple[Optional[str], Optional[str]], AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(base_url: Optional[str] = None, model: Optional[str] = None) -> Optional[AdaptiveRateLimiter]:
+    """
+    Get the shared limiter of a provider and model.
+
+    Returns:
+        AdaptiveRateLimiter, or None when LLM_RATE_LIMIT_ENABLED is off
+    """
+    if not config.LLM_RATE_LIMIT_ENABLED:
+        return None
+    key = (base_url, model)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = AdaptiveRateLimiter()
+        return limiter
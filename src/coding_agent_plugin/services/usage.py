@@ -0,0 +1,140 @@
+"""Token, latency and cost accounting for LLM calls."""
+
+import atexit
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core import config
+from ..core.events import LLMCall, RunFinished, get_event_bus
+
+
+def parse_pricing(spec: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse LLM_PRICING.
+
+    Args:
+        spec: ``"model=input/output,..."`` in USD per million tokens
+
+    Returns:
+        Mapping of model name to (input price, output price)
+    """
+    prices = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, price = item.partition("=")
+        input_price, _, output_price = price.partition("/")
+        try:
+            prices[model.strip()] = (float(input_price), float(output_price or input_price))
+        except ValueError:
+            continue
+    return prices
+
+
+def estimate_cost(model: Optional[str], input_tokens: Optional[int], output_tokens: Optional[int],
+                  prices: Optional[Dict[str, Tuple[float, float]]] = None) -> Optional[float]:
+    """Cost of a call in USD, or None if the model has no price."""
+    prices = parse_pricing(config.LLM_PRICING) if prices is None else prices
+    price = prices.get(model or "")
+    if price is None:
+        return None
+    return ((input_tokens or 0) * price[0] + (output_tokens or 0) * price[1]) / 1_000_000
+
+
+class UsageRecorder:
+    """
+    Persists ``llm_call`` events to the ``llm_usage`` table.
+
+    Calls are buffered and written in one statement per batch
+    (LLM_USAGE_BATCH_SIZE), at the end of every run and at exit. Writes are
+    submitted to the repository's own loop, so recording never blocks the
+    agents; a failed write is reported and dropped.
+    """
+
+    def __init__(self, repository=None, batch_size: Optional[int] = None):
+        """
+        Initialize recorder.
+
+        Args:
+            repository: WorkspaceRepository (default: shared repository)
+            batch_size: Calls buffered before a write (default: LLM_USAGE_BATCH_SIZE)
+        """
+        from ..repositories.workspace import get_workspace_repository
+
+        self.repository = repository or get_workspace_repository()
+        self.batch_size = batch_size or config.LLM_USAGE_BATCH_SIZE
+        self.prices = parse_pricing(config.LLM_PRICING)
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event) -> None:
+        if isinstance(event, LLMCall):
+            row = {
+                "project_id": event.project_id if isinstance(event.project_id, str) else None,
+                "run_id": event.run_id,
+                "task_id": event.task_id,
+                "agent": event.agent,
+                "model": event.model,
+                "input_tokens": event.input_tokens or 0,
+                "output_tokens": event.output_tokens or 0,
+                "cached_tokens": event.cached_tokens or 0,
+                "latency": event.latency,
+                # Cache hits cost nothing
+                "cost": None if event.cached else estimate_cost(
+                    event.model, event.input_tokens, event.output_tokens, self.prices
+                ),
+                "cached": event.cached,
+                "error": event.error,
+            }
+            with self._lock:
+                self._buffer.append(row)
+                full = len(self._buffer) >= self.batch_size
+            if full:
+                self.flush()
+        elif isinstance(event, RunFinished):
+            self.flush()
+
+    def flush(self, wait: bool = False) -> None:
+        """Write buffered calls (and wait for the write when ``wait`` is set)."""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return
+        write = self.repository.add_llm_usage(rows)
+        try:
+            future = self.repository.submit(write)
+        except RuntimeError as e:  # No thread for the repository loop at interpreter shutdown
+            write.close()
+            print(f"Warning: Failed to record LLM usage: {e}")
+            return
+        future.add_done_callback(_report_failure)
+        if wait:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+
+def _report_failure(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Warning: Failed to record LLM usage: {future.exception()}")
+
+
+_recorder: Optional[UsageRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def enable_usage_tracking() -> Optional[UsageRecorder]:
+    """
+    Subscribe the shared UsageRecorder to the event bus (once per process).
+
+    Returns:
+        The recorder, or None when LLM_USAGE_TRACKING is off
+    """
+    global _recorder
+    if not config.LLM_USAGE_TRACKING:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = UsageRecorder()
+            get_event_bus().subscribe(_recorder, types=(LLMCall, RunFinished))
+            atexit.register(_recorder.flush, wait=True)
+        return _recorder
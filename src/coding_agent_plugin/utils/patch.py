@@ -0,0 +1,248 @@
+"""Apply model-generated edits (search/replace blocks or unified diffs) to file content."""
+
+import ast
+import difflib
+import json
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+class PatchError(Exception):
+    """Raised when a patch cannot be parsed, applied or validated."""
+    pass
+
+
+@dataclass
+class Edit:
+    """Replace ``search`` with ``replace``; ``line_hint`` is the expected 0-based start line."""
+
+    search: str
+    replace: str
+    line_hint: Optional[int] = None
+
+
+# Minimum similarity for a fuzzy match of a search block
+FUZZY_THRESHOLD = 0.85
+
+SEARCH_REPLACE_PATTERN = re.compile(
+    r"^<{5,9} ?SEARCH[^\n]*\n(.*?)^={5,9}[ \t]*\n(.*?)^>{5,9} ?REPLACE[^\n]*$",
+    re.DOTALL | re.MULTILINE,
+)
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,\d+)? \+\d+(?:,\d+)? @@")
+
+
+def parse_search_replace(text: str) -> List[Edit]:
+    """
+    Parse search/replace blocks::
+
+        <<<<<<< SEARCH
+        old lines
+        =======
+        new lines
+        >>>>>>> REPLACE
+    """
+    return [Edit(search, replace) for search, replace in SEARCH_REPLACE_PATTERN.findall(text)]
+
+
+def parse_unified_diff(text: str) -> List[Edit]:
+    """Parse the hunks of a unified diff into edits (file headers are ignored)."""
+    edits = []
+    old_lines: List[str] = []
+    new_lines: List[str] = []
+    line_hint = None
+    in_hunk = False
+
+    def flush():
+        if in_hunk and (old_lines or new_lines):
+            edits.append(Edit("".join(old_lines), "".join(new_lines), line_hint))
+
+    for line in text.splitlines(keepends=True):
+        header = HUNK_HEADER_PATTERN.match(line)
+        if header or line.startswith("@@"):
+            flush()
+            old_lines, new_lines = [], []
+            line_hint = int(header.group(1)) - 1 if header else None
+            in_hunk = True
+        elif line.startswith(("--- ", "+++ ", "diff ", "index ")) and not (old_lines or new_lines):
+            continue
+        elif not in_hunk:
+            continue
+        elif line.startswith("\\"):
+            continue  # "\ No newline at end of file"
+        elif line.startswith("-"):
+            old_lines.append(line[1:])
+        elif line.startswith("+"):
+            new_lines.append(line[1:])
+        elif line.startswith(" ") or line in ("\n", "\r\n"):
+            context = line[1:] if line.startswith(" ") else line
+            old_lines.append(context)
+            new_lines.append(context)
+        elif line.startswith("```"):
+            continue
+        else:
+            flush()
+            old_lines, new_lines = [], []
+            in_hunk = False
+    flush()
+    return edits
+
+
+def parse_patch(text: str) -> List[Edit]:
+    """
+    Parse a model response into edits, detecting the format.
+
+    Raises:
+        PatchError: If the response contains no edits
+    """
+    edits = parse_search_replace(text)
+    if not edits:
+        edits = parse_unified_diff(text)
+    if not edits:
+        raise PatchError("No search/replace blocks or diff hunks found")
+    return edits
+
+
+def apply_patch(content: str, patch_text: str) -> str:
+    """
+    Apply a search/replace or unified-diff patch to ``content``.
+
+    Raises:
+        PatchError: If the patch is malformed or a hunk cannot be located
+    """
+    return apply_edits(content, parse_patch(patch_text))
+
+
+def apply_edits(content: str, edits: List[Edit]) -> str:
+    """
+    Apply edits in order.
+
+    Each search block is located by exact match first, then ignoring
+    indentation and trailing whitespace, then by fuzzy similarity. When a
+    block matches several places the one closest to the hint (or to the
+    previous edit) wins. An empty search block appends to the file.
+
+    Raises:
+        PatchError: If a search block cannot be located
+    """
+    lines = content.splitlines(keepends=True)
+    cursor = 0
+    for number, edit in enumerate(edits, 1):
+        search = edit.search.splitlines(keepends=True)
+        replace = edit.replace.splitlines(keepends=True)
+
+        if not any(line.strip() for line in search):
+            if lines and not lines[-1].endswith("\n"):
+                lines[-1] += "\n"
+            lines.extend(replace)
+            continue
+
+        hint = edit.line_hint if edit.line_hint is not None else cursor
+        match = _locate(lines, search, hint)
+        if match is None:
+            preview = edit.search.strip().splitlines()[0][:80]
+            raise PatchError(f"Edit {number}: could not locate '{preview}'")
+        start, end = match
+
+        replacement = _reindent(search, lines[start:end], replace)
+        if replacement and end == len(lines) and lines and not lines[-1].endswith("\n"):
+            replacement[-1] = replacement[-1].rstrip("\n")
+        elif replacement and end < len(lines) and not replacement[-1].endswith("\n"):
+            replacement[-1] += "\n"
+        lines[start:end] = replacement
+        cursor = start + len(replacement)
+    return "".join(lines)
+
+
+def _locate(lines: List[str], search: List[str], hint: int) -> Optional[Tuple[int, int]]:
+    """Find the line range matching ``search``, preferring positions near ``hint``."""
+    # Leading/trailing blank lines in the search block are not significant
+    while search and not search[0].strip():
+        search = search[1:]
+    while search and not search[-1].strip():
+        search = search[:-1]
+    size = len(search)
+    if size > len(lines):
+        return None
+
+    def closest(starts: List[int]) -> Optional[Tuple[int, int]]:
+        if not starts:
+            return None
+        start = min(starts, key=lambda s: (abs(s - hint), s))
+        return start, start + size
+
+    exact = [s.rstrip("\r\n") for s in search]
+    stripped = [s.strip() for s in search]
+    exact_starts = []
+    loose_starts = []
+    for start in range(len(lines) - size + 1):
+        window = lines[start:start + size]
+        if [w.rstrip("\r\n") for w in window] == exact:
+            exact_starts.append(start)
+        elif [w.strip() for w in window] == stripped:
+            loose_starts.append(start)
+
+    match = closest(exact_starts) or closest(loose_starts)
+    if match:
+        return match
+
+    # Fuzzy: most similar window of the same length
+    target = "".join(stripped)
+    best_ratio, best_starts = 0.0, []
+    for start in range(len(lines) - size + 1):
+        candidate = "".join(w.strip() for w in lines[start:start + size])
+        matcher = difflib.SequenceMatcher(None, target, candidate, autojunk=False)
+        if matcher.real_quick_ratio() < FUZZY_THRESHOLD or matcher.quick_ratio() < FUZZY_THRESHOLD:
+            continue
+        ratio = matcher.ratio()
+        if ratio > best_ratio:
+            best_ratio, best_starts = ratio, [start]
+        elif ratio == best_ratio:
+            best_starts.append(start)
+    if best_ratio >= FUZZY_THRESHOLD:
+        return closest(best_starts)
+    return None
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _reindent(search: List[str], matched: List[str], replace: List[str]) -> List[str]:
+    """Shift the replacement by the indentation difference between search block and file."""
+    search_first = next((line for line in search if line.strip()), None)
+    matched_first = next((line for line in matched if line.strip()), None)
+    if search_first is None or matched_first is None:
+        return list(replace)
+    old_indent, new_indent = _indent(search_first), _indent(matched_first)
+    if old_indent == new_indent:
+        return list(replace)
+
+    result = []
+    for line in replace:
+        if not line.strip():
+            result.append(line)
+        elif line.startswith(old_indent):
+            result.append(new_indent + line[len(old_indent):])
+        else:
+            result.append(line)
+    return result
+
+
+def validate_content(file_path: str, content: str) -> None:
+    """
+    Check that patched content still parses, for file types we can check locally.
+
+    Raises:
+        PatchError: If the content is not valid
+    """
+    if file_path.endswith(".py"):
+        try:
+            ast.parse(content)
+        except SyntaxError as e:
+            raise PatchError(f"Patched file is not valid Python: {e.msg} (line {e.lineno})") from e
+    elif file_path.endswith(".json"):
+        try:
+            json.loads(content)
+        except json.JSONDecodeError as e:
+            raise PatchError(f"Patched file is not valid JSON: {e}") from e
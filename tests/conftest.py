@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_usage_tracking(monkeypatch):
+    """Keep agents built by tests from recording LLM usage in the user's database."""
+    monkeypatch.setattr("coding_agent_plugin.core.config.LLM_USAGE_TRACKING", False)
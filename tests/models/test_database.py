@@ -0,0 +1,70 @@
+"""Tests for the sync database engine configuration."""
+
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+import pytest
+
+from coding_agent_plugin.models.database import DATABASE_PATH, _sync_url, create_db_engine, workspace_database_url
+from coding_agent_plugin.models.db_models import Base, Project, ProjectFile
+
+
+def test_sqlite_engine_uses_wal_and_a_connection_pool(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'nested' / 'data.db'}")
+
+    with engine.connect() as conn:
+        pragmas = [conn.execute(text(f"PRAGMA {name}")).scalar() for name in ("journal_mode", "synchronous", "busy_timeout")]
+
+    assert isinstance(engine.pool, QueuePool)
+    assert pragmas[0] == "wal"
+    assert pragmas[1] == 1  # NORMAL
+    assert pragmas[2] > 0
+    engine.dispose()
+
+
+def test_concurrent_writers_do_not_fail(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'data.db'}")
+    Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine)
+    with sessions() as session:
+        session.add(Project(id="p", name="p", storage_path=str(tmp_path)))
+        session.commit()
+
+    errors = []
+
+    def write(worker):
+        for i in range(25):
+            try:
+                with sessions() as session:
+                    session.add(ProjectFile(project_id="p", file_path=f"{worker}/{i}.py"))
+                    session.commit()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with sessions() as session:
+        assert session.query(ProjectFile).count() == 200
+    engine.dispose()
+
+
+def test_async_urls_map_to_sync_drivers():
+    assert _sync_url("postgresql+asyncpg://user:secret@db:5432/agent") == "postgresql://user:secret@db:5432/agent"
+    assert _sync_url("sqlite+aiosqlite:////tmp/data.db") == "sqlite:////tmp/data.db"
+    assert _sync_url("postgresql://db/agent") == "postgresql://db/agent"
+
+
+def test_workspace_url_is_separate_from_package_url():
+    package = "postgresql+asyncpg://db/agent"
+    assert workspace_database_url("", package) == f"sqlite:///{DATABASE_PATH}"
+    assert workspace_database_url("sqlite+aiosqlite:////tmp/ws.db", package) == "sqlite:////tmp/ws.db"
+    with pytest.raises(ValueError, match="AGENTIC_DATABASE_URL"):
+        workspace_database_url("postgresql://db/agent", package)
@@ -0,0 +1,99 @@
+"""Tests for the async workspace repository."""
+
+import asyncio
+import threading
+
+import pytest
+
+from coding_agent_plugin.repositories.workspace import WorkspaceRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repository = WorkspaceRepository(f"sqlite:///{tmp_path / 'data.db'}")
+    yield repository
+    repository.close()
+
+
+async def test_projects_crud(repo):
+    created = await repo.create_project("p1", "demo", "/tmp/p1", "first")
+    assert created["storage_path"] == "/tmp/p1"
+    with pytest.raises(ValueError, match="already exists"):
+        await repo.create_project("p2", "demo", "/tmp/p2")
+
+    assert (await repo.get_project("demo"))["id"] == "p1"
+    assert (await repo.get_project("p1"))["name"] == "demo"
+    assert await repo.get_project("missing") is None
+
+    updated = await repo.update_project("demo", project_metadata={"stack": "fastapi"})
+    assert updated["description"] == "first" and updated["project_metadata"] == {"stack": "fastapi"}
+    assert [p["id"] for p in await repo.list_projects()] == ["p1"]
+
+    assert (await repo.delete_project("demo"))["id"] == "p1"
+    assert await repo.delete_project("demo") is None
+
+
+async def test_files_versions_and_settings(repo):
+    await repo.create_project("p1", "demo", "/tmp/p1")
+
+    assert await repo.upsert_files("p1", [("a.py", "h1", 1), ("b.py", "h2", 2), ("a.py", "h3", 3)]) == 2
+    await repo.upsert_file("p1", "b.py", "h4", 4)
+    assert await repo.list_file_records("p1") == [
+        {"file_path": "a.py", "content_hash": "h3", "size_bytes": 3},
+        {"file_path": "b.py", "content_hash": "h4", "size_bytes": 4},
+    ]
+    assert await repo.delete_file("p1", "a.py")
+    assert not await repo.delete_file("p1", "a.py")
+
+    assert await repo.add_version("p1", "init", {"files": ["b.py"]}) == 1
+    assert await repo.add_version("p1", "second") == 2
+    assert [v["version"] for v in await repo.list_versions("p1")] == [1, 2]
+
+    assert await repo.get_setting("current_project") is None
+    await repo.set_setting("current_project", "demo")
+    await repo.set_setting("current_project", "other")
+    assert await repo.get_setting("current_project") == "other"
+
+    await repo.delete_project("p1")
+    assert await repo.list_file_records("p1") == []
+    assert await repo.list_versions("p1") == []
+
+
+def test_queries_run_on_the_repository_loop(repo):
+    seen = []
+
+    async def probe():
+        seen.append(threading.current_thread().name)
+        return await repo.get_setting("missing")
+
+    assert repo.run_sync(probe()) is None
+    assert seen == ["agentic-db"]
+
+    # Coroutines on other loops (here: a fresh one) are served by the same engine
+    assert asyncio.run(repo.get_setting("missing")) is None
+
+    async def nested():
+        return repo.run_sync(repo.get_setting("missing"))
+
+    with pytest.raises(RuntimeError):
+        repo.run_sync(nested())
+
+
+async def test_llm_usage_summary(repo):
+    await repo.add_llm_usage([
+        {"project_id": "p1", "run_id": "r1", "task_id": "1", "agent": "planning", "model": "m",
+         "input_tokens": 100, "output_tokens": 50, "cached_tokens": 20, "latency": 1.5, "cost": 0.01},
+        {"project_id": "p1", "run_id": "r1", "task_id": "1", "agent": "coding", "model": "m",
+         "input_tokens": 300, "output_tokens": 200, "latency": 2.0, "cached": True},
+        {"project_id": "p2", "agent": "coding", "input_tokens": 10, "latency": 0.5, "error": "rate limited"},
+    ])
+
+    total = (await repo.usage_summary("p1"))[0]
+    assert (total["calls"], total["input_tokens"], total["output_tokens"], total["cached_tokens"]) == (2, 400, 250, 20)
+    assert total["latency"] == 3.5 and total["cost"] == 0.01 and total["cache_hits"] == 1
+
+    by_agent = await repo.usage_summary(group_by="agent")
+    assert [(row["agent"], row["calls"], row["errors"]) for row in by_agent] == [("coding", 2, 1), ("planning", 1, 0)]
+    assert (await repo.usage_summary("missing"))[0]["calls"] == 0
+    with pytest.raises(ValueError):
+        await repo.usage_summary(group_by="prompt")
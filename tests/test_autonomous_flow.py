@@ -7,13 +7,11 @@ from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
 async def test_autonomous_flow():
     project_id = "auto_project_456"
     
-    # Mock ChatOpenAI
-    with patch("coding_agent_plugin.agents.planning.ChatOpenAI") as MockPlanningLLM, \
-         patch("coding_agent_plugin.agents.coding.ChatOpenAI") as MockCodingLLM, \
-         patch("coding_agent_plugin.agents.error.ChatOpenAI") as MockErrorLLM:
+    # Mock the shared chat models; each agent gets its own mock below
+    with patch("coding_agent_plugin.services.llm_clients.get_chat_model"):
         
         # Setup mocks
-        mock_planning_instance = MockPlanningLLM.return_value
+        mock_planning_instance = MagicMock()
         
         # Mock the LLM response for PlanningAgent to return JSON string
         import json
@@ -50,7 +48,7 @@ async def test_autonomous_flow():
         future_planning.set_result(MagicMock(content=json.dumps(mock_plan)))
         mock_planning_instance.ainvoke.return_value = future_planning
         
-        mock_coding_instance = MockCodingLLM.return_value
+        mock_coding_instance = MagicMock()
         future_coding = asyncio.Future()
         future_coding.set_result(MagicMock(content="print('Hello Autonomous World')"))
         mock_coding_instance.ainvoke.return_value = future_coding
@@ -59,6 +57,8 @@ async def test_autonomous_flow():
         # We don't need to patch create_agent anymore since we removed it in favor of direct LLM call
         
         orchestrator = OrchestratorAgent()
+        orchestrator.agents["planning"].model = mock_planning_instance
+        orchestrator.agents["coding"].model = mock_coding_instance
 
         # Clean up previous run
         if os.path.exists(f"projects/{project_id}"):
@@ -0,0 +1,124 @@
+"""Tests for the blob store and project snapshots."""
+
+import hashlib
+import os
+import uuid
+
+import pytest
+
+from coding_agent_plugin.managers import blob_store, get_project_manager
+from coding_agent_plugin.managers.blob_store import BlobStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "objects"))
+    monkeypatch.setattr(blob_store, "_store", store)
+    return store
+
+
+def blobs(store):
+    return sorted(p.parent.name + p.name for p in store.root.glob("??/*"))
+
+
+def test_blobs_are_content_addressed_and_deduplicated(store, tmp_path):
+    data = b"print('hello')\n" * 1000
+    (tmp_path / "a.py").write_bytes(data)
+
+    digest = store.put_bytes(data)
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert store.path(digest) == store.root / digest[:2] / digest[2:]
+    assert store.put_file(str(tmp_path / "a.py")) == (digest, len(data))
+    assert blobs(store) == [digest]
+    assert store.path(digest).stat().st_size < len(data)  # compressed
+
+    store.write_to(digest, str(tmp_path / "out" / "b.py"), mode=0o755)
+    assert (tmp_path / "out" / "b.py").read_bytes() == data
+    assert os.stat(tmp_path / "out" / "b.py").st_mode & 0o777 == 0o755
+
+
+def test_zlib_fallback_blobs_stay_readable(store, monkeypatch):
+    monkeypatch.setattr(blob_store, "zstandard", None)
+    digest = store.put_bytes(b"\x00\xffbinary" * 50)
+    assert store.get_bytes(digest) == b"\x00\xffbinary" * 50
+
+
+def test_corrupt_blob_is_detected(store, tmp_path):
+    digest = store.put_bytes(b"original")
+    other = store.put_bytes(b"tampered")
+    os.replace(store.path(other), store.path(digest))
+
+    with pytest.raises(ValueError, match="corrupt"):
+        store.write_to(digest, str(tmp_path / "f.txt"))
+    assert not (tmp_path / "f.txt").exists()
+
+
+def test_snapshot_restore_and_template(store):
+    pm = get_project_manager()
+    project = pm.create_project(f"snapshot-test-{uuid.uuid4().hex[:8]}")
+    copy = None
+    root = project["storage_path"]
+    try:
+        os.makedirs(os.path.join(root, "app"))
+        with open(os.path.join(root, "app", "main.py"), "w") as f:
+            f.write("v1\n")
+        with open(os.path.join(root, "logo.png"), "wb") as f:
+            f.write(b"\x89PNG\x00" * 10)
+        os.makedirs(os.path.join(root, "node_modules", "x"))
+        with open(os.path.join(root, "node_modules", "x", "index.js"), "w") as f:
+            f.write("ignored")
+
+        assert pm.snapshot_project(project["id"], "first") == {
+            "version": 1, "file_count": 2, "added": 2, "modified": 0, "deleted": 0,
+        }
+        assert len(blobs(store)) == 2
+
+        with open(os.path.join(root, "app", "main.py"), "w") as f:
+            f.write("v2 is longer\n")
+        with open(os.path.join(root, "app", "extra.py"), "w") as f:
+            f.write("x = 1\n")
+        second = pm.snapshot_project(project["id"], "second")
+        assert (second["added"], second["modified"], second["deleted"]) == (1, 1, 0)
+        assert len(blobs(store)) == 4
+        assert [v["version"] for v in pm.list_versions(project["id"])] == [1, 2]
+
+        assert pm.restore_project(project["id"], 1) == {"restored": 1, "deleted": 1, "unchanged": 1}
+        with open(os.path.join(root, "app", "main.py")) as f:
+            assert f.read() == "v1\n"
+        assert not os.path.exists(os.path.join(root, "app", "extra.py"))
+        assert os.path.exists(os.path.join(root, "node_modules", "x", "index.js"))
+        assert pm.restore_project(project["id"], 9) is None
+
+        copy = pm.create_project(f"snapshot-copy-{uuid.uuid4().hex[:8]}", template=project["name"])
+        with open(os.path.join(copy["storage_path"], "logo.png"), "rb") as f:
+            assert f.read() == b"\x89PNG\x00" * 10
+        assert pm.list_versions(copy["id"])[0]["file_count"] == 2
+        assert len(blobs(store)) == 4  # The copy shares the template's blobs
+    finally:
+        pm.delete_project(project["id"])
+        if copy:
+            pm.delete_project(copy["id"])
+
+
+def test_in_place_edits_are_snapshotted_and_rolled_back(store, tmp_path):
+    tmp_path = tmp_path / "project"
+    tmp_path.mkdir()
+    path = tmp_path / "app.py"
+    path.write_text("v1\n")
+    (tmp_path / ".agentic").mkdir()
+    settled = 1_000_000_000_000_000_000  # Outside the FileIndex's racy window
+    os.utime(tmp_path, ns=(settled, settled))
+    first = blob_store.snapshot_directory(str(tmp_path), store)
+
+    def edit(text):
+        # Same directory mtime: the FileIndex does not rescan it
+        path.write_text(text)
+        os.utime(tmp_path, ns=(settled, settled))
+
+    edit("v2\n")
+    second = blob_store.snapshot_directory(str(tmp_path), store, previous=first)
+    assert store.get_bytes(second["app.py"]["hash"]) == b"v2\n"
+
+    edit("broken\n")
+    assert blob_store.restore_directory(str(tmp_path), store, second) == {"restored": 1, "deleted": 0, "unchanged": 0}
+    assert path.read_text() == "v2\n"
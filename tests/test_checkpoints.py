@@ -0,0 +1,75 @@
+"""Tests for resumable run checkpoints."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from coding_agent_plugin.managers import CheckpointManager
+
+
+PLAN = {
+    "architecture": {"app": ["a.py", "b.py"]},
+    "tasks": [
+        {"id": 1, "phase": "coding", "agent": "coding", "description": "Create a",
+         "details": {"file_path": "a.py"}},
+        {"id": 2, "phase": "coding", "agent": "coding", "description": "Create b",
+         "details": {"file_path": "b.py"}},
+    ],
+}
+
+
+def test_checkpoint_records_and_validates_outputs(tmp_path):
+    """Completed tasks stay valid only while their output file is unchanged."""
+    (tmp_path / "a.py").write_text("print('a')")
+    (tmp_path / "b.py").write_text("print('b')")
+
+    checkpoint = CheckpointManager(str(tmp_path))
+    checkpoint.start("build it", PLAN)
+    checkpoint.record("1", str(tmp_path / "a.py"))
+    checkpoint.record("2", "b.py")
+
+    reloaded = CheckpointManager(str(tmp_path))
+    state = reloaded.load()
+    assert state["plan_hash"] == CheckpointManager.plan_hash(PLAN)
+    assert state["completed"]["1"]["file_path"] == "a.py"
+    assert set(reloaded.completed_tasks()) == {"1", "2"}
+
+    (tmp_path / "b.py").write_text("corrupted")
+    assert set(reloaded.completed_tasks()) == {"1"}
+
+    (tmp_path / "a.py").unlink()
+    assert reloaded.completed_tasks() == {}
+
+
+@pytest.mark.asyncio
+async def test_run_project_resume_skips_completed_tasks(tmp_path, monkeypatch):
+    """A resumed run replays the saved plan and only executes unfinished tasks."""
+    from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-dummy-key-for-testing")
+    (tmp_path / "a.py").write_text("print('a')")
+    checkpoint = CheckpointManager(str(tmp_path))
+    checkpoint.start("build it", PLAN)
+    checkpoint.record("1", "a.py")
+
+    with patch("coding_agent_plugin.managers.ProjectManager.aget_project", new_callable=AsyncMock) as mock_get_project:
+        mock_get_project.return_value = {"id": "p", "storage_path": str(tmp_path)}
+
+        orchestrator = OrchestratorAgent()
+        orchestrator.agents["planning"] = MagicMock(execute=AsyncMock())
+        orchestrator.agents["task"] = MagicMock(execute=AsyncMock(return_value={}))
+        orchestrator.agents["coding"] = MagicMock(execute=AsyncMock(
+            return_value={"file_path": str(tmp_path / "b.py")}
+        ))
+
+        result = await orchestrator.run_project("build it", "resume-test", resume=True)
+
+    orchestrator.agents["planning"].execute.assert_not_called()
+    coding_calls = orchestrator.agents["coding"].execute.call_args_list
+    assert [call.args[0]["file_path"] for call in coding_calls] == ["b.py"]
+    assert [r["status"] for r in result["results"]] == ["completed", "completed"]
+    assert result["results"][0]["result"] == {"resumed": True}
+
+    state = CheckpointManager(str(tmp_path)).load()
+    assert set(state["completed"]) == {"1", "2"}
+    assert state["status"] == "completed"
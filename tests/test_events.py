@@ -0,0 +1,104 @@
+"""Tests for the run event bus."""
+
+import asyncio
+import json
+import socket
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from coding_agent_plugin.agents.base_agent import BaseAgent
+from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
+from coding_agent_plugin.core import events
+from coding_agent_plugin.core.events import EventBus, FileWritten, LLMCall, RunStarted, TaskStarted
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(events, "_bus", bus)
+    return bus
+
+
+def test_emit_builds_nothing_without_subscribers():
+    class Exploding(events.Event):
+        def __init__(self, **fields):
+            raise AssertionError("event built without subscribers")
+
+    bus = EventBus()
+    assert not bus.active
+    bus.emit(Exploding, anything=1)
+
+    received = bus.subscribe(MagicMock())
+    bus.emit(TaskStarted, task_id="1", description="Create app", agent="coding")
+    event = received.call_args.args[0]
+    assert event.to_dict()["type"] == "task_started" and event.task_id == "1"
+
+    bus.unsubscribe(received)
+    assert not bus.active
+
+
+async def test_stream_yields_events_from_any_thread():
+    bus = EventBus()
+    async with bus.stream() as stream:
+        bus.emit(RunStarted, project_id="p", prompt="build")
+        thread = threading.Thread(target=bus.emit, args=(FileWritten,), kwargs={"project_path": "/p", "path": "a.py"})
+        thread.start()
+        thread.join()
+        first = await asyncio.wait_for(stream.__anext__(), 1)
+        second = await asyncio.wait_for(stream.__anext__(), 1)
+    assert [first.type, second.type] == ["run_started", "file_written"]
+    assert [e async for e in stream] == []
+    assert not bus.active
+
+
+def test_ndjson_sink_to_file_and_socket(tmp_path):
+    bus = EventBus()
+    path = tmp_path / "events.ndjson"
+    bus.add_sink(str(path))
+
+    server = socket.create_server(("127.0.0.1", 0))
+    bus.add_sink(f"tcp://127.0.0.1:{server.getsockname()[1]}")
+    conn, _ = server.accept()
+
+    bus.emit(LLMCall, agent="coding", latency=0.5, input_tokens=10, output_tokens=20)
+    line = json.loads(path.read_text().splitlines()[0])
+    assert line["type"] == "llm_call" and line["output_tokens"] == 20
+
+    received = conn.makefile("r").readline()
+    assert json.loads(received)["agent"] == "coding"
+    conn.close()
+    server.close()
+
+
+async def test_llm_calls_are_reported_with_usage(bus):
+    class Agent(BaseAgent):
+        async def execute(self, task):
+            return {}
+
+    agent = Agent("coding")
+    agent.model = MagicMock(model_name="gpt-test")
+    response = MagicMock(usage_metadata={"input_tokens": 12, "output_tokens": 34})
+    seen = bus.subscribe(MagicMock())
+
+    assert await agent.retry_operation(AsyncMock(return_value=response)) is response
+
+    event = seen.call_args.args[0]
+    assert isinstance(event, LLMCall)
+    assert (event.agent, event.model, event.input_tokens, event.output_tokens) == ("coding", "gpt-test", 12, 34)
+
+
+async def test_task_lifecycle_events(bus, tmp_path, monkeypatch):
+    monkeypatch.setattr("coding_agent_plugin.core.config.TASK_ROLLBACK", False)
+    orchestrator = OrchestratorAgent.__new__(OrchestratorAgent)
+    orchestrator.agents = {"task": AsyncMock(), "error": AsyncMock()}
+    orchestrator.send_to_agent = AsyncMock(side_effect=[RuntimeError("boom"), {"file_path": "app.py"}])
+    seen = []
+    bus.subscribe(seen.append)
+
+    outcome = await orchestrator._execute_task(1, {"description": "Create app"}, "p", str(tmp_path), "1")
+
+    assert outcome["status"] == "completed"
+    assert [e.type for e in seen] == ["task_started", "task_failed", "task_completed"]
+    assert seen[1].attempt == 1 and not seen[1].final
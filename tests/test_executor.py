@@ -0,0 +1,126 @@
+"""Tests for the sandboxed executor."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from coding_agent_plugin.agents.execution import ExecutionAgent
+from coding_agent_plugin.core.executor import SandboxExecutor
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="uses process groups, rlimits and /proc")
+
+
+async def test_streams_output_and_reports_exit_code(tmp_path):
+    executor = SandboxExecutor(max_concurrency=2, timeout=10)
+    chunks = []
+
+    result = await executor.run_shell("echo out; echo err >&2; exit 3", cwd=str(tmp_path),
+                                      on_output=lambda stream, text: chunks.append((stream, text)))
+
+    assert result.returncode == 3 and not result.ok
+    assert result.stdout == "out\n" and result.stderr == "err\n"
+    assert ("stdout", "out\n") in chunks and ("stderr", "err\n") in chunks
+    assert "Exit code: 3" in result.format()
+
+
+def assert_dead(pid):
+    """The process is gone or a zombie waiting to be reaped by init."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            state = f.read().rsplit(")", 1)[1].split()[0]
+    except FileNotFoundError:
+        return
+    assert state in ("Z", "X")
+
+
+async def test_timeout_kills_the_process_group(tmp_path):
+    executor = SandboxExecutor(timeout=10)
+    pid_file = tmp_path / "child.pid"
+
+    start = time.monotonic()
+    result = await executor.run_shell(f"sleep 30 & echo $! > {pid_file}; wait", timeout=0.5)
+
+    assert result.timed_out and time.monotonic() - start < 5
+    await asyncio.sleep(0.1)
+    assert_dead(int(pid_file.read_text()))
+
+
+async def test_output_is_capped(tmp_path):
+    executor = SandboxExecutor(max_output_bytes=1000)
+
+    result = await executor.run([sys.executable, "-c", "print('x' * 100000)"])
+
+    assert result.returncode == 0
+    assert len(result.stdout) == 1000 and result.truncated
+
+
+async def test_rlimits_are_applied():
+    executor = SandboxExecutor(max_open_files=32, cpu_seconds=5)
+    code = "import resource; print(resource.getrlimit(resource.RLIMIT_NOFILE)[0], resource.getrlimit(resource.RLIMIT_CPU)[0])"
+
+    result = await executor.run([sys.executable, "-c", code])
+
+    assert result.stdout.split() == ["32", "5"]
+
+
+async def test_memory_limit_is_soft_and_set_without_preexec_fn(monkeypatch):
+    spawn = asyncio.create_subprocess_exec
+    seen = {}
+
+    async def create_subprocess_exec(*args, **kwargs):
+        seen.update(kwargs)
+        return await spawn(*args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_subprocess_exec)
+    executor = SandboxExecutor(memory_bytes=1024 * 1024 * 1024)
+    code = "import resource; print(*resource.getrlimit(resource.RLIMIT_AS))"
+
+    result = await executor.run([sys.executable, "-c", code])
+
+    soft, hard = result.stdout.split()
+    assert int(soft) == 1024 * 1024 * 1024 and int(hard) != int(soft)
+    assert "preexec_fn" not in seen
+
+
+async def test_concurrency_cap():
+    executor = SandboxExecutor(max_concurrency=2)
+
+    start = time.monotonic()
+    results = await asyncio.gather(*(executor.run_shell("sleep 0.3") for _ in range(4)))
+
+    assert all(r.ok for r in results)
+    assert time.monotonic() - start >= 0.6
+
+
+async def test_cancellation_kills_the_process(tmp_path):
+    executor = SandboxExecutor()
+    pid_file = tmp_path / "pid"
+
+    task = asyncio.ensure_future(executor.run_shell(f"echo $$ > {pid_file}; exec sleep 30"))
+    while not pid_file.exists() or not pid_file.read_text().strip():
+        await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await asyncio.sleep(0.1)
+    assert_dead(int(pid_file.read_text()))
+
+
+async def test_missing_program_is_reported():
+    result = await SandboxExecutor().run(["definitely-not-a-program-xyz"])
+
+    assert result.returncode is None and "Failed to start" in result.stderr
+
+
+async def test_execution_agent_runs_through_executor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    agent = ExecutionAgent(name="execution")
+
+    result = await agent.execute({"project_id": "demo", "project_path": str(tmp_path), "command": "echo hello"})
+
+    assert "Stdout:\nhello\n" in result["output"]
+    assert "Exit code: 0" in result["output"]
@@ -0,0 +1,83 @@
+"""Tests for the incremental project file index."""
+
+import os
+
+from coding_agent_plugin.managers import file_index as file_index_module
+from coding_agent_plugin.managers.file_index import FileIndex
+
+
+def make_old(root):
+    """Push every mtime into the past so directories are not considered racy."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (1_000_000, 1_000_000))
+        os.utime(dirpath, (1_000_000, 1_000_000))
+
+
+def build(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("print('hi')")
+    (tmp_path / "app" / "__pycache__").mkdir()
+    (tmp_path / "app" / "__pycache__" / "main.pyc").write_bytes(b"x")
+    (tmp_path / ".env").write_text("A=1")
+    (tmp_path / "README.md").write_text("# demo")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref")
+    (tmp_path / ".agentic").mkdir()
+    (tmp_path / ".agentic" / "tasks.md").write_text("- [ ] x")
+
+
+def test_listing_and_stats(tmp_path):
+    """Hidden files are filtered on request; .git and .agentic are never indexed."""
+    build(tmp_path)
+    index = FileIndex(str(tmp_path))
+
+    assert index.list_files() == ["README.md", "app/main.py"]
+    assert index.list_files(include_hidden=True) == [".env", "README.md", "app/__pycache__/main.pyc", "app/main.py"]
+    assert index.stats() == {"file_count": 4, "total_size_bytes": 3 + 6 + 1 + 11}
+    assert (tmp_path / ".agentic" / FileIndex.FILENAME).exists()
+
+
+def test_reconcile_only_rescans_changed_directories(tmp_path, monkeypatch):
+    """External changes are found by directory mtime without walking the tree."""
+    build(tmp_path)
+    make_old(tmp_path)
+    index = FileIndex(str(tmp_path))
+    index.list_files()
+
+    scanned = []
+    original_scandir = os.scandir
+    monkeypatch.setattr(file_index_module.os, "scandir", lambda path: scanned.append(str(path)) or original_scandir(path))
+
+    assert index.list_files() == ["README.md", "app/main.py"]
+    assert scanned == []
+
+    (tmp_path / "app" / "models").mkdir()
+    (tmp_path / "app" / "models" / "user.py").write_text("class User: ...")
+    (tmp_path / "README.md").unlink()
+
+    assert index.list_files() == ["app/main.py", "app/models/user.py"]
+    assert sorted(os.path.relpath(p, tmp_path) for p in scanned) == [".", "app", "app/models"]
+    assert index.stats()["file_count"] == 4
+
+
+def test_record_write_and_persistence(tmp_path):
+    """Agent writes update sizes immediately and the index survives a restart."""
+    build(tmp_path)
+    index = FileIndex(str(tmp_path))
+    index.list_files()
+
+    (tmp_path / "app" / "main.py").write_text("print('hello world')")
+    index.record_write(str(tmp_path / "app" / "main.py"))
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "sub" / "mod.py").write_text("x = 1")
+    index.record_write("pkg/sub/mod.py")
+    (tmp_path / ".env").unlink()
+    index.record_delete(".env")
+
+    expected = {"file_count": 4, "total_size_bytes": 6 + 1 + 20 + 5}
+    assert index.stats() == expected
+
+    reloaded = FileIndex(str(tmp_path))
+    assert reloaded.list_files() == ["README.md", "app/main.py", "pkg/sub/mod.py"]
+    assert reloaded.stats() == expected
@@ -0,0 +1,71 @@
+"""Tests for path-scoped and debounced git commits."""
+
+import time
+
+import git
+
+from coding_agent_plugin.integrations.git_manager import CommitPipeline, GitManager
+
+
+def make_repo(tmp_path):
+    manager = GitManager(str(tmp_path))
+    assert manager.init_repo()
+    with manager.repo.config_writer() as cfg:
+        cfg.set_value("user", "name", "test")
+        cfg.set_value("user", "email", "test@example.com")
+    return manager
+
+
+def committed_files(repo):
+    return sorted(item.path for item in repo.head.commit.tree.traverse() if item.type == "blob")
+
+
+def test_commit_stages_only_given_paths(tmp_path):
+    manager = make_repo(tmp_path)
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    (tmp_path / "scratch.py").write_text("wip\n")
+    (tmp_path / "data.db").write_text("ignored\n")
+
+    assert manager.commit("add app", paths=[str(tmp_path / "app.py"), "data.db", "/elsewhere/x.py"])
+    assert committed_files(manager.repo) == ["app.py"]
+    assert "scratch.py" in manager.repo.untracked_files
+
+    (tmp_path / "app.py").unlink()
+    assert manager.commit("remove app", paths=["app.py"])
+    assert committed_files(manager.repo) == []
+
+    assert not manager.commit("nothing", paths=["data.db"])
+    assert len(list(manager.repo.iter_commits())) == 2
+
+
+def test_pipeline_coalesces_writes_into_one_commit(tmp_path):
+    manager = make_repo(tmp_path)
+    pipeline = CommitPipeline(manager, debounce=60)
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text(name)
+        pipeline.submit([name], f"Write {name}")
+
+    assert not manager.repo.head.is_valid()  # still within the debounce window
+    assert pipeline.flush(timeout=10)
+
+    commits = list(manager.repo.iter_commits())
+    assert len(commits) == 1 and pipeline.commits == 1
+    assert commits[0].message.startswith("Write a.py (+2 more)")
+    assert committed_files(manager.repo) == ["a.py", "b.py", "c.py"]
+    pipeline.close()
+
+
+def test_pipeline_commits_after_the_debounce_window(tmp_path):
+    manager = make_repo(tmp_path)
+    pipeline = manager.pipeline()
+    pipeline.debounce = 0.05
+    (tmp_path / "main.py").write_text("x = 1\n")
+    pipeline.submit(["main.py"], "Task 1: main")
+
+    deadline = time.monotonic() + 10
+    while pipeline.commits == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    repo = git.Repo(tmp_path)
+    assert repo.head.commit.message == "Task 1: main"
+    assert committed_files(repo) == ["main.py"]
+    pipeline.close()
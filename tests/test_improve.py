@@ -0,0 +1,43 @@
+"""Tests for the concurrent improve pipeline."""
+
+import asyncio
+from unittest.mock import patch
+
+from coding_agent_plugin.cli.main import _modify_files
+from coding_agent_plugin.context.project_context import ProjectContext
+
+
+def test_modify_files_runs_concurrently_in_one_loop(tmp_path, monkeypatch):
+    """Files are modified in parallel; failures are reported but not returned."""
+    for name in ["a.py", "b.py", "c.py", "broken.py"]:
+        (tmp_path / name).write_text(f"# {name}\n")
+    monkeypatch.chdir(tmp_path)
+    context = ProjectContext(str(tmp_path))
+    context.load_project()
+
+    running = 0
+    peak = 0
+    loops = set()
+    payloads = []
+
+    async def fake_execute(self, task):
+        nonlocal running, peak
+        loops.add(asyncio.get_running_loop())
+        payloads.append(task)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        if task["file_path"] == "broken.py":
+            raise RuntimeError("model error")
+        return {"file_path": task["file_path"]}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-dummy-key-for-testing")
+    with patch("coding_agent_plugin.agents.file_modifier.FileModifierAgent.execute", fake_execute):
+        changes = asyncio.run(_modify_files("add docstrings", context, ["a.py", "b.py", "c.py", "broken.py"]))
+
+    assert [c["file"] for c in changes] == ["a.py", "b.py", "c.py"]
+    assert peak == 4
+    assert len(loops) == 1
+    assert {p["project_path"] for p in payloads} == {str(tmp_path)}
+    assert payloads[0]["existing_content"] == "# a.py\n"
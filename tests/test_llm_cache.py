@@ -0,0 +1,92 @@
+"""Tests for the LLM response cache."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from coding_agent_plugin.agents.base_agent import BaseAgent
+from coding_agent_plugin.services.llm_cache import (
+    LLMResponseCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+)
+
+
+MESSAGES = [SystemMessage(content="You are a coder"), HumanMessage(content="Write hello world")]
+
+
+class FakeModel:
+    """Stand-in chat model exposing the attributes the cache keys on."""
+
+    model_name = "gpt-test"
+    temperature = 0.2
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=f"print('hello') # {self.calls}")
+
+
+class EchoAgent(BaseAgent):
+    async def execute(self, task):
+        return {}
+
+
+def test_make_key_depends_on_request():
+    """Keys change with the model, temperature and messages."""
+    key = LLMResponseCache.make_key("gpt-test", 0.2, MESSAGES)
+
+    assert key == LLMResponseCache.make_key("gpt-test", 0.2, list(MESSAGES))
+    assert key != LLMResponseCache.make_key("gpt-test", 0.7, MESSAGES)
+    assert key != LLMResponseCache.make_key("other", 0.2, MESSAGES)
+    assert key != LLMResponseCache.make_key("gpt-test", 0.2, MESSAGES[1:])
+    assert key != LLMResponseCache.make_key("gpt-test", 0.2, MESSAGES, "https://other.example/v1")
+
+
+def test_sqlite_backend_lru_ttl_and_counters(tmp_path):
+    """The on-disk backend evicts least recently used entries and expires old ones."""
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    assert backend.get("a") == "1"
+    backend.set("c", "3")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
+    assert backend.stats() == {"entries": 2, "size_bytes": 2, "hits": 3, "misses": 1}
+
+    backend.ttl = 60
+    with patch("coding_agent_plugin.services.llm_cache.time.time", return_value=time.time() + 120):
+        assert backend.get("a") is None
+
+
+def test_memory_backend_respects_byte_budget():
+    """The in-memory backend keeps its total size under max_bytes."""
+    backend = MemoryCacheBackend(max_bytes=10)
+    backend.set("a", "x" * 6)
+    backend.set("b", "y" * 6)
+
+    assert backend.get("a") is None
+    assert backend.get("b") == "y" * 6
+    assert backend.stats()["size_bytes"] == 6
+
+
+@pytest.mark.asyncio
+async def test_retry_operation_serves_repeated_calls_from_cache():
+    """A repeated model call is answered by the cache without reaching the model."""
+    cache = LLMResponseCache(MemoryCacheBackend())
+    model = FakeModel()
+    agent = EchoAgent("echo")
+
+    with patch("coding_agent_plugin.services.llm_cache.get_llm_cache", return_value=cache):
+        first = await agent.retry_operation(model.ainvoke, MESSAGES)
+        second = await agent.retry_operation(model.ainvoke, MESSAGES)
+
+    assert model.calls == 1
+    assert second.content == first.content
+    assert cache.stats()["hits"] == 1
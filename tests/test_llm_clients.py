@@ -0,0 +1,72 @@
+"""Tests for the shared LLM client registry."""
+
+import asyncio
+
+import httpx
+
+from coding_agent_plugin.services import llm_clients
+
+
+def test_get_chat_model_reuses_instances():
+    """Same configuration returns the same pooled client."""
+    llm_clients.reset_llm_clients()
+
+    first = llm_clients.get_chat_model(temperature=0.2, model="gpt-test", api_key="sk-test")
+    second = llm_clients.get_chat_model(temperature=0.2, model="gpt-test", api_key="sk-test")
+    other = llm_clients.get_chat_model(temperature=0.7, model="gpt-test", api_key="sk-test")
+
+    assert first is second
+    assert other is not first
+    assert first.http_async_client is other.http_async_client
+    assert first.http_client is llm_clients.get_http_client()
+
+
+def test_agents_share_one_model(monkeypatch):
+    """Agents built by the orchestrator share their ChatOpenAI instance."""
+    from coding_agent_plugin.agents.coding import CodingAgent
+    from coding_agent_plugin.agents.error import ErrorAgent
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-dummy-key-for-testing")
+    llm_clients.reset_llm_clients()
+
+    assert CodingAgent("coding").model is ErrorAgent("error").model
+
+
+def test_async_client_pools_per_event_loop():
+    """Each event loop gets its own connection pool on the shared client."""
+    llm_clients.reset_llm_clients()
+    client = llm_clients.get_async_http_client()
+    transport = client._transport
+
+    async def pool():
+        return transport._get_transport()
+
+    first = asyncio.run(pool())
+    second = asyncio.run(pool())
+
+    assert isinstance(first, httpx.AsyncHTTPTransport)
+    assert first is not second
+
+
+def test_reset_closes_async_pools(monkeypatch):
+    """Resetting closes the pools of every loop instead of leaking their connections."""
+    llm_clients.reset_llm_clients()
+    transport = llm_clients.get_async_http_client()._transport
+    closed = []
+
+    async def aclose(self):
+        closed.append(self)
+
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "aclose", aclose)
+
+    async def pool():
+        return transport._get_transport()
+
+    closed_loop, idle_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    pools = [closed_loop.run_until_complete(pool()), idle_loop.run_until_complete(pool())]
+    closed_loop.close()
+    llm_clients.reset_llm_clients()
+    idle_loop.close()
+
+    assert sorted(map(id, closed)) == sorted(map(id, pools))
+    assert not transport._transports
@@ -8,13 +8,11 @@ from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
 async def test_login_backend():
     project_id = "login_backend_demo"
     
-    # Mock ChatOpenAI
-    with patch("coding_agent_plugin.agents.planning.ChatOpenAI") as MockPlanningLLM, \
-         patch("coding_agent_plugin.agents.coding.ChatOpenAI") as MockCodingLLM, \
-         patch("coding_agent_plugin.agents.error.ChatOpenAI") as MockErrorLLM:
+    # Mock the shared chat models; each agent gets its own mock below
+    with patch("coding_agent_plugin.services.llm_clients.get_chat_model"):
         
         # Setup mocks
-        mock_planning_instance = MockPlanningLLM.return_value
+        mock_planning_instance = MagicMock()
         
         # Define a realistic plan for a Login/Register Backend
         mock_plan = {
@@ -79,7 +77,7 @@ async def test_login_backend():
         mock_planning_instance.ainvoke.return_value = future_planning
         
         # Mock Coding Agent to return dummy code based on prompt
-        mock_coding_instance = MockCodingLLM.return_value
+        mock_coding_instance = MagicMock()
         
         def coding_side_effect(messages):
             prompt = messages[1].content
@@ -102,6 +100,8 @@ async def test_login_backend():
         mock_coding_instance.ainvoke.side_effect = coding_side_effect
         
         orchestrator = OrchestratorAgent()
+        orchestrator.agents["planning"].model = mock_planning_instance
+        orchestrator.agents["coding"].model = mock_coding_instance
 
         # Clean up previous run
         if os.path.exists(f"projects/{project_id}"):
@@ -7,22 +7,20 @@ from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
 async def test_orchestrator():
     project_id = "test_project_123"
     
-    # Mock ChatOpenAI
-    with patch("coding_agent_plugin.agents.planning.ChatOpenAI") as MockPlanningLLM, \
-         patch("coding_agent_plugin.agents.coding.ChatOpenAI") as MockCodingLLM, \
-         patch("coding_agent_plugin.agents.error.ChatOpenAI") as MockErrorLLM:
+    # Mock the shared chat models; each agent gets its own mock below
+    with patch("coding_agent_plugin.services.llm_clients.get_chat_model"):
         
         # Setup mocks
-        mock_planning_instance = MockPlanningLLM.return_value
+        mock_planning_instance = MagicMock()
         mock_planning_instance.stream.return_value = [{"content": "Mock plan"}] # For planning agent stream
         
-        mock_coding_instance = MockCodingLLM.return_value
+        mock_coding_instance = MagicMock()
         # Make ainvoke awaitable
         future_coding = asyncio.Future()
         future_coding.set_result(MagicMock(content="print('Hello World')"))
         mock_coding_instance.ainvoke.return_value = future_coding
         
-        mock_error_instance = MockErrorLLM.return_value
+        mock_error_instance = MagicMock()
         # Make ainvoke awaitable
         future_error = asyncio.Future()
         future_error.set_result(MagicMock(content="print('Hello World Fixed')"))
@@ -35,6 +33,9 @@ async def test_orchestrator():
             mock_create_agent.return_value = mock_agent_executor
             
             orchestrator = OrchestratorAgent()
+            orchestrator.agents["planning"].model = mock_planning_instance
+            orchestrator.agents["coding"].model = mock_coding_instance
+            orchestrator.agents["error"].model = mock_error_instance
 
             # Clean up previous run
             if os.path.exists(f"projects/{project_id}"):
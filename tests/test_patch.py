@@ -0,0 +1,127 @@
+"""Tests for patch-based file editing."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from coding_agent_plugin.utils.patch import PatchError, apply_patch, validate_content
+
+
+SOURCE = '''import os
+
+
+def greet(name):
+    message = "Hello " + name
+    return message
+
+
+def farewell(name):
+    return "Bye " + name
+'''
+
+
+def test_search_replace_exact_and_reindented():
+    """Blocks match exactly or with different indentation, and keep file indentation."""
+    patch = '''Sure:
+<<<<<<< SEARCH
+def farewell(name):
+    return "Bye " + name
+=======
+def farewell(name):
+    return f"Bye {name}"
+>>>>>>> REPLACE
+
+<<<<<<< SEARCH
+message = "Hello " + name
+return message
+=======
+message = f"Hello {name}"
+return message.strip()
+>>>>>>> REPLACE
+'''
+    result = apply_patch(SOURCE, patch)
+
+    assert '    message = f"Hello {name}"\n    return message.strip()\n' in result
+    assert 'return f"Bye {name}"' in result
+    assert result.startswith("import os\n")
+
+
+def test_fuzzy_match_and_append():
+    """Slightly wrong search text still anchors; an empty search appends."""
+    patch = '''<<<<<<< SEARCH
+def greet(name):
+    message = "Hello" + name
+=======
+def greet(name: str):
+    message = "Hello " + name
+>>>>>>> REPLACE
+<<<<<<< SEARCH
+=======
+def wave():
+    return "o/"
+>>>>>>> REPLACE
+'''
+    result = apply_patch(SOURCE, patch)
+
+    assert "def greet(name: str):" in result
+    assert result.endswith('def wave():\n    return "o/"\n')
+
+
+def test_unified_diff():
+    """Unified diff hunks are applied using their context lines."""
+    diff = '''--- a/app.py
++++ b/app.py
+@@ -8,3 +8,4 @@
+ 
+ def farewell(name):
+-    return "Bye " + name
++    print("leaving")
++    return "Bye " + name
+'''
+    result = apply_patch(SOURCE, diff)
+
+    assert result.endswith('def farewell(name):\n    print("leaving")\n    return "Bye " + name\n')
+
+
+def test_unlocatable_patch_and_validation_errors():
+    with pytest.raises(PatchError):
+        apply_patch(SOURCE, "<<<<<<< SEARCH\nclass Nothing:\n    pass\n=======\nx = 1\n>>>>>>> REPLACE\n")
+    with pytest.raises(PatchError):
+        apply_patch(SOURCE, "I changed the file for you.")
+    with pytest.raises(PatchError):
+        validate_content("app.py", "def broken(:\n")
+
+
+@pytest.mark.asyncio
+async def test_modifier_falls_back_to_full_rewrite(monkeypatch):
+    """A patch that does not apply triggers one full-file request."""
+    from coding_agent_plugin.agents.file_modifier import FileModifierAgent
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-dummy-key-for-testing")
+    agent = FileModifierAgent("file_modifier")
+    replies = [
+        SimpleNamespace(content="<<<<<<< SEARCH\nnot in file\n=======\nx\n>>>>>>> REPLACE"),
+        SimpleNamespace(content="```python\nprint('rewritten')\n```"),
+    ]
+    agent.model = SimpleNamespace(ainvoke=AsyncMock(side_effect=replies))
+
+    result = await agent.modify_file("rewrite", SOURCE, "app.py", edit_mode="patch")
+
+    assert result == "print('rewritten')"
+    assert agent.model.ainvoke.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_modifier_patch_mode_returns_patched_file(monkeypatch):
+    from coding_agent_plugin.agents.file_modifier import FileModifierAgent
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-dummy-key-for-testing")
+    agent = FileModifierAgent("file_modifier")
+    patch = '<<<<<<< SEARCH\nimport os\n=======\nimport os\nimport sys\n>>>>>>> REPLACE'
+    agent.model = SimpleNamespace(ainvoke=AsyncMock(return_value=SimpleNamespace(content=patch)))
+
+    result = await agent.modify_file("import sys", SOURCE, "app.py", edit_mode="patch")
+
+    assert result == SOURCE.replace("import os\n", "import os\nimport sys\n")
+    assert agent.model.ainvoke.call_count == 1
@@ -0,0 +1,67 @@
+"""Tests for lazy project context loading."""
+
+import os
+from unittest.mock import patch
+
+from coding_agent_plugin.context.project_context import FileContentCache, FileInfo, ProjectContext
+
+
+def build(tmp_path):
+    (tmp_path / ".agent_context").mkdir()
+    (tmp_path / ".agent_context" / "planning.md").write_text("# plan")
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("print('hi')\n")
+    (tmp_path / "app" / "utils.py").write_text("def f():\n    pass\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "lib.js").write_text("x")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG")
+    (tmp_path / "data.bin").write_bytes(b"\0\1\2")
+
+
+def test_load_project_reads_metadata_only(tmp_path):
+    build(tmp_path)
+    context = ProjectContext(str(tmp_path))
+
+    assert context.load_project()
+    assert context._cache.size == 0
+    with patch("builtins.open", side_effect=AssertionError("file contents read")):
+        summary = context.get_project_summary()
+
+    assert sorted(context.files) == ["app/main.py", "app/utils.py"]  # data.bin is sniffed as binary
+    assert "app/main.py" in context.files and "node_modules/lib.js" not in context.files
+    assert context.file_info["app/main.py"].size == len("print('hi')\n")
+    assert context.get_main_files() == ["app/main.py"]
+    assert "Total Files: 2" in summary and "app/ (2 files)" in summary
+
+
+def test_contents_load_on_demand_and_refresh(tmp_path):
+    build(tmp_path)
+    context = ProjectContext(str(tmp_path))
+    context.load_project()
+
+    assert context.get_file_content("app/utils.py") == "def f():\n    pass\n"
+    assert context.files["app/main.py"] == "print('hi')\n"
+    assert context.get_file_content("data.bin") is None  # not listed
+    assert context.get_file_content("missing.py") is None
+
+    (tmp_path / "app" / "main.py").write_text("print('changed')\n")
+    os.utime(tmp_path / "app" / "main.py", ns=(1, 1))
+    assert context.get_file_content("app/main.py") == "print('changed')\n"
+
+
+def test_content_cache_respects_byte_budget():
+    cache = FileContentCache(max_bytes=10)
+    a, b, big = FileInfo(4, 1), FileInfo(6, 1), FileInfo(11, 1)
+
+    cache.put("a", a, "aaaa")
+    cache.put("b", b, "bbbbbb")
+    assert cache.get("a", a) == "aaaa"  # now most recently used
+    cache.put("c", FileInfo(4, 1), "cccc")
+    assert cache.get("b", b) is None
+    assert cache.get("a", a) == "aaaa"
+    assert cache.size == 8
+
+    cache.put("big", big, "x" * 11)
+    assert cache.get("big", big) is None
+    assert cache.get("a", FileInfo(4, 2)) is None  # stale entry is dropped
+    assert cache.size == 4
@@ -0,0 +1,84 @@
+"""Tests for the ProjectManager project cache."""
+
+import shutil
+import uuid
+
+import pytest
+
+from coding_agent_plugin.core import config
+from coding_agent_plugin.managers import ProjectManager, get_project_manager
+
+
+@pytest.fixture
+def pm(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "AGENTIC_PROJECTS_DIR", str(tmp_path))
+    manager = ProjectManager()
+    created = []
+
+    def create(description=None):
+        project = manager.create_project(f"cache-test-{uuid.uuid4().hex[:8]}", description)
+        created.append(project["id"])
+        return project
+
+    manager.create = create
+    yield manager
+    for project_id in created:
+        manager.delete_project(project_id)
+
+
+@pytest.fixture
+def session_counter(pm, monkeypatch):
+    calls = []
+    original = pm.repository._session
+
+    def counting_session():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(pm.repository, "_session", counting_session)
+    return calls
+
+
+def test_get_project_is_served_from_cache(pm, session_counter):
+    """Lookups by name and ID after creation never touch the database."""
+    project = pm.create()
+    session_counter.clear()
+
+    by_name = pm.get_project(project["name"])
+    by_id = pm.get_project(project["id"])
+
+    assert session_counter == []
+    assert by_name == by_id == project
+    assert by_id["storage_path"] == project["storage_path"]
+
+    # Callers get copies, so mutating a result does not poison the cache
+    by_name["description"] = "changed"
+    assert pm.get_project(project["id"])["description"] is None
+
+
+def test_cache_is_invalidated_on_update_and_delete(pm):
+    """Updates are visible immediately and deleted projects disappear."""
+    project = pm.create()
+
+    pm.update_project(project["name"], description="new", project_metadata={"stack": "fastapi"})
+    updated = pm.get_project(project["id"])
+    assert updated["description"] == "new"
+    assert updated["project_metadata"] == {"stack": "fastapi"}
+
+    assert pm.delete_project(project["name"])
+    assert pm.get_project(project["id"]) is None
+    assert pm.get_project(project["name"]) is None
+
+
+def test_cache_drops_projects_removed_externally(pm, session_counter):
+    """A cached project whose directory vanished is looked up again."""
+    project = pm.create()
+    shutil.rmtree(project["storage_path"])
+    session_counter.clear()
+
+    assert pm.get_project(project["id"]) == project
+    assert len(session_counter) == 1
+
+
+def test_get_project_manager_is_shared():
+    assert get_project_manager() is get_project_manager()
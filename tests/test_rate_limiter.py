@@ -0,0 +1,121 @@
+"""Tests for the adaptive LLM rate limiter."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from coding_agent_plugin.services.rate_limiter import AdaptiveRateLimiter, TokenBucket, parse_reset
+
+
+def test_parse_reset():
+    assert parse_reset("6m0s") == 360
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("1.5") == 1.5
+    assert parse_reset("soon") is None
+
+
+def test_token_bucket_refills_and_carries_debt():
+    bucket = TokenBucket(60)  # one per second
+    bucket.take(60, now=bucket.updated)
+    assert bucket.delay(1, bucket.updated) == pytest.approx(1)
+    bucket.take(30, bucket.updated)  # used more than estimated
+    assert bucket.delay(1, bucket.updated) == pytest.approx(31)
+    assert TokenBucket(0).delay(10**9, 0) == 0
+
+
+async def test_concurrency_window_is_aimd():
+    limiter = AdaptiveRateLimiter(rpm=0, tpm=0, concurrency=2, max_concurrency=8)
+    running, peak = 0, 0
+
+    async def call():
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2 and limiter.window > 2
+
+    window = limiter.window
+    response = httpx.Response(429, headers={"retry-after": "0"}, request=httpx.Request("POST", "http://llm"))
+    with pytest.raises(httpx.HTTPStatusError):
+        async with limiter.slot():
+            response.raise_for_status()
+    assert limiter.window == pytest.approx(window / 2)
+    assert limiter.rate_limited == 1 and limiter.active == 0
+
+
+async def test_limits_are_learned_from_headers():
+    limiter = AdaptiveRateLimiter(rpm=0, tpm=0)
+    async with limiter.slot(100) as slot:
+        slot.headers = {
+            "x-ratelimit-limit-requests": "600",
+            "x-ratelimit-remaining-requests": "599",
+            "x-ratelimit-limit-tokens": "60000",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "250ms",
+        }
+    assert (limiter.requests.per_minute, limiter.tokens.per_minute) == (600, 60000)
+
+    started = asyncio.get_running_loop().time()
+    async with limiter.slot(10):
+        pass
+    assert asyncio.get_running_loop().time() - started >= 0.2
+
+
+async def test_waiters_are_served_round_robin_across_projects():
+    limiter = AdaptiveRateLimiter(rpm=0, tpm=0, concurrency=1, max_concurrency=1)
+    order = []
+
+    async def call(project, n):
+        async with limiter.slot(project=project):
+            order.append(f"{project}{n}")
+            await asyncio.sleep(0)
+
+    async with limiter.slot(project="a"):
+        tasks = [asyncio.create_task(call("a", n)) for n in range(3)]
+        tasks.append(asyncio.create_task(call("b", 0)))
+        await asyncio.sleep(0.01)
+        assert limiter.waiting == 4
+    await asyncio.gather(*tasks)
+    assert order.index("b0") <= 1
+
+
+async def test_waiters_resume_after_a_rate_limit_pause():
+    limiter = AdaptiveRateLimiter(rpm=0, tpm=0, concurrency=1, max_concurrency=1)
+    granted = []
+
+    async def call(n):
+        async with limiter.slot():
+            granted.append(n)
+
+    response = httpx.Response(429, headers={"retry-after": "0.05"}, request=httpx.Request("POST", "http://llm"))
+    with pytest.raises(httpx.HTTPStatusError):
+        async with limiter.slot() as slot:
+            tasks = [asyncio.create_task(call(n)) for n in range(3)]
+            await asyncio.sleep(0.01)
+            slot.headers = response.headers
+            response.raise_for_status()
+    assert limiter.waiting == 3 and limiter.active == 0
+
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=2)
+    assert sorted(granted) == [0, 1, 2]
+
+
+async def test_waiters_resume_after_an_empty_token_bucket():
+    limiter = AdaptiveRateLimiter(rpm=0, tpm=6000, concurrency=1, max_concurrency=1)
+
+    async def call():
+        async with limiter.slot(10):
+            pass
+
+    async with limiter.slot(0) as slot:
+        task = asyncio.create_task(call())
+        await asyncio.sleep(0.01)
+        slot.used_tokens = 6000  # Drains the bucket: the waiter needs ~0.1s of refill
+    assert limiter.waiting == 1 and limiter.active == 0
+
+    await asyncio.wait_for(task, timeout=2)
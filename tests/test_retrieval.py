@@ -0,0 +1,103 @@
+"""Tests for relevance-ranked project context retrieval."""
+
+from coding_agent_plugin.agents.coding import CodingAgent
+from coding_agent_plugin.context.retrieval import ProjectRetriever, chunk_text, estimate_tokens, tokenize
+from coding_agent_plugin.managers.file_index import FileIndex
+
+
+def build(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "models.py").write_text(
+        "class User:\n    email = ''\n    password_hash = ''\n\n\nclass Product:\n    price = 0\n"
+    )
+    (tmp_path / "app" / "auth.py").write_text(
+        "def hash_password(password):\n    return password[::-1]\n\n\ndef verify_password(user, password):\n"
+        "    return user.password_hash == hash_password(password)\n"
+    )
+    (tmp_path / "app" / "main.py").write_text("from fastapi import FastAPI\n\napp = FastAPI()\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "deploy.md").write_text("# Deploy\n\nRun docker compose up.\n")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\0\0binary")
+
+
+def test_tokenize_splits_identifiers():
+    terms = tokenize("def verifyPassword(user_id): return HTTPError")
+    assert {"verify", "password", "verifypassword", "user", "id", "user_id", "http", "error"} <= set(terms)
+    assert "def" not in terms and "return" not in terms
+
+
+def test_chunk_text_splits_at_top_level_definitions():
+    text = "\n".join(["import os"] + [f"x{i} = {i}" for i in range(9)] + ["def f():", "    pass"] + ["y = 1"] * 50)
+    chunks = chunk_text("a.py", text, max_lines=40, min_lines=8)
+
+    assert [c.start_line for c in chunks][:2] == [1, 9]
+    assert all(c.end_line - c.start_line < 40 for c in chunks)
+    assert "\n".join(c.text for c in chunks) == text
+
+
+def test_search_ranks_relevant_chunks(tmp_path):
+    build(tmp_path)
+    retriever = ProjectRetriever(str(tmp_path))
+
+    results = retriever.search("verify the user password on login", top_k=3)
+
+    assert results[0][1].path == "app/auth.py"
+    assert all(chunk.path != "logo.png" for _, chunk in results)
+
+
+def test_target_file_is_excluded(tmp_path):
+    build(tmp_path)
+    retriever = ProjectRetriever(str(tmp_path))
+
+    results = retriever.search("hash password", target_file="app/auth.py")
+
+    assert results and all(chunk.path != "app/auth.py" for _, chunk in results)
+
+
+def test_context_lists_neighbours_and_respects_budget(tmp_path):
+    build(tmp_path)
+    retriever = ProjectRetriever(str(tmp_path))
+
+    context = retriever.build_context("store password hash on User", target_file="app/routes.py", token_budget=200)
+
+    assert context.startswith("Related files: ")
+    assert "app/main.py" in context.splitlines()[0]
+    assert "docs/deploy.md" not in context
+    assert "--- app/models.py (lines 1-" in context
+    assert estimate_tokens(context) <= 200
+    assert retriever.build_context("password", token_budget=0) == ""
+
+
+def test_refresh_picks_up_new_and_deleted_files(tmp_path):
+    build(tmp_path)
+    retriever = ProjectRetriever(str(tmp_path))
+    assert not retriever.search("invoice")
+
+    (tmp_path / "app" / "billing.py").write_text("def create_invoice(order):\n    return order\n")
+    FileIndex.for_project(str(tmp_path)).record_write("app/billing.py")
+    assert retriever.search("invoice")[0][1].path == "app/billing.py"
+
+    (tmp_path / "app" / "billing.py").unlink()
+    FileIndex.for_project(str(tmp_path)).record_delete("app/billing.py")
+    assert not retriever.search("invoice")
+
+
+def test_dependency_directories_are_skipped(tmp_path):
+    build(tmp_path)
+    for vendored in ("venv/lib/site.py", "node_modules/pkg/handler.js", "app/__pycache__/handler.py"):
+        (tmp_path / vendored).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / vendored).write_text("def fix_the_handler():\n    handler = 1\n")
+
+    retriever = ProjectRetriever(str(tmp_path))
+
+    assert not retriever.search("fix the handler")
+    assert all(not p.startswith(("venv/", "node_modules/")) and "__pycache__" not in p for p in retriever.paths)
+
+
+def test_coding_prompt_uses_context_instead_of_file_list():
+    agent = CodingAgent.__new__(CodingAgent)
+
+    messages = agent._build_messages("add login", None, "Related files: app/auth.py")
+
+    assert "Project Context:\nRelated files: app/auth.py" in messages[1].content
+    assert "Project Structure" not in messages[1].content
@@ -0,0 +1,87 @@
+"""Tests for the dependency-aware task scheduler."""
+
+import asyncio
+
+import pytest
+
+from coding_agent_plugin.agents.scheduler import TaskScheduler, build_task_graph
+
+
+PLAN = [
+    {"id": 1, "phase": "scaffold", "agent": "task", "description": "Create dirs"},
+    {"id": 2, "phase": "coding", "agent": "coding", "description": "Create models",
+     "details": {"file_path": "app/models.py"}},
+    {"id": 3, "phase": "coding", "agent": "coding", "description": "Create config",
+     "details": {"file_path": "app/config.py"}},
+    {"id": 4, "phase": "coding", "agent": "coding", "description": "Create main",
+     "details": {"file_path": "app/main.py", "prompt": "Import User from app.models"}},
+    {"id": 5, "phase": "verification", "agent": "execution", "description": "Run tests",
+     "details": {"command": "pytest"}},
+]
+
+
+def test_build_task_graph_infers_dependencies():
+    """Phases, imports and non-coding tasks produce the expected edges."""
+    nodes = build_task_graph(PLAN)
+
+    assert nodes[0].depends_on == set()
+    assert nodes[1].depends_on == {0}
+    assert nodes[2].depends_on == {0}
+    assert nodes[3].depends_on == {0, 1}
+    assert nodes[4].depends_on == {0, 1, 2, 3}
+
+
+def test_build_task_graph_explicit_and_same_file():
+    """Explicit depends_on and repeated file paths are honoured."""
+    tasks = [
+        {"id": "a", "phase": "coding", "agent": "coding", "details": {"file_path": "x.py"}},
+        {"id": "b", "phase": "coding", "agent": "coding", "details": {"file_path": "y.py"}},
+        {"id": "c", "phase": "coding", "agent": "coding", "details": {"file_path": "./x.py"}},
+        {"id": "d", "phase": "coding", "agent": "coding", "depends_on": ["b"],
+         "details": {"file_path": "z.py"}},
+    ]
+    nodes = build_task_graph(tasks)
+
+    assert nodes[2].depends_on == {0}
+    assert nodes[3].depends_on == {1}
+    assert [node.key for node in nodes] == ["a", "b", "c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_independent_tasks_concurrently():
+    """Independent tasks overlap while dependents wait for their inputs."""
+    nodes = build_task_graph(PLAN)
+    running = 0
+    peak = 0
+    finished = []
+
+    async def runner(node):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        finished.append(node.index)
+        return node.key
+
+    results = await TaskScheduler(max_concurrency=4).run(nodes, runner)
+
+    assert results == ["1", "2", "3", "4", "5"]
+    assert peak == 2
+    assert finished.index(1) < finished.index(3)
+    assert finished[-1] == 4
+
+
+@pytest.mark.asyncio
+async def test_scheduler_respects_concurrency_limit():
+    """A limit of one runs the plan strictly in order."""
+    nodes = build_task_graph(PLAN)
+    order = []
+
+    async def runner(node):
+        order.append(node.index)
+        await asyncio.sleep(0)
+
+    await TaskScheduler(max_concurrency=1).run(nodes, runner)
+
+    assert order == [0, 1, 2, 3, 4]
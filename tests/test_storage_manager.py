@@ -0,0 +1,63 @@
+"""Tests for StorageManager bulk imports."""
+
+import hashlib
+import uuid
+
+import pytest
+
+from coding_agent_plugin.managers import StorageManager, get_project_manager
+from coding_agent_plugin.managers.file_index import FileIndex
+
+
+@pytest.fixture
+def project():
+    pm = get_project_manager()
+    project = pm.create_project(f"storage-test-{uuid.uuid4().hex[:8]}")
+    yield project
+    pm.delete_project(project["id"])
+
+
+def test_copy_directory_registers_every_file_in_one_batch(project, tmp_path, monkeypatch):
+    template = tmp_path / "template"
+    (template / "app" / "static").mkdir(parents=True)
+    (template / "app" / "main.py").write_text("print('hi')\n")
+    (template / "app" / "static" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\x00\xff" * 100)
+    (template / "README.md").write_text("# Template\n")
+
+    sm = StorageManager()
+    batches = []
+    original = sm.repository.upsert_files
+
+    def counting_upsert(project_id, files):
+        batches.append(list(files))
+        return original(project_id, batches[-1])
+
+    monkeypatch.setattr(sm.repository, "upsert_files", counting_upsert)
+    assert sm.copy_to_project(str(template), project["name"], "src")
+
+    records = {
+        r["file_path"]: r for r in sm.repository.run_sync(sm.repository.list_file_records(project["id"]))
+    }
+    logo = (template / "app" / "static" / "logo.png").read_bytes()
+    assert len(batches) == 1
+    assert set(records) == {"src/README.md", "src/app/main.py", "src/app/static/logo.png"}
+    assert records["src/app/static/logo.png"]["content_hash"] == hashlib.sha256(logo).hexdigest()
+    assert records["src/app/static/logo.png"]["size_bytes"] == len(logo)
+    assert sm.get_file(project["name"], "src/app/main.py") == "print('hi')\n"
+    assert "src/app/static/logo.png" in FileIndex.for_project(project["storage_path"]).list_files()
+
+
+def test_copy_single_file_updates_existing_record(project, tmp_path):
+    source = tmp_path / "config.json"
+    sm = StorageManager()
+    source.write_text("{}")
+    sm.copy_to_project(str(source), project["name"], "config.json")
+    source.write_text('{"debug": true}')
+    sm.copy_to_project(str(source), project["name"], "config.json")
+
+    records = sm.repository.run_sync(sm.repository.list_file_records(project["id"]))
+    assert records == [{
+        "file_path": "config.json",
+        "content_hash": hashlib.sha256(b'{"debug": true}').hexdigest(),
+        "size_bytes": 15,
+    }]
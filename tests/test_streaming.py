@@ -0,0 +1,141 @@
+"""Tests for streaming code generation."""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from coding_agent_plugin.agents.coding import CodeFenceExtractor, CodingAgent
+
+
+class RecordingSink:
+    def __init__(self):
+        self.text = ""
+        self.resets = 0
+
+    def write(self, text):
+        self.text += text
+
+    def reset(self):
+        self.text = ""
+        self.resets += 1
+
+
+def extract(chunks):
+    sink = RecordingSink()
+    extractor = CodeFenceExtractor(sink)
+    for chunk in chunks:
+        extractor.feed(chunk)
+    extractor.close()
+    return sink
+
+
+RESPONSE = "Here is the code:\n\n```python\nimport os\n\n\ndef main():\n    return `x`\n```\n\nDone."
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, len(RESPONSE)])
+def test_extractor_matches_first_code_block_for_any_chunking(size):
+    """The extracted code does not depend on how the stream was split."""
+    chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+    sink = extract(chunks)
+
+    assert sink.text == "import os\n\n\ndef main():\n    return `x`"
+    assert sink.resets == 1
+
+
+def test_extractor_without_fence_and_unterminated_fence():
+    """Plain responses are stripped; a fence left open runs to the end."""
+    assert extract(["  \nprint('hi')", "\n\n  "]).text == "print('hi')"
+    assert extract(["```js\nconsole.log(1)", ";\n"]).text == "console.log(1);"
+
+
+@pytest.mark.asyncio
+async def test_stream_code_writes_atomically(tmp_path, monkeypatch):
+    """Tokens reach the callback and the file only appears once complete."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-dummy-key-for-testing")
+    target = tmp_path / "pkg" / "app.py"
+    seen_part_file = []
+
+    async def astream(messages):
+        for token in ["```py", "thon\n", "x = 1\n", "y = 2\n", "```"]:
+            seen_part_file.append((tmp_path / "pkg" / ".app.py.part").exists())
+            yield SimpleNamespace(content=token)
+
+    agent = CodingAgent("coding")
+    agent.model = SimpleNamespace(astream=astream)
+    tokens = []
+
+    size = await agent.stream_code("make app", str(target), on_token=tokens.append)
+
+    assert target.read_text() == "x = 1\ny = 2"
+    assert size == len("x = 1\ny = 2")
+    assert "".join(t for t in tokens if t) == "x = 1\ny = 2"
+    assert all(seen_part_file)
+    assert os.listdir(tmp_path / "pkg") == ["app.py"]
+
+
+async def test_retried_stream_does_not_repeat_echoed_tokens(tmp_path, monkeypatch):
+    """Text echoed by a failed attempt is discarded before the retry echoes its own."""
+    from coding_agent_plugin.core import config
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-dummy-key-for-testing")
+    monkeypatch.setattr(config, "AGENT_RETRY_DELAY", 0)
+    attempts = []
+
+    async def astream(messages):
+        attempts.append(1)
+        yield SimpleNamespace(content="x = 1\n")
+        if len(attempts) == 1:
+            yield SimpleNamespace(content="z = ")
+            raise TimeoutError("stream stalled")
+        yield SimpleNamespace(content="y = 2\n")
+
+    agent = CodingAgent("coding")
+    agent.model = SimpleNamespace(astream=astream)
+    shown = []
+
+    def echo(text):
+        if text is None:
+            shown.clear()
+        else:
+            shown.append(text)
+
+    await agent.stream_code("make app", str(tmp_path / "app.py"), on_token=echo)
+
+    assert len(attempts) == 2
+    assert "".join(shown) == "x = 1\ny = 2"
+    assert (tmp_path / "app.py").read_text() == "x = 1\ny = 2"
+
+
+async def test_streamed_usage_is_reported(tmp_path, monkeypatch):
+    """Token usage from the stream's chunks reaches the llm_call event and the rate limiter."""
+    from unittest.mock import MagicMock
+
+    from coding_agent_plugin.core import events
+    from coding_agent_plugin.core.events import EventBus
+    from coding_agent_plugin.services import rate_limiter
+    from coding_agent_plugin.services.rate_limiter import AdaptiveRateLimiter
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-dummy-key-for-testing")
+    bus = EventBus()
+    monkeypatch.setattr(events, "_bus", bus)
+    seen = bus.subscribe(MagicMock())
+    limiter = AdaptiveRateLimiter(rpm=0, tpm=60_000)
+    monkeypatch.setattr(rate_limiter, "get_rate_limiter", lambda *key: limiter)
+
+    async def astream(messages):
+        yield SimpleNamespace(content="```\nx = 1\n```", usage_metadata=None)
+        yield SimpleNamespace(content="", usage_metadata={
+            "input_tokens": 120, "output_tokens": 30, "total_tokens": 150,
+            "input_token_details": {"cache_read": 100},
+        })
+
+    agent = CodingAgent("coding")
+    agent.model = SimpleNamespace(astream=astream, model_name="gpt-test")
+
+    assert await agent.stream_code("make app", str(tmp_path / "app.py")) == len("x = 1")
+
+    event = seen.call_args.args[0]
+    assert (event.input_tokens, event.output_tokens, event.cached_tokens) == (120, 30, 100)
+    # Debited the actual 150 tokens rather than the estimate
+    assert limiter.tokens.level == pytest.approx(60_000 - 150, abs=5)
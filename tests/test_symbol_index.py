@@ -0,0 +1,125 @@
+"""Tests for the persistent symbol index."""
+
+import json
+import os
+from unittest.mock import patch
+
+from coding_agent_plugin.context import symbol_index as symbol_index_module
+from coding_agent_plugin.context.project_context import ProjectContext
+from coding_agent_plugin.context.symbol_index import SymbolIndex, parse_symbols
+
+PY_SOURCE = '''
+import os
+from .db import session, Base
+
+MAX_USERS = 10
+
+
+class UserService(Base):
+    def create_user(self, email):
+        return session.add(validate_email(email))
+
+
+async def validate_email(email):
+    return os.path.basename(email)
+'''
+
+TS_SOURCE = '''
+import { api } from "./client";
+const axios = require("axios");
+
+// function commentedOut() {}
+export interface Cart { id: string }
+export default class CartStore {
+  async addItem(item: Item): Promise<void> {
+    if (item) {
+      await api.post(item);
+    }
+  }
+}
+export const totalPrice = (items) => items.reduce(sum, 0);
+function checkout() { return formatPrice(totalPrice([])); }
+'''
+
+
+def entries(root):
+    result = {}
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            if "/.agentic" in full:
+                continue
+            st = os.stat(full)
+            result[os.path.relpath(full, root)] = (st.st_size, st.st_mtime_ns)
+    return result
+
+
+def test_parse_python():
+    symbols = parse_symbols("service.py", PY_SOURCE)
+
+    assert symbols["definitions"] == ["MAX_USERS", "UserService", "UserService.create_user", "validate_email"]
+    assert symbols["imports"] == [".db", ".db.Base", ".db.session", "os"]
+    assert symbols["references"] == ["add", "basename"]
+
+
+def test_parse_script():
+    symbols = parse_symbols("store.ts", TS_SOURCE)
+
+    assert {"Cart", "CartStore", "addItem", "totalPrice", "checkout", "axios"} <= set(symbols["definitions"])
+    assert "commentedOut" not in symbols["definitions"] and "if" not in symbols["definitions"]
+    assert symbols["imports"] == ["./client", "axios"]
+    assert {"post", "reduce", "formatPrice"} <= set(symbols["references"])
+
+
+def test_refresh_is_incremental_and_persistent(tmp_path):
+    (tmp_path / "service.py").write_text(PY_SOURCE)
+    (tmp_path / "store.ts").write_text(TS_SOURCE)
+    (tmp_path / "README.md").write_text("# docs")
+    index = SymbolIndex(str(tmp_path))
+    index.refresh(entries(tmp_path))
+
+    assert index.find_definitions("UserService") == ["service.py"]
+    assert index.find_definitions("create_user") == ["service.py"]
+    assert index.find_references("formatPrice") == ["store.ts"]
+    stored = json.loads((tmp_path / ".agentic" / "symbols.json").read_text())
+    assert sorted(stored["files"]) == ["service.py", "store.ts"]
+
+    # A fresh instance loads the sidecar and parses nothing that is unchanged
+    reloaded = SymbolIndex(str(tmp_path))
+    with patch.object(symbol_index_module, "parse_symbols", side_effect=AssertionError("re-parsed")):
+        reloaded.refresh(entries(tmp_path))
+        os.utime(tmp_path / "store.ts", ns=(1, 1))  # touched, same content
+        reloaded.refresh(entries(tmp_path))
+    assert reloaded.find_definitions("CartStore") == ["store.ts"]
+
+    (tmp_path / "service.py").write_text("def renamed():\n    pass\n")
+    (tmp_path / "store.ts").unlink()
+    reloaded.refresh(entries(tmp_path))
+    assert reloaded.find_definitions("UserService") == []
+    assert reloaded.find_definitions("renamed") == ["service.py"]
+    assert reloaded.symbols("store.ts") is None
+
+
+def test_route_prefers_files_defining_mentioned_symbols(tmp_path):
+    (tmp_path / "service.py").write_text(PY_SOURCE)
+    (tmp_path / "store.ts").write_text(TS_SOURCE)
+    (tmp_path / "main.py").write_text("from service import UserService\nUserService().create_user('a')\n")
+    index = SymbolIndex(str(tmp_path))
+    index.refresh(entries(tmp_path))
+
+    assert index.route("Add logging to create_user in UserService") == ["service.py"]
+    assert index.route("make cartstore persist to localStorage") == ["store.ts"]
+    assert index.route("add a README badge") == []
+
+
+def test_improve_routes_through_project_context(tmp_path):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("print('hi')\n")
+    (tmp_path / "app" / "billing.py").write_text("def compute_invoice_total(order):\n    return 0\n")
+    context = ProjectContext(str(tmp_path))
+    context.load_project()
+
+    assert context.get_files_for_request("fix rounding in compute_invoice_total") == ["app/billing.py"]
+
+    (tmp_path / "app" / "main.py").write_text("def compute_invoice_total():\n    pass\n")
+    assert sorted(context.get_files_for_request("fix compute_invoice_total")) == ["app/billing.py", "app/main.py"]
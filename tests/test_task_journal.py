@@ -0,0 +1,105 @@
+"""Tests for the task status journal."""
+
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+from coding_agent_plugin.agents.task import TaskAgent
+from coding_agent_plugin.managers.task_journal import TaskJournal
+
+PLAN = [
+    {"id": 1, "description": "Create app", "agent": "coding"},
+    {"id": 2, "description": "Create app tests", "agent": "coding"},
+    {"description": "Run tests", "agent": "execution"},
+]
+
+
+def view(tmp_path):
+    return (tmp_path / ".agentic" / "tasks.md").read_text()
+
+
+def test_updates_are_journaled_by_id_and_rendered_on_flush(tmp_path):
+    journal = TaskJournal(str(tmp_path))
+    journal.init(PLAN)
+    assert view(tmp_path) == (
+        "# Project Tasks\n\n"
+        "- [ ] Create app (Agent: coding)\n"
+        "- [ ] Create app tests (Agent: coding)\n"
+        "- [ ] Run tests (Agent: execution)\n"
+    )
+
+    assert journal.update("2", "in_progress")
+    assert journal.update("2", "completed")
+    assert not journal.update("2", "in_progress")  # completed tasks stay completed
+    assert journal.update("3", "failed")
+    assert not journal.update("9", "completed")
+
+    # The view is debounced, the journal is not
+    assert "- [ ] Create app tests" in view(tmp_path)
+    lines = [json.loads(line) for line in (tmp_path / ".agentic" / "tasks.jsonl").read_text().splitlines()]
+    assert [(e.get("id"), e.get("status")) for e in lines[1:]] == [("2", "in_progress"), ("2", "completed"), ("3", "failed")]
+
+    journal.flush()
+    assert "- [ ] Create app (Agent" in view(tmp_path)
+    assert "- [x] Create app tests (Agent" in view(tmp_path)
+    assert "- [!] Run tests (Agent" in view(tmp_path)
+
+
+def test_debounced_render(tmp_path):
+    journal = TaskJournal(str(tmp_path))
+    journal.RENDER_DELAY = 0.05
+    journal.init(PLAN)
+    journal.update("1", "completed")
+    timer = journal._timer
+
+    timer.join()
+    assert "- [x] Create app (Agent" in view(tmp_path)
+
+
+def test_state_is_replayed_from_the_journal(tmp_path):
+    journal = TaskJournal(str(tmp_path))
+    journal.init(PLAN)
+    journal.update("1", "completed")
+    journal.update("3", "in_progress")
+    with open(tmp_path / ".agentic" / "tasks.jsonl", "a") as f:
+        f.write('{"op": "status", "id": "2"')  # torn write
+
+    reloaded = TaskJournal(str(tmp_path))
+    assert [t["status"] for t in reloaded.tasks()] == ["completed", "pending", "in_progress"]
+    assert reloaded.find("Create app tests") == "2"
+
+
+def test_concurrent_updates(tmp_path):
+    tasks = [{"id": i, "description": f"Task {i}"} for i in range(200)]
+    journal = TaskJournal(str(tmp_path))
+    journal.init(tasks)
+
+    threads = [threading.Thread(target=journal.update, args=(str(i), "completed")) for i in range(200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reloaded = TaskJournal(str(tmp_path))
+    assert all(t["status"] == "completed" for t in reloaded.tasks())
+    assert len((tmp_path / ".agentic" / "tasks.jsonl").read_text().splitlines()) == 201
+
+
+async def test_task_agent_matches_descriptions_exactly(tmp_path):
+    agent = TaskAgent.__new__(TaskAgent)
+    agent.name = "task"
+    agent.pm = MagicMock()
+    agent.pm.aget_project = AsyncMock(return_value={"id": "p", "storage_path": str(tmp_path)})
+    agent._project_paths = {}
+
+    await agent.execute({"project_id": "p", "action": "init_tasks", "tasks": PLAN})
+    result = await agent.execute({"project_id": "p", "action": "update_status", "task_description": "Create app"})
+    by_id = await agent.execute({"project_id": "p", "action": "update_status", "task_id": "3", "status": "in_progress"})
+    await agent.execute({"project_id": "p", "action": "flush"})
+
+    assert result == {"status": "updated"} and by_id == {"status": "updated"}
+    assert "- [x] Create app (Agent" in view(tmp_path)
+    assert "- [ ] Create app tests (Agent" in view(tmp_path)
+    assert "- [/] Run tests (Agent" in view(tmp_path)
+    assert agent.pm.aget_project.await_count == 1
+    agent.pm.get_project.assert_not_called()
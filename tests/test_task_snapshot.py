@@ -0,0 +1,140 @@
+"""Tests for per-task copy-on-write snapshots."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from coding_agent_plugin.agents.orchestrator import OrchestratorAgent
+from coding_agent_plugin.managers import task_snapshot
+from coding_agent_plugin.managers.blob_store import BlobStore
+from coding_agent_plugin.managers.task_snapshot import TaskSnapshot
+
+
+def make_snapshot(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    return project, TaskSnapshot(str(project), BlobStore(str(tmp_path / "objects")))
+
+
+def test_rollback_restores_only_touched_files(tmp_path):
+    project, snapshot = make_snapshot(tmp_path)
+    (project / "app.py").write_text("original\n")
+    (project / "other.py").write_text("untouched\n")
+
+    with task_snapshot.activate(snapshot):
+        task_snapshot.preserve(str(project / "app.py"))
+        (project / "app.py").write_text("broken\n")
+        task_snapshot.preserve(str(project / "app.py"))  # later writes keep the first pre-image
+        (project / "app.py").write_text("more broken\n")
+        task_snapshot.preserve(str(project / "new.py"))
+        (project / "new.py").write_text("partial\n")
+        task_snapshot.preserve(str(tmp_path / "outside.py"))
+    task_snapshot.preserve(str(project / "other.py"))  # no active snapshot
+
+    assert snapshot.paths == [str(project / "app.py"), str(project / "new.py")]
+    assert snapshot.rollback() == 2
+    assert (project / "app.py").read_text() == "original\n"
+    assert not (project / "new.py").exists()
+    assert snapshot.paths == []
+
+
+def test_commit_keeps_changes(tmp_path):
+    project, snapshot = make_snapshot(tmp_path)
+    with task_snapshot.activate(snapshot):
+        task_snapshot.preserve(str(project / "app.py"))
+        (project / "app.py").write_text("done\n")
+
+    assert snapshot.commit() == [str(project / "app.py")]
+    assert snapshot.rollback() == 0
+    assert (project / "app.py").read_text() == "done\n"
+
+
+async def test_concurrent_tasks_capture_their_own_writes(tmp_path):
+    project, first = make_snapshot(tmp_path)
+    second = TaskSnapshot(str(project), first.store)
+
+    async def task(snapshot, name):
+        with task_snapshot.activate(snapshot):
+            await asyncio.sleep(0)
+            task_snapshot.preserve(str(project / name))
+
+    await asyncio.gather(task(first, "a.py"), task(second, "b.py"))
+    assert first.paths == [str(project / "a.py")]
+    assert second.paths == [str(project / "b.py")]
+
+
+def make_orchestrator(send_to_agent, error_agent):
+    orchestrator = OrchestratorAgent.__new__(OrchestratorAgent)
+    orchestrator.agents = {"task": AsyncMock(), "error": AsyncMock(execute=error_agent)}
+    orchestrator.send_to_agent = send_to_agent
+    return orchestrator
+
+
+def test_diff_describes_the_attempt(tmp_path):
+    project, snapshot = make_snapshot(tmp_path)
+    (project / "app.py").write_text("good\n")
+    with task_snapshot.activate(snapshot):
+        task_snapshot.preserve(str(project / "app.py"))
+        (project / "app.py").write_text("half-written")
+        task_snapshot.preserve(str(project / "new.py"))
+        (project / "new.py").write_text("partial\n")
+
+    diff = snapshot.diff()
+    assert "--- a/app.py\n+++ b/app.py\n" in diff
+    assert "-good\n+half-written\n" in diff
+    assert "--- /dev/null\n+++ b/new.py\n" in diff and "+partial\n" in diff
+
+
+async def test_failed_attempt_is_rolled_back_before_the_error_agent(tmp_path, monkeypatch):
+    project, snapshot = make_snapshot(tmp_path)
+    (project / "app.py").write_text("good\n")
+    monkeypatch.setattr(task_snapshot, "get_blob_store", lambda: snapshot.store)
+    seen, attempts = [], []
+
+    async def send_to_agent(name, task):
+        seen.append((project / "app.py").read_text())
+        if len(seen) == 1:
+            task_snapshot.preserve(str(project / "app.py"))
+            (project / "app.py").write_text("half-written")
+            raise RuntimeError("syntax error")
+        return {"file_path": str(project / "app.py")}
+
+    async def error_agent(task):
+        seen.append((project / "app.py").read_text())
+        attempts.append(task["failed_attempt"])
+        task_snapshot.preserve(str(project / "app.py"))
+        (project / "app.py").write_text("fixed\n")
+
+    outcome = await make_orchestrator(send_to_agent, error_agent)._execute_task(
+        1, {"description": "Fix app"}, "p", str(project), "1"
+    )
+
+    assert seen == ["good\n", "good\n", "fixed\n"]
+    assert "+half-written" in attempts[0]
+    assert outcome["status"] == "completed"
+    assert outcome["files"] == [str(project / "app.py")]
+    assert (project / "app.py").read_text() == "fixed\n"
+
+
+async def test_finally_failed_task_is_rolled_back(tmp_path, monkeypatch):
+    project, snapshot = make_snapshot(tmp_path)
+    (project / "app.py").write_text("good\n")
+    monkeypatch.setattr(task_snapshot, "get_blob_store", lambda: snapshot.store)
+
+    async def send_to_agent(name, task):
+        task_snapshot.preserve(str(project / "app.py"))
+        (project / "app.py").write_text("half-written")
+        task_snapshot.preserve(str(project / "new.py"))
+        (project / "new.py").write_text("partial")
+        raise RuntimeError("syntax error")
+
+    async def error_agent(task):
+        task_snapshot.preserve(str(project / "app.py"))
+        (project / "app.py").write_text("attempted fix")
+
+    outcome = await make_orchestrator(send_to_agent, error_agent)._execute_task(
+        1, {"description": "Fix app"}, "p", str(project), "1"
+    )
+
+    assert outcome["status"] == "failed" and outcome["retries"] == 2
+    assert (project / "app.py").read_text() == "good\n"
+    assert not (project / "new.py").exists()
@@ -0,0 +1,64 @@
+"""Tests for LLM usage accounting."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from coding_agent_plugin.agents.base_agent import BaseAgent
+from coding_agent_plugin.core import events
+from coding_agent_plugin.core.events import EventBus, LLMCall, RunFinished
+from coding_agent_plugin.repositories.workspace import WorkspaceRepository
+from coding_agent_plugin.services.usage import UsageRecorder, estimate_cost, parse_pricing
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repository = WorkspaceRepository(f"sqlite:///{tmp_path / 'data.db'}")
+    yield repository
+    repository.close()
+
+
+def test_pricing():
+    prices = parse_pricing("gpt-4o=2.5/10, mini=0.15/0.6, broken=x/1, flat=1")
+    assert prices == {"gpt-4o": (2.5, 10.0), "mini": (0.15, 0.6), "flat": (1.0, 1.0)}
+    assert estimate_cost("gpt-4o", 1_000_000, 100_000, prices) == pytest.approx(3.5)
+    assert estimate_cost("unknown", 10, 10, prices) is None
+
+
+async def test_calls_are_recorded_per_task_and_run(repo, monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(events, "_bus", bus)
+    recorder = UsageRecorder(repo, batch_size=100)
+    recorder.prices = {"gpt-test": (1.0, 2.0)}
+    bus.subscribe(recorder, types=(LLMCall, RunFinished))
+
+    class Agent(BaseAgent):
+        async def execute(self, task):
+            return {}
+
+    agent = Agent.__new__(Agent)
+    agent.name = "coding"
+    agent.model = MagicMock(model_name="gpt-test")
+    response = MagicMock(usage_metadata={
+        "input_tokens": 1000, "output_tokens": 500, "input_token_details": {"cache_read": 400},
+    })
+
+    run_id = events.new_run_id("p1")
+    with events.task_scope("3"):
+        await agent.retry_operation(AsyncMock(return_value=response))
+    await agent.retry_operation(AsyncMock(return_value=response))
+    assert (await repo.usage_summary())[0]["calls"] == 0  # still buffered
+
+    bus.emit(RunFinished, project_id="p1", status="completed", completed=1, failed=0, duration=1.0)
+    for _ in range(100):  # written in the background
+        if (await repo.usage_summary())[0]["calls"] == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    by_task = await repo.usage_summary("p1", group_by="task_id")
+    assert {row["task_id"]: row["calls"] for row in by_task} == {None: 1, "3": 1}
+    total = (await repo.usage_summary("p1", group_by="run_id"))[0]
+    assert total["run_id"] == run_id
+    assert (total["input_tokens"], total["output_tokens"], total["cached_tokens"]) == (2000, 1000, 800)
+    assert total["cost"] == pytest.approx(2 * (1000 * 1.0 + 500 * 2.0) / 1_000_000)
@@ -0,0 +1,91 @@
+"""Tests for the warm interpreter pool."""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from coding_agent_plugin.core.executor import SandboxExecutor
+from coding_agent_plugin.core.warm_pool import WarmPool, WarmPoolError, find_python
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="uses fork and process groups")
+
+
+@pytest.fixture
+def pool():
+    pool = WarmPool(sys.executable, preload=["json", "not_a_real_module_xyz"], executor=SandboxExecutor(timeout=10))
+    yield pool
+    pool.close()
+
+
+async def test_runs_scripts_in_forked_children(pool, tmp_path):
+    script = tmp_path / "check.py"
+    script.write_text(
+        "import os, sys\n"
+        "print('args', sys.argv[1:], 'cwd', os.getcwd(), 'main', __name__)\n"
+        "print('warn', file=sys.stderr)\n"
+        "sys.exit(3)\n"
+    )
+
+    result = await pool.run_script(str(script), ["a", "b"], cwd=str(tmp_path))
+
+    assert pool.preloaded == ["json"]
+    assert result.returncode == 3
+    assert result.stdout == f"args ['a', 'b'] cwd {tmp_path} main __main__\n"
+    assert result.stderr == "warn\n"
+
+
+async def test_children_are_isolated_and_concurrent(pool, tmp_path):
+    script = tmp_path / "mutate.py"
+    script.write_text("import json, time\nassert not hasattr(json, 'touched')\njson.touched = True\ntime.sleep(0.3)\n")
+
+    await pool.run_script(str(script))  # warm up
+    start = time.monotonic()
+    results = await asyncio.gather(*(pool.run_script(str(script)) for _ in range(3)))
+
+    assert [r.returncode for r in results] == [0, 0, 0], results[0].stderr
+    assert time.monotonic() - start < 0.85
+
+
+async def test_uncaught_exception_and_timeout(pool, tmp_path):
+    (tmp_path / "boom.py").write_text("raise ValueError('boom')\n")
+    (tmp_path / "hang.py").write_text("import time\ntime.sleep(30)\n")
+
+    failed = await pool.run_script(str(tmp_path / "boom.py"))
+    hung = await pool.run_script(str(tmp_path / "hang.py"), timeout=0.3)
+
+    assert failed.returncode == 1 and "ValueError: boom" in failed.stderr
+    assert hung.timed_out and hung.returncode == -9
+
+
+async def test_runs_pytest_selection(pool, tmp_path):
+    (tmp_path / "test_sample.py").write_text("def test_ok():\n    assert True\n\ndef test_bad():\n    assert False\n")
+
+    result = await pool.run_pytest(["-q", "-p", "no:cacheprovider", "-k", "ok", "test_sample.py"], cwd=str(tmp_path))
+
+    assert result.returncode == 0, result.stdout
+    assert "1 passed" in result.stdout
+
+
+async def test_restarts_after_server_exit(pool, tmp_path):
+    (tmp_path / "ok.py").write_text("print('ok')\n")
+    await pool.run_script(str(tmp_path / "ok.py"))
+
+    pool._process.kill()
+    pool._process.wait()
+
+    assert (await pool.run_script(str(tmp_path / "ok.py"))).stdout == "ok\n"
+
+
+async def test_missing_interpreter_raises():
+    pool = WarmPool("/nonexistent/python", executor=SandboxExecutor())
+    with pytest.raises(WarmPoolError):
+        await pool.run_script("x.py")
+
+
+def test_find_python_prefers_project_venv(tmp_path):
+    assert find_python(str(tmp_path)) == "python3"
+    (tmp_path / ".venv" / "bin").mkdir(parents=True)
+    (tmp_path / ".venv" / "bin" / "python").write_text("")
+    assert find_python(str(tmp_path)) == str(tmp_path / ".venv" / "bin" / "python")